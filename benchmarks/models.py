@@ -0,0 +1,215 @@
+"""
+Canonical models used by the benchmark suite.
+
+Every model is a function `model(size, seed, profile=False)` that builds a `Simulator`,
+schedules its processes and returns a `Bench` with the simulator, the time to run until
+and a function that computes the outputs of the model once it ran.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from math import factorial
+from typing import Any, Callable
+
+from pydes import Container, Queue, Resource, Simulator, State
+
+
+@dataclass
+class Bench:
+    sim: Simulator
+    until: int | float | datetime
+    outputs: Callable[[], dict[str, Any]]
+
+
+def erlang_c(arrival_rate: float, service_rate: float, servers: int) -> dict[str, float]:
+    """Steady state measures of an M/M/c queue.
+
+    Args:
+        arrival_rate: Poisson arrival rate.
+        service_rate: exponential service rate of every server.
+        servers: number of servers.
+
+    Returns:
+        dict with the probability of waiting, the mean waiting time in queue, the mean
+        number in queue and the utilization of the servers.
+    """
+    a = arrival_rate / service_rate
+    rho = a / servers
+    if rho >= 1:
+        raise ValueError("the queue is not stable")
+    top = a**servers / factorial(servers) / (1 - rho)
+    p_wait = top / (sum(a**k / factorial(k) for k in range(servers)) + top)
+    wq = p_wait / (servers * service_rate - arrival_rate)
+    return {"p_wait": p_wait, "wq": wq, "lq": arrival_rate * wq, "utilization": rho}
+
+
+def _mmc(
+    size: int, seed: int, profile: bool, servers: int, load: float = 0.8, init: Any = 0.0
+) -> Bench:
+    """M/M/c queue with `size` customers. Time is in minutes, also for datetime clocks."""
+    rng = random.Random(seed)
+    sim = Simulator(init=init, trace=False, profile=profile)
+    server = Resource(sim, capacity=servers)
+    mu = 1.0
+    lam = load * servers * mu
+    waits: list[float] = []
+    busy = [0.0]
+    numeric = not isinstance(init, datetime)
+
+    def delay(minutes: float):
+        return minutes if numeric else timedelta(minutes=minutes)
+
+    def elapsed(since):
+        d = sim.now() - since
+        return d if numeric else d / timedelta(minutes=1)
+
+    def customer():
+        arrival = sim.now()
+        me = object()
+        server.request(me)
+        waits.append(elapsed(arrival))
+        service = rng.expovariate(mu)
+        busy[0] += service
+        sim.sleep(delay(service))
+        server.release(me)
+
+    def source():
+        for _ in range(size):
+            sim.sleep(delay(rng.expovariate(lam)))
+            sim.schedule(customer)
+
+    sim.schedule(source)
+
+    def outputs():
+        horizon = elapsed(init)
+        skip = len(waits) // 10
+        steady = waits[skip:]
+        return {
+            "customers": len(waits),
+            "wq": sum(steady) / len(steady),
+            "p_wait": sum(w > 0 for w in steady) / len(steady),
+            "utilization": busy[0] / servers / horizon,
+        }
+
+    return Bench(sim, float("inf") if numeric else datetime.max, outputs)
+
+
+def mm1(size: int, seed: int, profile: bool = False) -> Bench:
+    return _mmc(size, seed, profile, servers=1)
+
+
+def mmc(size: int, seed: int, profile: bool = False) -> Bench:
+    return _mmc(size, seed, profile, servers=4)
+
+
+def mm1_datetime(size: int, seed: int, profile: bool = False) -> Bench:
+    return _mmc(size, seed, profile, servers=1, init=datetime(2024, 1, 1))
+
+
+def producer_consumer(size: int, seed: int, profile: bool = False) -> Bench:
+    """Producers and consumers of `size` items through a bounded `Queue`."""
+    rng = random.Random(seed)
+    sim = Simulator(trace=False, profile=profile)
+    queue = Queue(sim, capacity=10)
+    consumed = [0]
+
+    def producer():
+        for i in range(size // 2):
+            sim.sleep(rng.expovariate(1.0))
+            queue.put(i)
+
+    def consumer():
+        while True:
+            queue.get()
+            consumed[0] += 1
+            sim.sleep(rng.expovariate(1.2))
+
+    for _ in range(2):
+        sim.schedule(producer)
+        sim.schedule(consumer)
+    return Bench(sim, float("inf"), lambda: {"consumed": consumed[0]})
+
+
+def tanks(size: int, seed: int, profile: bool = False) -> Bench:
+    """A line of `size // 100 + 2` tanks, with pumps moving random amounts between them."""
+    rng = random.Random(seed)
+    sim = Simulator(trace=False, profile=profile)
+    line = [Container(sim, capacity=50) for _ in range(size // 100 + 2)]
+    steps = size // len(line)
+
+    def feed():
+        for _ in range(steps):
+            sim.sleep(1.0)
+            line[0].put(rng.randint(1, 5))
+
+    def pump(src: Container, dst: Container):
+        def main():
+            while True:
+                amount = rng.randint(1, 5)
+                src.get(amount)
+                sim.sleep(rng.uniform(0.5, 1.5))
+                dst.put(amount)
+
+        return main
+
+    def drain():
+        while True:
+            line[-1].get(1)
+            sim.sleep(0.2)
+
+    sim.schedule(feed)
+    for src, dst in zip(line, line[1:]):
+        sim.schedule(pump(src, dst))
+    sim.schedule(drain)
+    return Bench(sim, float(steps + 100), lambda: {"level": sum(c.level() for c in line)})
+
+
+def sleepers(size: int, seed: int, profile: bool = False) -> Bench:
+    """`size` processes sleeping random durations 20 times each."""
+    rng = random.Random(seed)
+    sim = Simulator(trace=False, profile=profile)
+
+    def sleeper():
+        for _ in range(20):
+            sim.sleep(rng.expovariate(1.0))
+
+    for _ in range(size):
+        sim.schedule(sleeper)
+    return Bench(sim, float("inf"), lambda: {"now": sim.now()})
+
+
+def waiters(size: int, seed: int, profile: bool = False) -> Bench:
+    """`size` processes blocked in `wait_for` on a state that cycles through 10 values."""
+    rng = random.Random(seed)
+    sim = Simulator(trace=False, profile=profile)
+    state = State(sim, 0)
+    woken = [0]
+
+    def waiter():
+        value = rng.randrange(10)
+        for _ in range(5):
+            state.wait(value)
+            woken[0] += 1
+            sim.sleep(0.5)
+
+    def ticker():
+        for t in range(100):
+            sim.sleep(1.0)
+            state.set(t % 10)
+
+    for _ in range(size):
+        sim.schedule(waiter)
+    sim.schedule(ticker)
+    return Bench(sim, float("inf"), lambda: {"woken": woken[0]})
+
+
+MODELS: dict[str, tuple[Callable[..., Bench], tuple[int, ...]]] = {
+    "mm1": (mm1, (1_000, 10_000, 50_000)),
+    "mmc": (mmc, (1_000, 10_000, 50_000)),
+    "mm1-datetime": (mm1_datetime, (1_000, 10_000, 50_000)),
+    "producer-consumer": (producer_consumer, (1_000, 10_000, 50_000)),
+    "tanks": (tanks, (1_000, 10_000)),
+    "sleepers": (sleepers, (100, 300, 1_000)),
+    "waiters": (waiters, (10, 100, 1_000)),
+}
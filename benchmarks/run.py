@@ -0,0 +1,160 @@
+"""
+Run the benchmark suite.
+
+```bash
+python benchmarks/run.py                      # every model and size
+python benchmarks/run.py mm1 waiters --quick  # smallest size of some models
+python benchmarks/run.py --compare benchmarks/results/0.1.5.json
+```
+
+Every model is run three times per size: once to measure the wall time with the plain
+scheduler loop, once with profiling enabled to count the events and process switches, and
+once under `tracemalloc` to measure the peak memory. The M/M/c models are checked against
+the Erlang C formulas first, and the run fails if they do not match.
+
+Results are written to `benchmarks/results/<version>.json` so that runs of different
+versions can be compared with `--compare`.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime
+from importlib.metadata import version
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from models import MODELS, erlang_c, mm1, mmc  # noqa: E402
+
+RESULTS = Path(__file__).parent / "results"
+
+
+def check_analytic(size: int = 200_000, seed: int = 1, tolerance: float = 0.1) -> list[str]:
+    """Compare the simulated M/M/1 and M/M/4 queues with their analytic measures.
+
+    Returns:
+        list of the measures that differ by more than `tolerance`, relative to the analytic value.
+    """
+    failures = []
+    for model, servers in ((mm1, 1), (mmc, 4)):
+        bench = model(size, seed)
+        bench.sim.run(until=bench.until)
+        simulated = bench.outputs()
+        expected = erlang_c(0.8 * servers, 1.0, servers)
+        for key in ("wq", "p_wait", "utilization"):
+            error = abs(simulated[key] - expected[key]) / expected[key]
+            line = f"M/M/{servers} {key}: simulated {simulated[key]:.4f}, analytic {expected[key]:.4f}"
+            print(line if error <= tolerance else f"{line} FAILED")
+            if error > tolerance:
+                failures.append(line)
+    return failures
+
+
+def measure(name: str, size: int, seed: int = 1) -> dict:
+    """Measure the speed and the memory of a model of a given size."""
+    model, _ = MODELS[name]
+
+    bench = model(size, seed)
+    start = perf_counter()
+    bench.sim.run(until=bench.until)
+    wall = perf_counter() - start
+
+    bench = model(size, seed, profile=True)
+    bench.sim.run(until=bench.until)
+    stats = bench.sim.stats()
+
+    tracemalloc.start()
+    try:
+        bench = model(size, seed)
+        bench.sim.run(until=bench.until)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "model": name,
+        "size": size,
+        "wall_time": wall,
+        "events": stats.events,
+        "switches": stats.switches,
+        "switches_per_second": stats.switches / wall,
+        "max_conds": stats.max_conds,
+        "max_times": stats.max_times,
+        "peak_memory": peak,
+        "outputs": bench.outputs(),
+    }
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Find the models that got slower than the baseline by more than `threshold`."""
+    previous = {(r["model"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r["model"], r["size"]))
+        if old is None:
+            continue
+        change = r["switches_per_second"] / old["switches_per_second"] - 1
+        memory = r["peak_memory"] / max(old["peak_memory"], 1) - 1
+        line = f"{r['model']:<18} {r['size']:>8} speed {change:+7.1%} memory {memory:+7.1%}"
+        print(line if change >= -threshold else f"{line} REGRESSION")
+        if change < -threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("models", nargs="*", help=f"models to run, default all: {', '.join(MODELS)}")
+    parser.add_argument("--quick", action="store_true", help="run the smallest size only")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="results file, default results/<version>.json")
+    parser.add_argument("--compare", type=Path, help="results file of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, default 10%%")
+    parser.add_argument("--skip-check", action="store_true", help="skip the analytic M/M/c check")
+    args = parser.parse_args(argv)
+    unknown = set(args.models) - set(MODELS)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    if not args.skip_check:
+        failures = check_analytic(seed=args.seed)
+        if failures:
+            print("analytic check failed", file=sys.stderr)
+            return 1
+
+    results = []
+    for name in args.models or MODELS:
+        _, sizes = MODELS[name]
+        for size in sizes[:1] if args.quick else sizes:
+            r = measure(name, size, args.seed)
+            results.append(r)
+            print(
+                f"{name:<18} {size:>8} {r['wall_time']:8.3f}s "
+                f"{r['switches_per_second']:>10,.0f} switches/s {r['peak_memory'] / 2**20:8.2f} MiB"
+            )
+
+    pydes_version = version("py-des-lib")
+    output = args.output or RESULTS / f"{pydes_version}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "version": pydes_version,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"results written to {output}")
+
+    if args.compare is not None:
+        if compare(results, json.loads(args.compare.read_text()), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,13 @@ from importlib.metadata import version
 
 __version__ = version("py-des-lib")
 
-from pydes.core import Simulator
+from pydes.core import EventHandle, Interrupt, Process, Simulator, SimulatorStats
 from pydes.monitor import Monitor, Record
 
 from pydes.components import (
     Component,
     Container,
+    PreemptiveResource,
     Queue,
     Resource,
     State,
@@ -17,6 +18,10 @@ from pydes.components import (
 
 __all__ = [
     "Simulator",
+    "SimulatorStats",
+    "EventHandle",
+    "Interrupt",
+    "Process",
     "Monitor",
     "Record",
     "Component",
@@ -25,5 +30,6 @@ __all__ = [
     "Event",
     "State",
     "Resource",
+    "PreemptiveResource",
     "Store",
 ]
@@ -0,0 +1,171 @@
+"""
+This is the pydes.aio module.
+
+It provides an asyncio event loop whose clock is the simulation time of a `Simulator`.
+`asyncio.sleep`, timeouts and `call_later` advance the simulation time instead of waiting,
+so async code runs next to the greenlet processes of the model, as fast as the model allows.
+
+```python
+import asyncio
+from pydes import Simulator
+from pydes.aio import SimulatorEventLoop
+
+async def client(n):
+    for _ in range(n):
+        await asyncio.sleep(1.5)
+        sim.record("client", "request")
+
+def process():
+    sim.sleep(2)
+    result = loop.wait(asyncio.sleep(3, result="done"))  # blocks this process for 3
+
+sim = Simulator()
+loop = SimulatorEventLoop(sim)
+loop.create_task(client(10))
+sim.schedule(process)
+sim.run(until=3600)
+```
+
+The loop is driven by event handlers of the simulator, so it is not started with
+`run_forever` or `run_until_complete`: create tasks on it and run the simulator. One unit
+of numeric time is one second, datetime simulations use their real durations. The loop
+does not support I/O, only callbacks, timers, futures and tasks.
+"""
+
+import asyncio
+import heapq
+import threading
+from asyncio import events
+from datetime import datetime, timedelta
+from math import ceil
+from typing import Any, Awaitable
+
+from pydes.core import EventHandle, Simulator
+
+
+class _NullSelector:
+    """Selector without file descriptors that never blocks."""
+
+    def select(self, timeout: float | None = None) -> list:
+        return []
+
+    def close(self):
+        pass
+
+
+class SimulatorEventLoop(asyncio.BaseEventLoop):
+    """An asyncio event loop running in the simulation time of a `Simulator`.
+
+    The loop is driven by an event handler of the simulator that runs its ready callbacks.
+    The handler is scheduled at the current time when a callback is added, and at the time
+    of the earliest timer of the loop otherwise, so an idle loop costs nothing to the
+    simulator and is not a blocked process.
+
+    Args:
+        sim: The simulator instance.
+    """
+
+    def __init__(self, sim: Simulator):
+        super().__init__()
+        self._sim = sim
+        self._selector = _NullSelector()
+        self._clock_resolution = 1e-6 if isinstance(sim.now(), datetime) else 1e-9
+        self._wakeup: EventHandle | None = None
+        sim._register(self)
+
+    def reset(self):
+        # the pending wakeup was dropped with the event list of the simulator, the loop runs
+        # again when a callback or a timer is added
+        self._wakeup = None
+
+    def time(self) -> float:
+        """Get the simulation time, in seconds since the initial time for datetime simulations."""
+        now = self._sim.now()
+        if isinstance(now, datetime):
+            return (now - self._sim._init_time).total_seconds()
+        return now
+
+    def _sim_time(self, when: float) -> int | float | datetime:
+        """Convert a time of the loop into a simulation time, never before `when`."""
+        if isinstance(self._sim._init_time, datetime):
+            return self._sim._init_time + timedelta(microseconds=ceil(when * 1e6))
+        return when
+
+    def _process_events(self, event_list: list):
+        pass
+
+    def _write_to_self(self):
+        pass
+
+    def run_forever(self):
+        raise RuntimeError("a SimulatorEventLoop is driven by its simulator, use Simulator.run")
+
+    def run_until_complete(self, future):
+        raise RuntimeError("a SimulatorEventLoop is driven by its simulator, use Simulator.run")
+
+    def _call_soon(self, callback, args, context):
+        handle = super()._call_soon(callback, args, context)
+        self._wake(self._sim.now())
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        timer = super().call_at(when, callback, *args, context=context)
+        self._wake(self._sim_time(when))
+        return timer
+
+    def _next_timer(self) -> float | None:
+        """Time of the earliest timer that is not cancelled."""
+        while self._scheduled and self._scheduled[0]._cancelled:
+            self._timer_cancelled_count -= 1
+            handle = heapq.heappop(self._scheduled)
+            handle._scheduled = False
+        return self._scheduled[0]._when if self._scheduled else None
+
+    def _wake(self, at: int | float | datetime):
+        """Run the loop at the simulation time `at`, unless it already runs earlier."""
+        if self._wakeup is not None:
+            if self._wakeup.time <= at:
+                return
+            self._wakeup.cancel()
+        self._wakeup = self._sim.call_at(max(at, self._sim.now()), self._run)
+
+    def _schedule_wakeup(self):
+        """Run the loop when it has ready callbacks or its next timer is due."""
+        if self.is_closed():
+            return
+        if self._ready:
+            self._wake(self._sim.now())
+            return
+        when = self._next_timer()
+        if when is not None:
+            self._wake(self._sim_time(when))
+
+    def _run(self):
+        """Event handler that runs the ready callbacks and the due timers of the loop."""
+        self._wakeup = None
+        if self.is_closed():
+            return
+        previous = events._get_running_loop()
+        events._set_running_loop(self)
+        self._thread_id = threading.get_ident()
+        try:
+            self._run_once()
+        finally:
+            self._thread_id = None
+            events._set_running_loop(previous)
+        self._schedule_wakeup()
+
+    def wait(self, awaitable: Awaitable) -> Any:
+        """Block the calling process until an awaitable of this loop completes.
+
+        This is how greenlet processes call async code.
+
+        Args:
+            awaitable: a coroutine, task or future.
+
+        Returns:
+            the result of the awaitable. Its exception is raised if it failed.
+        """
+        future = asyncio.ensure_future(awaitable, loop=self)
+        self._sim.wait_for(future.done)
+        return future.result()
@@ -0,0 +1,347 @@
+"""
+This is the pydes.analysis module.
+
+It turns the `Record`s collected during a simulation into NumPy arrays and
+computes time series statistics over them in vectorized form.
+
+```python
+from pydes.analysis import step_function, throughput
+
+sim.run(until=1000)
+queue = step_function(sim.records("queue-size"))
+queue.mean(end=sim.now())
+queue.resample(0, 1000, 10)
+throughput(sim.records("departure"), width=100, start=0, end=1000)
+```
+
+NumPy is an optional dependency of Py-DES and it is only required by this module.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "pydes.analysis requires numpy, install it with `pip install numpy`"
+    ) from e
+
+from pydes.monitor import Record
+
+TimeType = int | float | datetime
+
+
+def _to_seconds(values, origin: datetime) -> np.ndarray:
+    """Convert datetimes into seconds elapsed since `origin`."""
+    arr = np.asarray(values, dtype="datetime64[us]")
+    return (arr - np.datetime64(origin, "us")) / np.timedelta64(1, "s")
+
+
+def times(records: Sequence[Record], origin: datetime | None = None) -> np.ndarray:
+    """Get the times of a list of records as a float array.
+
+    Args:
+        records: list of `Record` objects, typically returned by `Simulator.records`.
+        origin: Reference time used to convert datetime records into seconds. If None, the
+            time of the first record is used.
+
+    Returns:
+        float array with the time of each record.
+    """
+    if len(records) == 0:
+        return np.empty(0, dtype=float)
+    values = [r.time for r in records]
+    if isinstance(values[0], datetime):
+        return _to_seconds(values, origin if origin is not None else values[0])
+    return np.fromiter(values, dtype=float, count=len(values))
+
+
+def values(records: Sequence[Record]) -> np.ndarray:
+    """Get the values of a list of records as an array.
+
+    Numeric values produce a numeric array, any other value produces an object array.
+
+    Args:
+        records: list of `Record` objects.
+
+    Returns:
+        array with the value of each record.
+    """
+    arr = np.array([r.value for r in records])
+    if arr.dtype.kind not in "biuf":
+        arr = np.empty(len(records), dtype=object)
+        arr[:] = [r.value for r in records]
+    return arr
+
+
+class StepFunction:
+    """A piecewise constant function of the simulation time.
+
+    The value set at `times[i]` holds until `times[i + 1]`. It is the natural representation
+    of recorded states such as the size of a queue or the usage of a resource.
+
+    Args:
+        times: Non decreasing array of change times.
+        values: Value taken at every change time.
+        origin: Reference datetime when the function was built from datetime records.
+
+    When several values share the same time, only the last one is kept.
+    """
+
+    def __init__(self, times: Iterable[float], values: Iterable[Any], origin: datetime | None = None):
+        t = np.asarray(times, dtype=float)
+        v = np.asarray(values)
+        if t.shape != v.shape:
+            raise ValueError("times and values must have the same length")
+        if t.size and np.any(np.diff(t) < 0):
+            raise ValueError("times must be non decreasing")
+        keep = np.r_[t[1:] != t[:-1], True] if t.size else np.empty(0, dtype=bool)
+        self.times = t[keep]
+        self.values = v[keep]
+        self.origin = origin
+
+    def _num(self, t):
+        """Convert a time argument into the numeric scale of the function."""
+        if t is None:
+            return None
+        if self.origin is not None:
+            if isinstance(t, datetime):
+                return float(_to_seconds(t, self.origin))
+            if isinstance(t, np.ndarray) and t.dtype.kind == "M":
+                return _to_seconds(t, self.origin)
+        return np.asarray(t, dtype=float) if np.ndim(t) else float(t)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _window(self, start, end) -> tuple[float, float]:
+        start = self._num(start)
+        end = self._num(end)
+        if start is None:
+            start = self.times[0]
+        if end is None:
+            end = self.times[-1]
+        if end < start:
+            raise ValueError("end cannot be less than start")
+        return start, end
+
+    def _segments(self, start, end) -> tuple[np.ndarray, np.ndarray]:
+        """Durations and values of the steps clipped to `[start, end]`."""
+        start, end = self._window(start, end)
+        bounds = np.clip(np.r_[self.times, np.inf], start, end)
+        durations = np.diff(bounds)
+        return durations, self.values
+
+    def __call__(self, t, fill: Any = np.nan):
+        """Evaluate the function at one or many times.
+
+        Args:
+            t: a time or an array of times.
+            fill: Value returned for times before the first change, default is `nan`.
+
+        Returns:
+            the value or array of values at `t`.
+        """
+        t = self._num(t)
+        idx = np.searchsorted(self.times, t, side="right") - 1
+        if np.ndim(idx) == 0:
+            return fill if idx < 0 else self.values[idx]
+        out = self.values[np.maximum(idx, 0)]
+        if np.any(idx < 0):
+            out = out.astype(np.result_type(out.dtype, np.asarray(fill).dtype))
+            out[idx < 0] = fill
+        return out
+
+    def integral(self, start: TimeType | None = None, end: TimeType | None = None) -> float:
+        """Integrate a numeric function over `[start, end]`.
+
+        Args:
+            start: Beginning of the window, default is the first change time.
+            end: End of the window, default is the last change time.
+
+        Returns:
+            the area under the function, 0 for an empty function.
+        """
+        if len(self) == 0:
+            return 0.0
+        durations, values = self._segments(start, end)
+        return float(np.dot(durations, values))
+
+    def mean(self, start: TimeType | None = None, end: TimeType | None = None) -> float:
+        """Get the time weighted average of a numeric function over `[start, end]`.
+
+        Args:
+            start: Beginning of the window, default is the first change time.
+            end: End of the window, default is the last change time. Usually `sim.now()`.
+
+        Returns:
+            the time weighted average, or `nan` for an empty function or window.
+        """
+        if len(self) == 0:
+            return float("nan")
+        durations, values = self._segments(start, end)
+        total = durations.sum()
+        if total == 0:
+            return float("nan")
+        return float(np.dot(durations, values) / total)
+
+    def resample(
+        self,
+        start: TimeType,
+        end: TimeType,
+        step: int | float | timedelta,
+        fill: Any = np.nan,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sample the function on a regular grid.
+
+        Args:
+            start: First point of the grid.
+            end: Last point of the grid (excluded).
+            step: Grid spacing.
+            fill: Value used for grid points before the first change, default is `nan`.
+
+        Returns:
+            a `(grid, values)` tuple of arrays. For datetime functions the grid is a `datetime64` array.
+        """
+        if isinstance(step, timedelta):
+            step = step.total_seconds()
+        grid = np.arange(self._num(start), self._num(end), step)
+        sampled = self(grid, fill=fill)
+        if self.origin is not None:
+            grid = np.datetime64(self.origin, "us") + (grid * 1e6).astype("timedelta64[us]")
+        return grid, sampled
+
+    def durations(self, start: TimeType | None = None, end: TimeType | None = None) -> dict[Any, float]:
+        """Get the total time spent in every value over `[start, end]`.
+
+        Args:
+            start: Beginning of the window, default is the first change time.
+            end: End of the window, default is the last change time.
+
+        Returns:
+            dict mapping every value to the time the function held it.
+        """
+        if len(self) == 0:
+            return {}
+        durations, values = self._segments(start, end)
+        if values.dtype != object:
+            keys, inverse = np.unique(values, return_inverse=True)
+            totals = np.bincount(inverse.ravel(), weights=durations, minlength=len(keys))
+            return {k.item(): float(d) for k, d in zip(keys, totals) if d > 0}
+        result: dict[Any, float] = {}
+        for value, duration in zip(values, durations):
+            if duration > 0:
+                result[value] = result.get(value, 0.0) + float(duration)
+        return result
+
+
+def step_function(records: Sequence[Record], origin: datetime | None = None) -> StepFunction:
+    """Build a `StepFunction` from the records of a state.
+
+    Args:
+        records: list of `Record` objects of a single name, e.g. `sim.records("queue")`.
+        origin: Reference time for datetime records, default is the first record time.
+
+    Returns:
+        the `StepFunction` of the recorded values.
+    """
+    if len(records) and isinstance(records[0].time, datetime) and origin is None:
+        origin = records[0].time
+    return StepFunction(times(records, origin), values(records), origin)
+
+
+def throughput(
+    records: Sequence[Record],
+    width: int | float | timedelta,
+    start: TimeType | None = None,
+    end: TimeType | None = None,
+    origin: datetime | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Count the records in consecutive windows `[edges[i], edges[i + 1])`.
+
+    Windows are half open, like the time windows of `Simulator.records`, so a record made
+    exactly at `end` is not counted. When `end - start` is not a multiple of `width` the last
+    window is shorter and its rate is computed over its actual length.
+
+    Args:
+        records: list of `Record` objects, e.g. the departures of a server.
+        width: Width of each window.
+        start: Beginning of the first window, default is the first record time.
+        end: End of the last window. If None, full windows are added until every record is counted.
+        origin: Reference time for datetime records, default is `start` or the first record time.
+
+    Returns:
+        a `(edges, rates)` tuple where `rates[i]` is the number of records per time unit
+        between `edges[i]` and `edges[i + 1]`. For datetime records `edges` is a `datetime64` array.
+    """
+    if origin is None:
+        if isinstance(start, datetime):
+            origin = start
+        elif len(records) and isinstance(records[0].time, datetime):
+            origin = records[0].time
+    t = times(records, origin)
+    if isinstance(width, timedelta):
+        width = width.total_seconds()
+    if origin is not None:
+        start = None if start is None else float(_to_seconds(start, origin))
+        end = None if end is None else float(_to_seconds(end, origin))
+    if start is None:
+        start = t[0] if t.size else 0.0
+    if end is None:
+        last = t[-1] if t.size else start
+        end = start + width * (np.floor((last - start) / width) + 1)
+    if end <= start:
+        raise ValueError("end must be greater than start")
+    n = int(np.ceil((end - start) / width))
+    edges = np.minimum(start + width * np.arange(n + 1), end)
+    counts = np.diff(np.searchsorted(t, edges, side="left"))
+    rates = counts / np.diff(edges)
+    if origin is not None:
+        edges = np.datetime64(origin, "us") + (edges * 1e6).astype("timedelta64[us]")
+    return edges, rates
+
+
+def mser(observations: Sequence[float], batch_size: int = 5) -> int:
+    """Detect the end of the warm-up period of an output series with the MSER rule.
+
+    The observations are grouped in batches of `batch_size` (MSER-5 by default) and the
+    truncation point is the number of leading batches `d` that minimizes the marginal
+    standard error `sum((y[d:] - mean(y[d:]))**2) / (k - d)**2`, searched over the first
+    half of the `k` batches.
+
+    Args:
+        observations: output values in the order they were observed, e.g. waiting times.
+        batch_size: number of observations per batch, default is 5.
+
+    Returns:
+        the number of leading observations to discard.
+    """
+    y = np.asarray(observations, dtype=float)
+    k = len(y) // batch_size
+    if k < 2:
+        return 0
+    y = y[: k * batch_size].reshape(k, batch_size).mean(axis=1)
+    s1 = np.cumsum(y[::-1])[::-1]
+    s2 = np.cumsum((y * y)[::-1])[::-1]
+    n = k - np.arange(k)
+    stat = (s2 - s1 * s1 / n) / (n * n)
+    d = int(np.argmin(stat[: k // 2 + 1]))
+    return d * batch_size
+
+
+def warmup_time(records: Sequence[Record], batch_size: int = 5) -> TimeType | None:
+    """Detect the end of the warm-up period from the records of an output.
+
+    Args:
+        records: records of a single output, e.g. `sim.records("waiting")`.
+        batch_size: number of records per batch, default is 5 (MSER-5).
+
+    Returns:
+        the time of the first record after the warm-up period, or None without records.
+        Pass it to `sim.records(name, start=...)` to keep the steady state records only.
+    """
+    if len(records) == 0:
+        return None
+    d = mser(values(records), batch_size)
+    return records[min(d, len(records) - 1)].time
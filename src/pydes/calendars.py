@@ -0,0 +1,291 @@
+"""
+This is the pydes.calendars module.
+
+Calendars describe values that change at known times, like the arrival rate of customers
+along the day or the number of operators of every shift. Their change points are computed
+up front, so a `Simulator` only needs one event per change instead of a process polling
+the value in small steps.
+
+```python
+from datetime import datetime, timedelta
+from pydes import Resource, Simulator
+from pydes.calendars import Calendar, CapacitySchedule, PoissonArrivals
+
+start = datetime(2024, 1, 1)
+sim = Simulator(init=start)
+shifts = Calendar(
+    [(timedelta(hours=0), 1), (timedelta(hours=8), 3), (timedelta(hours=20), 2)],
+    period=timedelta(days=1),
+    origin=start,
+)
+operators = Resource(sim)
+CapacitySchedule(sim, operators, shifts)
+
+# customers per hour
+rates = Calendar([(timedelta(hours=0), 0.5), (timedelta(hours=9), 12)], period=timedelta(days=1), origin=start)
+PoissonArrivals(sim, rates, customer)
+```
+"""
+
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from math import inf
+from typing import Any, Callable, Sequence
+
+from pydes.components import Component, Resource
+from pydes.core import Simulator
+
+
+class Calendar:
+    """A piecewise constant value of the simulation time.
+
+    Args:
+        changes: `(offset, value)` pairs sorted by offset. Offsets are measured from `origin`
+            and the first one must be 0. Each value holds until the next offset.
+        period: Length of the cycle after which the changes repeat, default is None (no repetition).
+        origin: Simulation time of offset 0, default is 0. Use a datetime for datetime simulations.
+        unit: For datetime simulations, the duration of one time unit. Rates of arrival
+            processes are expressed per unit, default is one hour.
+
+    Offsets and period are numbers for numeric simulations and timedeltas for datetime ones.
+    """
+
+    def __init__(
+        self,
+        changes: Sequence[tuple[int | float | timedelta, Any]],
+        period: int | float | timedelta | None = None,
+        origin: int | float | datetime = 0,
+        unit: timedelta = timedelta(hours=1),
+    ):
+        if not changes:
+            raise ValueError("a calendar needs at least one change")
+        self._origin = origin
+        self._unit = unit
+        self._offsets = [self._units(offset) for offset, _ in changes]
+        self._values = [value for _, value in changes]
+        if self._offsets[0] != 0:
+            raise ValueError("the first change of a calendar must be at offset 0")
+        if any(b <= a for a, b in zip(self._offsets, self._offsets[1:])):
+            raise ValueError("the changes of a calendar must be sorted by offset")
+        self._period = None if period is None else self._units(period)
+        if self._period is not None and self._period <= self._offsets[-1]:
+            raise ValueError("the period of a calendar must be greater than its last offset")
+
+    def _units(self, d: int | float | timedelta) -> float:
+        """Convert a duration into calendar units."""
+        if isinstance(d, timedelta):
+            return d / self._unit
+        return d
+
+    def _x(self, t: int | float | datetime) -> float:
+        """Convert a simulation time into units elapsed since the origin."""
+        if isinstance(t, datetime):
+            return (t - self._origin) / self._unit
+        return t - self._origin
+
+    def _t(self, x: float) -> int | float | datetime:
+        """Convert units elapsed since the origin into a simulation time."""
+        if isinstance(self._origin, datetime):
+            return self._origin + x * self._unit
+        return self._origin + x
+
+    def _start(self, cycle: int, i: int) -> float:
+        """Units position of the change `i` of a cycle."""
+        if self._period is None:
+            return self._offsets[i]
+        return cycle * self._period + self._offsets[i]
+
+    def _next(self, cycle: int, i: int) -> tuple[int, int] | None:
+        """Cycle and index of the change after the change `i` of a cycle, if any."""
+        if i + 1 < len(self._offsets):
+            return cycle, i + 1
+        if self._period is not None:
+            return cycle + 1, 0
+        return None
+
+    def _locate(self, x: float, t: int | float | datetime | None = None) -> tuple[int, int]:
+        """Cycle and index of the change in effect at `x`, or at the simulation time `t`.
+
+        The remainder of `x` by the period can round just below an offset, so it only gives
+        a first guess. The change points are always computed from the cycle and the offset
+        with `_start` and `x` is placed by comparing its simulation time to theirs, which
+        keeps `value_at` and `next_change` consistent with the times they return.
+        """
+        if t is None:
+            t = self._t(x)
+        cycle = 0
+        if self._period is not None:
+            cycle = int(x // self._period)
+            x -= cycle * self._period
+        elif x < 0:
+            raise ValueError("time is before the origin of the calendar")
+        i = bisect_right(self._offsets, x) - 1
+        while i < 0 or self._t(self._start(cycle, i)) > t:
+            i -= 1
+            if i < 0:
+                cycle, i = cycle - 1, len(self._offsets) - 1
+        while (following := self._next(cycle, i)) is not None:
+            if self._t(self._start(*following)) > t:
+                break
+            cycle, i = following
+        return cycle, i
+
+    def values(self) -> list[Any]:
+        """Get the values of a cycle of the calendar, in order of change."""
+        return list(self._values)
+
+    def value_at(self, t: int | float | datetime) -> Any:
+        """Get the value of the calendar at a given simulation time.
+
+        Args:
+            t: Simulation time.
+
+        Returns:
+            the value in effect at `t`.
+        """
+        _, i = self._locate(self._x(t), t)
+        return self._values[i]
+
+    def _segment(
+        self, x: float, t: int | float | datetime | None = None
+    ) -> tuple[Any, float]:
+        """Value in effect at `x` (in units) and the units position of the next change.
+
+        The next change is always strictly after `x`, and after `t` as a simulation time.
+        """
+        cycle, i = self._locate(x, t)
+        following = self._next(cycle, i)
+        if following is None:
+            return self._values[i], inf
+        return self._values[i], self._start(*following)
+
+    def next_change(self, t: int | float | datetime) -> int | float | datetime | None:
+        """Get the time of the first change strictly after `t`.
+
+        Args:
+            t: Simulation time.
+
+        Returns:
+            the simulation time of the next change, or None if the value never changes again.
+        """
+        _, x = self._segment(self._x(t), t)
+        return None if x == inf else self._t(x)
+
+
+class CapacitySchedule(Component):
+    """Changes the capacity of a `Resource` following a `Calendar`.
+
+    A single process sleeps until every change point, so the cost is one event per change.
+    The process is scheduled on creation.
+
+    Args:
+        sim: The simulator instance.
+        resource: The resource whose capacity is changed.
+        calendar: Calendar of capacities.
+    """
+
+    def __init__(self, sim: Simulator, resource: Resource, calendar: Calendar):
+        self._sim = sim
+        self._resource = resource
+        self._calendar = calendar
+        self._sim.schedule(self.main)
+
+    def main(self):
+        while True:
+            self._resource.set_capacity(self._calendar.value_at(self._sim.now()))
+            change = self._calendar.next_change(self._sim.now())
+            if change is None:
+                return
+            self._sim.sleep_until(change)
+
+
+class PoissonArrivals(Component):
+    """Generates arrivals of a non-homogeneous Poisson process.
+
+    The rate is either a constant or a `Calendar` of rates per time unit. Every arrival
+    schedules `func` as a new process, and the source sleeps exactly until the next arrival,
+    which is generated by one of two methods:
+
+    - `"inversion"` (default): a unit exponential is mapped through the cumulative rate,
+      walking the change points of the calendar. Intervals with rate zero are skipped at no
+      cost and there are no rejected candidates.
+    - `"thinning"`: candidates are generated at the maximum rate and accepted with
+      probability `rate / max_rate`.
+
+    Args:
+        sim: The simulator instance.
+        rate: Arrivals per time unit, constant or as a `Calendar`.
+        func: Function scheduled as a process at every arrival.
+        stream: Source of random numbers with `expovariate` and `random` methods, like a
+            `pydes.random.Stream` or a `random.Random`, default is the `random` module.
+        method: `"inversion"` or `"thinning"`, default is `"inversion"`.
+        until: No arrivals are generated after this time, default is None.
+    """
+
+    def __init__(
+        self,
+        sim: Simulator,
+        rate: float | Calendar,
+        func: Callable[[], None],
+        stream: Any = None,
+        method: str = "inversion",
+        until: int | float | datetime | None = None,
+    ):
+        if method not in ("inversion", "thinning"):
+            raise ValueError(f"unknown method {method!r}")
+        if not isinstance(rate, Calendar):
+            rate = Calendar([(0, rate)], origin=sim.now())
+        self._sim = sim
+        self._calendar = rate
+        self._func = func
+        self._stream = stream if stream is not None else random
+        self._method = method
+        self._until = until
+        self._sim.schedule(self.main)
+
+    def _inversion(self, x: float) -> float:
+        """Position of the next arrival after `x`, in calendar units."""
+        e = self._stream.expovariate(1.0)
+        while True:
+            rate, end = self._calendar._segment(x)
+            if rate > 0 and e <= rate * (end - x):
+                return x + e / rate
+            if end == inf:
+                return inf
+            e -= rate * (end - x)
+            x = end
+
+    def _thinning(self, x: float) -> float:
+        """Position of the next arrival after `x`, in calendar units."""
+        top = max(self._calendar.values())
+        if top <= 0:
+            return inf
+        while True:
+            x += self._stream.expovariate(top)
+            rate, _ = self._calendar._segment(x)
+            if self._stream.random() * top < rate:
+                return x
+
+    def next_arrival(self, t: int | float | datetime) -> int | float | datetime | None:
+        """Generate the time of the next arrival after `t`.
+
+        Args:
+            t: Simulation time.
+
+        Returns:
+            the simulation time of the next arrival, or None if there are no more arrivals.
+        """
+        x = self._calendar._x(t)
+        x = self._inversion(x) if self._method == "inversion" else self._thinning(x)
+        if x == inf:
+            return None
+        return self._calendar._t(x)
+
+    def main(self):
+        while True:
+            arrival = self.next_arrival(self._sim.now())
+            if arrival is None or (self._until is not None and arrival > self._until):
+                return
+            self._sim.sleep_until(arrival)
+            self._sim.schedule(self._func)
@@ -1,22 +1,35 @@
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+from itertools import count
 from math import inf
-from typing import Any
-from pydes.core import Simulator
+from typing import Any, Callable
+from greenlet import greenlet
+from pydes.core import EventHandle, Simulator
 
 
 class _MetaComponent(type):
-    """Metaclass used to track the number of instances of every component subclass."""
+    """Metaclass used to track the number of instances of every component subclass.
+
+    Components that keep their simulator in `_sim`, like the built-in ones, are numbered by
+    that simulator, so that its components have unique names whatever the other
+    simulators do. The others are numbered across the interpreter.
+    """
 
     __component_instance_count = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls.__component_instance_count:
-            cls.__component_instance_count[cls] = 0
-        else:
-            cls.__component_instance_count[cls] += 1
-
         instance = super().__call__(*args, **kwargs)
 
-        instance.__name__ = f"{cls.__name__}.{cls.__component_instance_count[cls]}"
+        sim = instance.__dict__.get("_sim")
+        if isinstance(sim, Simulator):
+            instance.__name__ = sim._name(instance)
+        else:
+            number = cls.__component_instance_count.get(cls, 0)
+            cls.__component_instance_count[cls] = number + 1
+            instance.__name__ = f"{cls.__name__}.{number}"
 
         return instance
 
@@ -68,6 +81,13 @@ class Component(metaclass=_MetaComponent):
     def id(self):
         return self.__name__
 
+    def reset(self):
+        """Bring the component back to its initial state.
+
+        It is called by `Simulator.reset` for the built-in components. Subclasses holding
+        state override it.
+        """
+
 
 class Event(Component):
     """An event can be waited and set by components. They are very useful to model
@@ -85,6 +105,10 @@ class Event(Component):
     def __init__(self, sim: Simulator):
         self._sim = sim
         self._value = False
+        sim._register(self)
+
+    def reset(self):
+        self._value = False
 
     def set(self):
         """Set the event."""
@@ -112,6 +136,11 @@ class State(Component):
     def __init__(self, sim: Simulator, value: Any):
         self._sim = sim
         self._value = value
+        self._init_value = value
+        sim._register(self)
+
+    def reset(self):
+        self._value = self._init_value
 
     def set(self, value: Any):
         """Set the state to a new value.
@@ -133,44 +162,118 @@ class State(Component):
 class Queue(Component):
     """Queues are used to acumulate objects in a buffer and retrieved them from it.
 
+    The discipline sets the order in which members leave the queue:
+
+    - `"fifo"`: first in, first out, the default.
+    - `"lifo"`: last in, first out.
+    - `"priority"`: lowest `priority` first, members of the same priority in FIFO order.
+    - `"random"`: a member chosen at random.
+
+    Every discipline puts and gets members in constant or logarithmic time. Processes
+    blocked in `get` on an empty queue are also served by priority, lowest first, and in
+    order of arrival among the same priority.
+
+    ```python
+    triage = Queue(sim, discipline="priority")
+    triage.put(patient, priority=patient.severity)
+    next_patient = triage.get()
+    ```
+
     Args:
         sim: The simulator instance.
         capacity: The maximun lenght of the queue.
+        discipline: The order of service, default is `"fifo"`.
+        stream: Random number generator of the `"random"` discipline, e.g. a stream of
+            `pydes.random.Streams`, default is the `random` module.
 
     Methods:
         put: tries to insert a new member into the queue and waits if the queue is full.
         get: tries to get one member from the queue and waits if the queue is empty.
     """
 
-    def __init__(self, sim: Simulator, capacity: float | int = inf):
+    DISCIPLINES = ("fifo", "lifo", "priority", "random")
+
+    def __init__(
+        self,
+        sim: Simulator,
+        capacity: float | int = inf,
+        discipline: str = "fifo",
+        stream: Any = None,
+    ):
         """Constructor for Queue class.
 
         Args:
             sim (Simulator): The simulator instance.
         """
+        if discipline not in self.DISCIPLINES:
+            raise ValueError(
+                f"unknown discipline {discipline!r}, use one of {', '.join(self.DISCIPLINES)}"
+            )
         self._sim = sim
-        self._waiters = []
         self._capacity = capacity
-
-    def get(self) -> Any:
+        self._discipline = discipline
+        self._stream = random if stream is None else stream
+        sim._register(self)
+        self.reset()
+
+    def reset(self):
+        self._waiters: Any = deque() if self._discipline == "fifo" else []
+        # (priority, seq, slot) of the processes blocked in get
+        self._getters: list[tuple[Any, int, list]] = []
+        self._seq = count()
+
+    def get(self, priority: Any = 0) -> Any:
         """Get an item from the queue.
 
         Waits until there is an item available in the queue.
 
+        Args:
+            priority: Priority of the process among the ones waiting for an item, lowest
+                first, default is 0.
+
         Returns:
             Any: The item retrieved from the queue.
         """
-        self._sim.wait_for(cond=lambda: self.size() > 0)
-        return self._waiters.pop(0)
-
-    def put(self, member: Any):
+        if self._waiters:
+            return self._pop()
+        slot = []
+        heappush(self._getters, (priority, next(self._seq), slot))
+        try:
+            self._sim.wait_for(cond=lambda: len(slot) > 0)
+        except BaseException:
+            # interrupted while waiting: pass on the item it was given, or drop out
+            if slot:
+                self._offer(*slot[0])
+            else:
+                slot.append(None)
+            raise
+        return slot[0][0]
+
+    def put(self, member: Any, priority: Any = 0):
         """Put an item into the queue or waits if the queue is full.
 
+        If processes are waiting in `get`, the item is handed to the first of them.
+
         Args:
             member (Any): The item to be put into the queue.
+            priority (Any): Priority of the item in a `"priority"` queue, lowest first,
+                default is 0. It is ignored by the other disciplines.
         """
-        self._sim.wait_for(cond=lambda: self.size() < self._capacity)
-        self._waiters.append(member)
+        if self.size() >= self._capacity:
+            self._sim.wait_for(cond=lambda: self.size() < self._capacity)
+        self._offer(member, priority)
+
+    def _offer(self, member: Any, priority: Any):
+        """Hand a member to the first waiting getter, or add it to the queue."""
+        while self._getters:
+            slot = heappop(self._getters)[2]
+            if not slot:  # getters that were interrupted are marked with None
+                slot.append((member, priority))
+                return
+        if self._discipline == "priority":
+            heappush(self._waiters, (priority, next(self._seq), member))
+        else:
+            self._waiters.append(member)
 
     def size(self) -> int:
         """Get the size of the queue. Its equivalent to the number of
@@ -181,6 +284,22 @@ class Queue(Component):
         """
         return len(self._waiters)
 
+    def discipline(self) -> str:
+        """Get the discipline of the queue."""
+        return self._discipline
+
+    def _pop(self) -> Any:
+        """Remove the next member according to the discipline."""
+        waiters = self._waiters
+        if self._discipline == "fifo":
+            return waiters.popleft()
+        if self._discipline == "priority":
+            return heappop(waiters)[2]
+        if self._discipline == "random":
+            i = self._stream.randrange(len(waiters))
+            waiters[i], waiters[-1] = waiters[-1], waiters[i]
+        return waiters.pop()
+
 
 class Resource(Component):
     """Resources can be requested and released by components and therefore are really
@@ -193,26 +312,43 @@ class Resource(Component):
     Methods:
         request: tries to get the ownership of this `Resource` and waits if the resource is not avialable.
         release: gives back the ownership of the `Resource` so that other user can make use of it.
+        set_capacity: changes the number of users that can hold the resource at the same time.
     """
 
     def __init__(self, sim: Simulator, capacity: int = 1) -> None:
         self._sim = sim
         self._capacity = capacity
+        self._init_capacity = capacity
+        self._users = []
+        self._requests = deque()
+        sim._register(self)
+
+    def reset(self):
+        self._capacity = self._init_capacity
         self._users = []
+        self._requests = deque()
 
     def request(self, by: Component):
         """Request the resource.
 
         If the resource is idle, the component can acquire it. Otherwise, it waits until the resource becomes idle.
+        Waiting requests get the resource in order of arrival.
 
         Args:
             by: The component requesting the resource.
         """
-        if self.is_idle():
+        if self.is_idle() and not self._requests:
             self._users.append(by)
-            # self._sim.wait_for(lambda: True)
         else:
-            self._sim.wait_for(lambda: self.is_idle())
+            ticket = object()
+            self._requests.append(ticket)
+            try:
+                self._sim.wait_for(lambda: self._requests[0] is ticket and self.is_idle())
+            except BaseException:
+                # interrupted while waiting, leave the line
+                self._requests.remove(ticket)
+                raise
+            self._requests.popleft()
             self._users.append(by)
 
     def release(self, by: Component):
@@ -240,16 +376,188 @@ class Resource(Component):
         """Get the capacity of the resource."""
         return self._capacity
 
+    def set_capacity(self, capacity: int):
+        """Change the capacity of the resource.
+
+        Reducing the capacity does not take the resource away from its current users, new
+        requests wait until the usage drops below the new capacity.
+
+        Args:
+            capacity: The new capacity of the resource.
+        """
+        if capacity < 0:
+            raise ValueError(f"capacity of {self} cannot be negative")
+        self._capacity = capacity
+
     def is_idle(self) -> bool:
         """Check if the resource is idle."""
         return self.usage() < self.capacity()
 
 
+@dataclass
+class Preempted:
+    """Cause of the `Interrupt` raised in a process preempted from a `PreemptiveResource`.
+
+    Args:
+        by (Any): the component that took the resource.
+        resource (PreemptiveResource): the resource.
+        usage_since (int | float | datetime): simulation time at which the preempted
+            process got the resource.
+    """
+
+    by: Any
+    resource: "PreemptiveResource"
+    usage_since: int | float | datetime
+
+
+class PreemptiveResource(Resource):
+    """A `Resource` whose requests have priorities, and where urgent requests can take the
+    resource away from less urgent users.
+
+    Requests are served by priority, lowest first, and in order of arrival among the same
+    priority. When a request finds the resource full and can preempt, the user with the
+    highest priority value, the most recent among equals, loses the resource if its
+    priority is higher than the one of the request. Its process is interrupted with
+    `Simulator.interrupt`: an `Interrupt` whose `cause` is a `Preempted` is raised where it
+    was waiting, usually the sleep of its service, and `remaining` is the time that was
+    left of it. The preempted process no longer holds the resource and must not release it.
+
+    ```python
+    def job(sim, machine, duration, priority):
+        me = object()
+        while duration > 0:
+            machine.request(me, priority=priority)
+            try:
+                sim.sleep(duration)
+                duration = 0
+                machine.release(me)
+            except Interrupt as interrupt:
+                duration = interrupt.remaining
+    ```
+
+    Args:
+        sim: The simulator instance.
+        capacity: The capacity of the resource, default is 1.
+    """
+
+    def __init__(self, sim: Simulator, capacity: int = 1) -> None:
+        super().__init__(sim, capacity)
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        # (priority, seq, ticket) of the waiting requests
+        self._requests = []
+        # [by, priority, seq, process, since] of the users
+        self._holders = []
+        self._seq = count()
+
+    def request(self, by: Component, priority: Any = 0, preempt: bool = True):
+        """Request the resource.
+
+        Args:
+            by: The component requesting the resource.
+            priority: Priority of the request, lowest first, default is 0.
+            preempt: Whether the request can take the resource from a user with a higher
+                priority value, default is True.
+        """
+        seq = next(self._seq)
+        if self.is_idle() and (not self._requests or (priority, seq) < self._requests[0][:2]):
+            return self._acquire(by, priority, seq)
+        # a resource that is not full has a slot for the first waiting request, which is
+        # about to resume, so preempting a user would take more than what is needed
+        if preempt and not self.is_idle():
+            process = greenlet.getcurrent()
+            victims = [
+                h
+                for h in self._holders
+                if h[1] > priority and h[3] and h[3] is not process
+                and h[3] not in self._sim._interrupts
+            ]
+            if victims and self.usage() <= self.capacity():
+                victim = max(victims, key=lambda h: (h[1], h[2]))
+                self._remove(victim)
+                cause = Preempted(by, self, victim[4])
+                self._sim.interrupt(victim[3], cause)
+                return self._acquire(by, priority, seq)
+        ticket = object()
+        heappush(self._requests, (priority, seq, ticket))
+        try:
+            self._sim.wait_for(lambda: self._requests[0][2] is ticket and self.is_idle())
+        except BaseException:
+            self._requests = [r for r in self._requests if r[2] is not ticket]
+            heapify(self._requests)
+            raise
+        heappop(self._requests)
+        self._acquire(by, priority, seq)
+
+    def release(self, by: Component):
+        """Release the resource.
+
+        Args:
+            by: The component releasing the resource.
+
+        Raises:
+            ValueError: If the component does not hold the resource, e.g. it was preempted.
+        """
+        for holder in self._holders:
+            if holder[0] is by:
+                self._remove(holder)
+                return
+        raise ValueError(f"{by} cannot release {self} because it does not hold it")
+
+    def _acquire(self, by: Component, priority: Any, seq: int):
+        # users from event handlers have no process to interrupt and are never preempted
+        process = self._sim.active_process()
+        gl = process._greenlet if process is not None else None
+        self._users.append(by)
+        self._holders.append([by, priority, seq, gl, self._sim.now()])
+
+    def _remove(self, holder: list):
+        self._holders.remove(holder)
+        self._users.remove(holder[0])
+
+
+class _Watcher:
+    """A level of a `Container` that some function is waiting for."""
+
+    __slots__ = ("level", "rising", "func", "args")
+
+    def __init__(self, level: int | float, rising: bool, func: Callable[..., None], args: tuple):
+        self.level = level
+        self.rising = rising
+        self.func = func
+        self.args = args
+
+    def reached(self, level: int | float) -> bool:
+        return level >= self.level if self.rising else level <= self.level
+
+
 class Container(Component):
     """Containers have the capability to acumulate and provide continuous
     amounts of what contains. It is particularly useful to model non discrete
     accumulators like Tanks.
 
+    Besides discrete amounts, a container can have continuous inflow and outflow rates,
+    e.g. pumps and valves. Rates are piecewise constant: they change only when `set_inflow`
+    or `set_outflow` are called, and the level in between is computed analytically instead
+    of being simulated with small steps. The level stops at the capacity and at zero, where
+    the effective inflow or outflow is limited by the other one.
+
+    Processes wait for a level with `wait_level`, `wait_full` and `wait_empty`, and event
+    handlers are registered with `on_level`. The container schedules a single event, at the
+    next time the level reaches one of the levels that are waited for.
+
+    ```python
+    tank = Container(sim, capacity=100)
+    tank.set_inflow(2.5)  # per time unit
+    tank.wait_full()  # wakes up at time 40
+    tank.set_outflow(4.0)
+    tank.wait_empty()  # wakes up at time 40 + 100 / 1.5
+    ```
+
+    With datetime simulation times, rates are expressed per second.
+
     Args:
         sim: The simulator instance.
         capacity: The capacity of the container, default is 1.
@@ -257,39 +565,204 @@ class Container(Component):
     Methods:
         get: decrease the level of the container by some amount.
         put: increase the level of the container by some amount.
+        set_inflow: change the continuous inflow rate.
+        set_outflow: change the continuous outflow rate.
+        wait_level: wait until the level reaches some value.
+        on_level: call an event handler when the level reaches some value.
     """
 
     def __init__(self, sim: Simulator, capacity: int | float = inf) -> None:
         self._sim = sim
         self._capacity = capacity
+        sim._register(self)
+        self.reset()
+
+    def reset(self):
         self._level = 0
+        self._inflow = 0
+        self._outflow = 0
+        self._since = self._sim.now()
+        self._watchers: list[_Watcher] = []
+        self._crossing: EventHandle | None = None
+        self._target: _Watcher | None = None
 
     def get(self, amount: int | float = 1):
         """Get some amount from the container.
 
+        Waits until the level is at least `amount`.
+
         Args:
             amount: The amount to get from the container, default is 1.
         """
-        self._sim.wait_for(lambda: self._can_get(amount))
-        self._level -= amount
+        while not self._can_get(amount):
+            self.wait_level(amount)
+        self._change(-amount)
 
     def put(self, amount: int | float = 1):
         """Put some amount into the container.
 
+        Waits until there is room for `amount`.
+
         Args:
             amount: The amount to put into the container, default is 1.
         """
-        self._sim.wait_for(lambda: self._can_put(amount))
-        self._level += amount
+        while not self._can_put(amount):
+            self.wait_level(self._capacity - amount)
+        self._change(amount)
 
-    def level(self) -> int:
+    def level(self) -> int | float:
         """Get the current level of the container."""
-        return self._level
+        rate = self._inflow - self._outflow
+        if not rate:
+            return self._level
+        level = self._level + rate * self._elapsed()
+        return min(max(level, 0), self._capacity)
 
     def capacity(self) -> int | float:
         """Get the capacity of the container."""
         return self._capacity
 
+    def inflow(self) -> int | float:
+        """Get the continuous inflow rate."""
+        return self._inflow
+
+    def outflow(self) -> int | float:
+        """Get the continuous outflow rate."""
+        return self._outflow
+
+    def set_inflow(self, rate: int | float):
+        """Change the continuous inflow rate.
+
+        Args:
+            rate: amount per time unit flowing into the container, 0 to stop it.
+        """
+        if rate < 0:
+            raise ValueError(f"inflow of {self} cannot be negative")
+        self._sync()
+        self._inflow = rate
+        self._reschedule()
+
+    def set_outflow(self, rate: int | float):
+        """Change the continuous outflow rate.
+
+        Args:
+            rate: amount per time unit flowing out of the container, 0 to stop it.
+        """
+        if rate < 0:
+            raise ValueError(f"outflow of {self} cannot be negative")
+        self._sync()
+        self._outflow = rate
+        self._reschedule()
+
+    def wait_level(self, level: int | float):
+        """Wait until the level of the container reaches a value.
+
+        It returns immediately if the level is already `level`. Otherwise it waits until
+        the level rises to `level` if it is below, or falls to it if it is above, either
+        because of the flows or of `put` and `get`.
+
+        Args:
+            level: The level to wait for.
+        """
+        reached = []
+        if self._watch(level, reached.append, (True,)):
+            self._sim.wait_for(lambda: len(reached) > 0)
+
+    def wait_full(self):
+        """Wait until the container is full."""
+        self.wait_level(self._capacity)
+
+    def wait_empty(self):
+        """Wait until the container is empty."""
+        self.wait_level(0)
+
+    def on_level(self, level: int | float, func: Callable[..., None], *args: Any):
+        """Call an event handler once, when the level reaches a value.
+
+        The handler is called like the ones of `Simulator.call_soon`, right away if the level
+        is already `level`. See `wait_level`.
+
+        Args:
+            level: The level to wait for.
+            func: The event handler.
+            *args: Arguments passed to the handler.
+        """
+        self._watch(level, self._sim.call_soon, (func, *args))
+
+    def _elapsed(self) -> float:
+        elapsed = self._sim.now() - self._since
+        if isinstance(elapsed, timedelta):
+            return elapsed.total_seconds()
+        return elapsed
+
+    def _sync(self):
+        """Bring the stored level up to the current time."""
+        self._level = self.level()
+        self._since = self._sim.now()
+
+    def _change(self, amount: int | float):
+        """Add a discrete amount to the level."""
+        self._sync()
+        self._level += amount
+        self._fire()
+        self._reschedule()
+
+    def _watch(self, level: int | float, func: Callable[..., None], args: tuple) -> bool:
+        """Call `func(*args)` when the level reaches `level`.
+
+        Returns:
+            whether the watcher is pending, False if it was called right away.
+        """
+        # the crossing time is computed from the level at the current time
+        self._sync()
+        current = self._level
+        if current == level:
+            func(*args)
+            return False
+        self._watchers.append(_Watcher(level, level > current, func, args))
+        self._reschedule()
+        return True
+
+    def _fire(self):
+        """Call the watchers reached by the current level."""
+        level = self._level
+        reached = [w for w in self._watchers if w.reached(level)]
+        if reached:
+            self._watchers = [w for w in self._watchers if not w.reached(level)]
+            for watcher in reached:
+                watcher.func(*watcher.args)
+
+    def _reschedule(self):
+        """Schedule the event of the next level that will be reached with the current flows."""
+        if self._crossing is not None:
+            self._crossing.cancel()
+            self._crossing = None
+        rate = self._inflow - self._outflow
+        if not rate or not self._watchers:
+            return
+        level = self._level
+        best, target = inf, None
+        for watcher in self._watchers:
+            if watcher.rising == (rate > 0) and 0 <= watcher.level <= self._capacity:
+                dt = (watcher.level - level) / rate
+                if dt < best:
+                    best, target = dt, watcher
+        if target is None:
+            return
+        now = self._sim.now()
+        when = now + timedelta(seconds=best) if isinstance(now, datetime) else now + best
+        self._target = target
+        self._crossing = self._sim.call_at(when, self._cross)
+
+    def _cross(self):
+        """Event handler of the next level reached by the flows."""
+        self._crossing = None
+        self._sync()
+        # the analytic level can miss the target by a rounding error
+        self._level = self._target.level
+        self._fire()
+        self._reschedule()
+
     def _can_get(self, amount: int | float) -> bool:
         """Check if it's possible to get a certain amount from the container."""
         return self.level() - amount >= 0
@@ -312,6 +785,10 @@ class Store(Component):
         self._sim = sim
         self._capacity = capacity
         self._items = []
+        sim._register(self)
+
+    def reset(self):
+        self._items = []
 
     def get(self) -> Any:
         """Get an item from the store."""
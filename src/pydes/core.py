@@ -2,15 +2,264 @@
 This is the pydes.process.core module
 """
 
+from dataclasses import dataclass, field
+from bisect import bisect_left, insort
 from heapq import heappush, heappop
 from itertools import count
 from math import inf
-from typing import Any, Callable, Tuple
-from greenlet import greenlet
+from time import monotonic, perf_counter, sleep
+from typing import Any, Callable, Hashable, Tuple
+from weakref import WeakKeyDictionary, WeakSet
+import warnings
+from greenlet import greenlet, GreenletExit
 from datetime import datetime, timedelta
 from pydes.monitor import Monitor, Record
 
 
+@dataclass
+class SimulatorStats:
+    """Profiling counters of a `Simulator`.
+
+    Args:
+        events (int): number of entries popped from the time heap, i.e. clock advances.
+        switches (int): number of switches from the scheduler into a process.
+        condition_evaluations (int): number of conditions evaluated looking for a runnable process.
+        max_conds (int): maximum number of processes blocked in `wait_for`.
+        max_times (int): maximum size of the event list.
+        callbacks (int): number of event handlers called, see `Simulator.call_at`.
+        wall_time (float): wall-clock seconds spent running the simulation.
+        process_time (dict[str, float]): wall-clock seconds spent inside every process, by name.
+        process_switches (dict[str, int]): number of switches into every process, by name.
+
+    The name of a process is the `id` of the component whose method was scheduled, or the
+    qualified name of the scheduled function.
+    """
+
+    events: int = 0
+    switches: int = 0
+    condition_evaluations: int = 0
+    max_conds: int = 0
+    max_times: int = 0
+    callbacks: int = 0
+    wall_time: float = 0.0
+    process_time: dict[str, float] = field(default_factory=dict)
+    process_switches: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def switches_per_second(self) -> float:
+        """Process switches per wall-clock second."""
+        return self.switches / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def scheduler_time(self) -> float:
+        """Wall-clock seconds spent in the scheduler, outside the processes."""
+        return self.wall_time - sum(self.process_time.values())
+
+
+def _process_name(func: Callable) -> str:
+    """Name of a scheduled function, used to attribute profiling and tracing data."""
+    owner = getattr(func, "__self__", None)
+    if owner is not None and hasattr(owner, "id"):
+        return str(owner.id)
+    return getattr(func, "__qualname__", repr(func))
+
+
+class EventHandle:
+    """A function scheduled to be called at a simulation time by `Simulator.call_at`.
+
+    Args:
+        time (int | float | datetime): simulation time of the call.
+        func (Callable): the event handler.
+        args (tuple): positional arguments of the handler.
+    """
+
+    __slots__ = ("time", "func", "args", "_cancelled")
+
+    def __init__(self, time: int | float | datetime, func: Callable[..., None], args: tuple):
+        self.time = time
+        self.func = func
+        self.args = args
+        self._cancelled = False
+
+    def cancel(self):
+        """Cancel the call. It does nothing if the handler was already called."""
+        self._cancelled = True
+
+    def cancelled(self) -> bool:
+        """Check whether the call was cancelled."""
+        return self._cancelled
+
+    def __repr__(self) -> str:
+        state = " cancelled" if self._cancelled else ""
+        return f"<EventHandle {getattr(self.func, '__qualname__', self.func)} at {self.time}{state}>"
+
+
+class Interrupt(Exception):
+    """Raised inside a process interrupted with `Simulator.interrupt`.
+
+    The process leaves whatever it was waiting for (a sleep, a condition, a resource) and
+    the exception is raised at the call that blocked, so the process can catch it and
+    decide what to do next.
+
+    Args:
+        cause (Any): the cause given to `Simulator.interrupt`.
+        remaining (int | float | timedelta | None): time that was left of the interrupted
+            sleep or timeout, None if the process was waiting without a time limit.
+    """
+
+    def __init__(self, cause: Any = None, remaining: int | float | timedelta | None = None):
+        super().__init__(cause)
+        self.cause = cause
+        self.remaining = remaining
+
+
+class Process:
+    """Handle of a process started with `Simulator.schedule`.
+
+    ```python
+    job = sim.schedule(machine.main)
+    ...
+    job.interrupt("breakdown")  # raise an Interrupt where the process waits
+    job.cancel()  # stop the process
+    job.join()  # from another process, wait until it finishes
+    ```
+
+    Args:
+        sim: The simulator instance.
+        name: Name of the process.
+    """
+
+    __slots__ = ("_sim", "_greenlet", "name", "_done", "_cancelled", "_value")
+
+    def __init__(self, sim: "Simulator", name: str):
+        self._sim = sim
+        self._greenlet: greenlet | None = None
+        self.name = name
+        self._done = False
+        self._cancelled = False
+        self._value = None
+
+    def interrupt(self, cause: Any = None):
+        """Interrupt the process, see `Simulator.interrupt`.
+
+        Args:
+            cause: Any value describing the interruption, default is None.
+        """
+        self._sim.interrupt(self, cause)
+
+    def cancel(self):
+        """Stop the process.
+
+        A process that has not started yet never runs. Otherwise it is taken out of what it
+        is waiting for, like with `interrupt`, and a `GreenletExit` is raised in it at the
+        current time, so its `finally` clauses and context managers run. It does nothing if
+        the process already finished.
+        """
+        if self._done:
+            return
+        sim, gl = self._sim, self._greenlet
+        if gl is greenlet.getcurrent():
+            raise RuntimeError("a process cannot cancel itself")
+        self._cancelled = True
+        if not gl:  # not started yet
+            sim._unblock(gl)
+            self._done = True
+        elif gl in sim._interrupts:
+            sim._interrupts[gl] = GreenletExit()
+        else:
+            sim._unblock(gl)
+            sim._interrupts[gl] = GreenletExit()
+            sim._schedule(gl=gl, time=sim.now())
+
+    def join(self, timeout: int | float | timedelta | None = None) -> bool:
+        """Wait until the process finishes.
+
+        Args:
+            timeout: Maximum simulation time to wait, default is None.
+
+        Returns:
+            whether the process finished.
+        """
+        if not self._done:
+            self._sim.wait_for(lambda: self._done, timeout)
+        return self._done
+
+    def done(self) -> bool:
+        """Check whether the process finished, returning, failing or being cancelled."""
+        return self._done
+
+    def cancelled(self) -> bool:
+        """Check whether the process was cancelled."""
+        return self._cancelled
+
+    def result(self) -> Any:
+        """Get the value returned by the function of the process.
+
+        Raises:
+            RuntimeError: If the process did not finish or was cancelled.
+        """
+        if not self._done or self._cancelled:
+            raise RuntimeError(f"process {self.name} did not return")
+        return self._value
+
+    def __repr__(self) -> str:
+        state = " cancelled" if self._cancelled else " done" if self._done else ""
+        return f"<Process {self.name}{state}>"
+
+
+class _Pacer:
+    """Paces the simulation time against the wall-clock time.
+
+    Every simulation time is mapped to a wall-clock deadline from the start of the run, so
+    oversleeping or a slow process delays the next event but does not accumulate drift.
+
+    Args:
+        start: simulation time when the run started.
+        factor: simulation seconds per wall-clock second.
+        tolerance: wall-clock seconds of lag after which a warning is issued.
+    """
+
+    def __init__(self, start: int | float | datetime, factor: float, tolerance: float):
+        if factor <= 0:
+            raise ValueError("realtime_factor must be positive")
+        self.start = start
+        self.factor = factor
+        self.tolerance = tolerance
+        self.origin = monotonic()
+        self.max_lag = 0.0
+        self._warned = False
+
+    def deadline(self, t: int | float | datetime) -> float:
+        """Wall-clock time at which the simulation should reach `t`."""
+        elapsed = t - self.start
+        if isinstance(elapsed, timedelta):
+            elapsed = elapsed.total_seconds()
+        return self.origin + elapsed / self.factor
+
+    def wait(self, t: int | float | datetime, until: int | float | datetime):
+        """Sleep until the wall-clock deadline of `t`, or record the lag if it is past.
+
+        Times after `until` are clamped to it, the run ends there.
+        """
+        if isinstance(t, datetime) == isinstance(until, datetime) and until < t:
+            t = until
+        deadline = self.deadline(t)
+        remaining = deadline - monotonic()
+        while remaining > 0:
+            sleep(remaining)
+            remaining = deadline - monotonic()
+        lag = -remaining
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag > self.tolerance and not self._warned:
+            self._warned = True
+            warnings.warn(
+                f"simulation is {lag:.3f}s behind the wall clock at time {t}",
+                RuntimeWarning,
+                stacklevel=4,
+            )
+
+
 # ConditionType = Callable[[], bool]
 # ProcessType = greenlet
 class Simulator:
@@ -21,6 +270,7 @@ class Simulator:
     Args:
         init: The initial simulation time specified as a float or datetime object.
         trace: Indicates whether tracing is enabled or not.
+        profile: Indicates whether the scheduler collects profiling counters, see `stats`.
 
     Simulators can be instantiated either using numeric time (float or int) or datetime time.
 
@@ -43,18 +293,52 @@ class Simulator:
         sleep: Sleep for the given duration.
         sleep_until: Sleep until the given simulation time.
         wait_for: Suspends the process until a condition becomes true.
+        interrupt: Interrupts a waiting process, raising an `Interrupt` in it.
+        active_process: returns the handle of the running process.
         schedule: Activates a process either immediately (if both `at` and `after` are None) or after a delay.
+        call_at: Calls an event handler at the given simulation time, without a process.
+        call_later: Calls an event handler after the given duration.
+        call_soon: Calls an event handler at the current simulation time.
         run: Starts simulation.
+        reset: stops all the processes and brings the simulator and its components back to the initial state.
+        stats: returns the profiling counters of the simulation.
+        reset_statistics: drops the records and resets the statistics of the model, e.g. after a warm-up.
+        on_reset_statistics: registers a function that resets some statistics of the model.
         record: records an event by passing a component a value and optionally a description.
         records: returns a list with all the recors that were saved during the simulation.
+        value_at: returns the value of a recorded state at a given time.
+        names: returns the names of the recorded events.
+        groupby: returns the recorded events grouped by name.
+        steps: returns the step function of a recorded state.
 
     """
 
-    def __init__(self, init: int | float | datetime = 0, trace: bool = True):
-        self._conds: list[tuple[greenlet, Callable[[], bool]]] = []
-        self._times: list[tuple[int | float | datetime, int]] = []
+    def __init__(
+        self, init: int | float | datetime = 0, trace: bool = True, profile: bool = False
+    ):
+        # processes blocked in wait_for, as (priority, seq, greenlet, cond) sorted entries
+        self._conds: list[tuple[Any, int, greenlet, Callable[[], bool]]] = []
+        # the event list, (time, priority, seq, target) entries where the target is the
+        # greenlet to resume, the EventHandle to call or None for a wait_for timeout
+        self._times: list[tuple] = []
+        self._handling = False
+        # progress reporter of the running run, also ticked by the event handlers
+        self._progress: Any = None
         self._ctimes = count()
+        # seqs of process entries of the event list left behind by interrupts
+        self._stale: set[int] = set()
+        # exceptions to raise in interrupted processes when they are resumed
+        self._interrupts: dict[greenlet, Interrupt] = {}
+        self._loop = greenlet.getcurrent()
         self._monitor = Monitor(self, trace)
+        self._statistics: list[Callable[[], None]] = []
+        self._components: WeakSet = WeakSet()
+        # next instance number of every component class, and the number of each component
+        self._counts: dict[type, int] = {}
+        self._numbers: WeakKeyDictionary = WeakKeyDictionary()
+        self._stats = SimulatorStats() if profile else None
+        self._tracer = None
+        self._pacer: _Pacer | None = None
         self._init_time = init
         self._now = init
 
@@ -68,26 +352,92 @@ class Simulator:
         """
         self._monitor.record(name, value, description)
 
-    def records(self) -> list[Record]:
+    def records(
+        self,
+        name: Hashable | None = None,
+        start: int | float | datetime | None = None,
+        end: int | float | datetime | None = None,
+    ) -> list[Record]:
         """Get recorded simulation events.
 
+        Args:
+            name: Only return records with this name, default is None.
+            start: Only return records with time greater or equal than `start`, default is None.
+            end: Only return records with time strictly less than `end`, default is None.
+
         Returns:
             list of `Record` objects
         """
-        return self._monitor.values()
+        return self._monitor.values(name, start, end)
+
+    def value_at(
+        self, name: Hashable, time: int | float | datetime, default: Any = None
+    ) -> Any:
+        """Get the value of a recorded state at a given time.
+
+        Args:
+            name: The name of the records.
+            time: Simulation time to evaluate.
+            default: Value returned if nothing was recorded at or before `time`, default is None.
+
+        Returns:
+            the value of the last record of `name` made at or before `time`.
+        """
+        return self._monitor.value_at(name, time, default)
+
+    def names(self) -> list[Hashable]:
+        """Get the names of the recorded events in order of first appearance.
+
+        Returns:
+            list of record names.
+        """
+        return self._monitor.names()
+
+    def groupby(self) -> dict[Hashable, list[Record]]:
+        """Get the recorded events grouped by name.
+
+        Returns:
+            dict mapping every name to its records, ordered by time.
+        """
+        return self._monitor.groupby()
+
+    def steps(
+        self,
+        name: Hashable,
+        start: int | float | datetime | None = None,
+        end: int | float | datetime | None = None,
+    ) -> list[tuple[int | float | datetime, Any]]:
+        """Reconstruct the step function of a recorded state.
+
+        Args:
+            name: The name of the records.
+            start: Beginning of the time window, default is None.
+            end: End of the time window (excluded), default is None.
+
+        Returns:
+            list of `(time, value)` tuples where each value holds until the next time.
+        """
+        return self._monitor.steps(name, start, end)
 
     def schedule(
         self,
         func: Callable[[], None],
         at: int | float | datetime | None = None,
         after: int | float | timedelta | None = None,
-    ):
+        priority: Any = 0,
+    ) -> Process:
         """Schedules a function either immediately (if both `at` and `after` are None) or after a delay.
 
         Args:
             func: A function to be scheduled and runned during the simulation.
             at: Simulation time to activate the process, default is None.
             after: Delay activation with specified time, default is None.
+            priority: Order of the activation among the events of the same time, lowest
+                first, default is 0.
+
+        The event list is ordered by time, priority and the order in which the events were
+        scheduled. All the events of one time are dispatched, lowest priority first, before
+        the processes blocked in `wait_for` are checked and before the clock advances.
 
         ```python
         sim = Simulator(until=10)
@@ -104,46 +454,157 @@ class Simulator:
         sim.schedule(proc.main)
         ```
 
+        Returns:
+            the `Process` handle, to interrupt, cancel or join the process.
         """
 
+        start = self.now() if at is None else at
+        if after is not None:
+            start = self._add_to_time(start, after)
+        self._check_time(start)
+
+        process = Process(self, _process_name(func))
+
         def main():
-            self.sleep_until(at)
-            self.sleep(after)
-            func()
+            try:
+                process._value = func()
+            finally:
+                process._done = True
             self._next()  # switch to another greenlet, or else execution "fall"
             # is resumed from the parent's last switch()
 
-        # Add it to the event-queue and launch it as soon as possible.
-        self._schedule(gl=greenlet(main), cond=lambda: True)
+        # Add it to the event list. The process is a child of the scheduler loop even when
+        # it is scheduled from another process, so that blocking always switches back to
+        # the loop.
+        gl = greenlet(main, parent=self._loop)
+        gl.name = process.name
+        gl.process = process
+        process._greenlet = gl
+        self._schedule(gl=gl, time=start, priority=priority)
+        return process
+
+    def active_process(self) -> Process | None:
+        """Get the handle of the running process, None outside of processes."""
+        return getattr(greenlet.getcurrent(), "process", None)
+
+    def call_at(
+        self, time: int | float | datetime, func: Callable[..., None], *args: Any, priority: Any = 0
+    ) -> EventHandle:
+        """Call an event handler at the given simulation time.
+
+        This is the event scheduling world view: instead of a process that sleeps and waits,
+        an entity is a plain object whose state changes are handlers scheduled in the same
+        event list as the processes. Handlers cost no greenlet, so models with many passive
+        entities can use them for their hot parts and processes for complex actors.
+
+        Handlers are called by the scheduler when the clock reaches their time, in the order
+        of the event list (see `schedule`), and must not block: `sleep`, `wait_for` and the
+        component methods that wait raise a `RuntimeError`. They can change the state of
+        components, record events, schedule processes and other handlers.
+
+        ```python
+        def arrival(customer):
+            queue.append(customer)
+            sim.call_later(random.expovariate(1.0), arrival, customer + 1)
+
+        sim.call_at(0, arrival, 0)
+        ```
+
+        Args:
+            time: Simulation time of the call.
+            func: The event handler.
+            *args: Arguments passed to the handler.
+            priority: Order of the call among the events of the same time, lowest first,
+                default is 0.
+
+        Returns:
+            the `EventHandle` of the call, which can be cancelled.
+        """
+        self._check_time(time)
+        handle = EventHandle(time, func, args)
+        heappush(self._times, (time, priority, next(self._ctimes), handle))
+        return handle
+
+    def call_later(
+        self,
+        delay: int | float | timedelta,
+        func: Callable[..., None],
+        *args: Any,
+        priority: Any = 0,
+    ) -> EventHandle:
+        """Call an event handler after the given duration, see `call_at`.
+
+        Args:
+            delay: Duration until the call.
+            func: The event handler.
+            *args: Arguments passed to the handler.
+            priority: Order of the call among the events of the same time, default is 0.
+
+        Returns:
+            the `EventHandle` of the call, which can be cancelled.
+        """
+        return self.call_at(self._add_to_time(self.now(), delay), func, *args, priority=priority)
+
+    def call_soon(self, func: Callable[..., None], *args: Any, priority: Any = 0) -> EventHandle:
+        """Call an event handler at the current simulation time, see `call_at`.
+
+        Args:
+            func: The event handler.
+            *args: Arguments passed to the handler.
+            priority: Order of the call among the events of the same time, default is 0.
+
+        Returns:
+            the `EventHandle` of the call, which can be cancelled.
+        """
+        return self.call_at(self.now(), func, *args, priority=priority)
+
+    def _check_time(self, time: int | float | datetime):
+        """Check that an event can be scheduled at `time`."""
+        now = self.now()
+        if isinstance(time, datetime) != isinstance(now, datetime):
+            raise TypeError(f"time of type {type(time)} is not compatible with {type(now)}")
+        if time < now:
+            raise ValueError("time cannot be less than current time")
 
     def wait_for(
-        self, cond: Callable[[], bool], timeout: int | float | timedelta | None = None
+        self,
+        cond: Callable[[], bool],
+        timeout: int | float | timedelta | None = None,
+        priority: Any = 0,
     ):
         """Wait for a condition to become true.
 
         Suspends this process until the condition becomes true.
 
+        Blocked processes are checked after the events of the current time, lowest
+        priority first and then in the order they blocked.
+
         Args:
             cond: Function to test.
             timeout: Maximum simulation time to wait for condition to become true, default is None.
+            priority: Order of the process among the blocked ones, lowest first, default is 0.
         """
         if timeout is not None:
             time = self._add_to_time(self.now(), timeout)
-            self._schedule(cond=lambda: cond() or (self.now() == time), time=time)
+            self._schedule(
+                cond=lambda: cond() or (self.now() == time), time=time, priority=priority
+            )
         else:
-            self._schedule(cond=cond)
+            self._schedule(cond=cond, priority=priority)
         self._next()
 
-    def sleep(self, duration: int | float | timedelta | None = None):
+    def sleep(self, duration: int | float | timedelta | None = None, priority: Any = 0):
         """Sleep for the given duration.
 
         Args:
             duration: Duration to sleep for.
+            priority: Order of the wake up among the events of the same time, lowest first,
+                default is 0.
         """
         if duration is None:
             return
         time = self._add_to_time(self.now(), duration)
-        self.sleep_until(time)
+        self.sleep_until(time, priority)
 
     def _add_to_time(self, t: int | float | datetime, d: int | float | timedelta):
         if isinstance(t, (float, int)) and isinstance(d, (float, int)):
@@ -155,11 +616,13 @@ class Simulator:
                 f"time of type {type(t)} and duration of type {type(d)} are not compatible"
             )
 
-    def sleep_until(self, until: int | float | datetime | None = None):
+    def sleep_until(self, until: int | float | datetime | None = None, priority: Any = 0):
         """Sleep until the given simulation time.
 
         Args:
             until: Simulation time to sleep until.
+            priority: Order of the wake up among the events of the same time, lowest first,
+                default is 0.
         """
         if until is None:
             return
@@ -168,14 +631,10 @@ class Simulator:
             return
 
         now = self.now()
-        if isinstance(until, float) and isinstance(now, float):
-            if until < now:
-                raise ValueError("Until time cannot be less than current time")
-        elif isinstance(until, datetime) and isinstance(now, datetime):
-            if until < now:
-                raise ValueError("Until time cannot be less than current time")
-
-        self._schedule(cond=lambda: self.now() == until, time=until)
+        if isinstance(until, datetime) == isinstance(now, datetime) and until < now:
+            raise ValueError("Until time cannot be less than current time")
+
+        self._schedule(time=until, priority=priority)
         self._next()
 
     def _schedule(
@@ -183,20 +642,36 @@ class Simulator:
         gl: greenlet | None = None,
         cond: Callable[[], bool] | None = None,
         time: int | float | datetime | None = None,
+        priority: Any = 0,
     ):
         """Schedules a condition or a time.
 
+        A process with a condition is checked every time the scheduler looks for a process
+        to run, and the time, if any, is only a wake up of the clock. A process with only a
+        time is resumed by the event list when the clock reaches it.
+
         Args:
             gl: Greenlet object, default is None.
             cond: Condition to post, default is None.
             time: Time to schedule the condition, default is None.
+            priority: Order among the events of the same time, default is 0.
         """
         if gl is None:
+            if self._handling:
+                raise RuntimeError(
+                    "event handlers cannot block, schedule a process to wait or sleep"
+                )
             gl = greenlet.getcurrent()
-        if cond:
-            self._conds.append((gl, cond))
-        if time:
-            heappush(self._times, (time, next(self._ctimes)))
+        seq = next(self._ctimes)
+        gl._wait = (priority, seq, time, cond is not None)
+        if cond is not None:
+            conds = self._conds
+            if not conds or conds[-1][0] <= priority:
+                conds.append((priority, seq, gl, cond))
+            else:
+                insort(conds, (priority, seq, gl, cond))
+        if time is not None:
+            heappush(self._times, (time, priority, seq, None if cond is not None else gl))
 
     def now(self) -> float | datetime:
         """Return current simulation time.
@@ -209,21 +684,221 @@ class Simulator:
     def _pop(self) -> greenlet | None:
         """Pops out a process which may run *now*.
 
+        The events of the current time are dispatched first, in the order of the event list,
+        then the conditions of the blocked processes are checked.
+
         Returns:
             greenlet or None: A greenlet object or None if no process can run now.
         """
-        for process, cond in self._conds:
+        times = self._times
+        now = self._now
+        stale = self._stale
+        while times and times[0][0] <= now:
+            _, _, seq, target = heappop(times)
+            if type(target) is EventHandle:
+                self._call(target)
+            elif target is not None:
+                if stale and seq in stale:
+                    stale.remove(seq)
+                    continue
+                return target
+        conds = self._conds
+        for i, (_, _, process, cond) in enumerate(conds):
             if cond():
-                self._conds.remove((process, cond))
+                del conds[i]
                 return process
         return None
 
-    def run(self, until: int | float | datetime = inf):
+    def _pop_profiled(self) -> greenlet | None:
+        """Same as `_pop`, counting the evaluated conditions."""
+        stats = self._stats
+        times = self._times
+        now = self._now
+        stale = self._stale
+        while times and times[0][0] <= now:
+            _, _, seq, target = heappop(times)
+            if type(target) is EventHandle:
+                self._call(target)
+            elif target is not None:
+                if stale and seq in stale:
+                    stale.remove(seq)
+                    continue
+                return target
+        conds = self._conds
+        if len(conds) > stats.max_conds:
+            stats.max_conds = len(conds)
+        for i, (_, _, process, cond) in enumerate(conds):
+            stats.condition_evaluations += 1
+            if cond():
+                del conds[i]
+                return process
+        return None
+
+    def _call(self, handle: EventHandle):
+        """Call an event handler popped from the event list, unless it was cancelled."""
+        if handle._cancelled:
+            return
+        self._handling = True
+        try:
+            handle.func(*handle.args)
+        finally:
+            self._handling = False
+        if self._stats is not None:
+            self._stats.callbacks += 1
+        if self._progress is not None:
+            self._progress.tick()
+
+    def interrupt(self, process: Process | greenlet, cause: Any = None):
+        """Interrupt a process that is waiting.
+
+        The process is taken out of what it is waiting for, without going through the
+        other waiting processes, and resumed at the current time with an `Interrupt` raised
+        at the call that blocked it. Calling `interrupt` does not block.
+
+        ```python
+        def machine():
+            sim.call_later(5, sim.interrupt, sim.active_process(), "breakdown")
+            try:
+                sim.sleep(8)
+            except Interrupt as interrupt:
+                interrupt.cause, interrupt.remaining  # "breakdown", 3
+        ```
+
+        Args:
+            process: The `Process` handle returned by `schedule`, or the greenlet of the
+                process.
+            cause: Any value describing the interruption, default is None.
+        """
+        if isinstance(process, Process):
+            process = process._greenlet
+        if process is greenlet.getcurrent():
+            raise RuntimeError("a process cannot interrupt itself")
+        handle = getattr(process, "process", None)
+        if not process or process in self._interrupts or (handle is not None and handle._done):
+            raise RuntimeError(f"{getattr(process, 'name', process)} is not waiting")
+        time = self._unblock(process)
+        remaining = None
+        if time is not None:
+            remaining = time - self.now()
+        self._interrupts[process] = Interrupt(cause, remaining)
+        self._schedule(gl=process, time=self.now())
+
+    def _unblock(self, process: greenlet) -> int | float | datetime | None:
+        """Take a process out of the condition list or the event list.
+
+        The condition list is sorted, so the process is found with a bisection, and its
+        entry in the event list is left to be skipped.
+
+        Returns:
+            the time the process was waiting for, if any.
+        """
+        priority, seq, time, cond = process._wait
+        if cond:
+            conds = self._conds
+            i = bisect_left(conds, (priority, seq))
+            if i < len(conds) and conds[i][1] == seq:
+                del conds[i]
+        else:
+            self._stale.add(seq)
+        return time
+
+    def stats(self) -> SimulatorStats:
+        """Get the profiling counters of the simulation.
+
+        Profiling is enabled with `Simulator(profile=True)`. When it is disabled, the
+        scheduler runs its plain loop and pays nothing for it.
+
+        ```python
+        sim = Simulator(profile=True)
+        ...
+        sim.run()
+        stats = sim.stats()
+        stats.events, stats.switches, stats.condition_evaluations
+        sorted(stats.process_time.items(), key=lambda item: -item[1])[:10]
+        ```
+
+        Returns:
+            the `SimulatorStats` collected by all the `run` calls since the last `reset`.
+        """
+        if self._stats is None:
+            raise RuntimeError("profiling is disabled, create the Simulator with profile=True")
+        return self._stats
+
+    def lag(self) -> float:
+        """Get the maximum lag of the last real-time run.
+
+        Returns:
+            the largest number of wall-clock seconds the simulation was behind its schedule
+            when advancing the clock, 0 if the last run was not paced.
+        """
+        return self._pacer.max_lag if self._pacer is not None else 0.0
+
+    def reset_statistics(self):
+        """Reset the statistics collected so far without stopping the model.
+
+        Records made before the current time are dropped and every function registered with
+        `on_reset_statistics` is called. Processes, components and their state are kept, so
+        the run continues as if the statistics started being collected now. This is how the
+        warm-up period of steady state studies is discarded.
+        """
+        self._monitor.truncate(self.now())
+        for reset in self._statistics:
+            reset()
+
+    def on_reset_statistics(self, func: Callable[[], None]):
+        """Register a function to call when the statistics are reset.
+
+        Components and models that accumulate their own statistics (counters, time weighted
+        sums, ...) register a function that clears them.
+
+        Args:
+            func: function without arguments that resets some statistics.
+        """
+        self._statistics.append(func)
+
+    def run(
+        self,
+        until: int | float | datetime = inf,
+        warmup: int | float | datetime | None = None,
+        progress: Any = None,
+        realtime_factor: float | None = None,
+        realtime_tolerance: float = 0.1,
+    ):
         """Start simulation.
 
         Args:
             until: maximum simulation time expressed as datetime or float.
+            warmup: simulation time at which `reset_statistics` is called, default is None.
+            progress: a `pydes.progress.ProgressReporter` called while the simulation runs,
+                default is None.
+            realtime_factor: if given, pace the simulation against the wall clock, at this
+                many simulation seconds per wall-clock second. One unit of numeric time is
+                one second. Default is None, run as fast as possible.
+            realtime_tolerance: wall-clock seconds the simulation can fall behind its
+                schedule before a `RuntimeWarning` is issued, default is 0.1.
+
+        In real-time mode the scheduler sleeps until the wall-clock time of the next event
+        instead of busy waiting, and measures every deadline from the start of the run so
+        that drift does not accumulate. Use `lag` after the run to check that the model
+        kept up.
         """
+        if warmup is not None:
+            self.schedule(self.reset_statistics, at=warmup)
+        self._take_loop()
+        self._pacer = None
+        if realtime_factor is not None:
+            self._pacer = _Pacer(self.now(), realtime_factor, realtime_tolerance)
+        if progress is not None:
+            progress.start(self, until)
+            self._progress = progress
+            try:
+                return self._run_instrumented(until, progress)
+            finally:
+                self._progress = None
+                progress.finish()
+        if self._stats is not None or self._tracer is not None or self._pacer is not None:
+            return self._run_instrumented(until)
+        interrupts = self._interrupts
         while True:
             # Is anybody wakeable?
             process = self._pop()
@@ -231,34 +906,194 @@ class Simulator:
             # Advance time & retry
             while process is None:
                 # if we reached the max running time we return and end simulation
-                if (
-                    isinstance(self._now, (float, int))
-                    and isinstance(until, (float, int))
-                    and self._now >= until
-                ):
-                    return
-                elif (
-                    isinstance(self._now, datetime)
-                    and isinstance(until, datetime)
-                    and self._now >= until
-                ):
+                if self._reached(until):
                     return
-                # Do we still have process waiting for a new time?
-                if self._times:
-                    self._now, _ = heappop(self._times)
-                    process = self._pop()
-                # if not, the simulation is over
-                else:
+                # Do we still have events in the future? if not, the simulation is over
+                if not self._pop_time():
                     return
-            # Switch to it
-            process.switch()
+                process = self._pop()
+            # Switch to it, raising the interrupt if it was interrupted
+            if interrupts and process in interrupts:
+                process.throw(interrupts.pop(process))
+            else:
+                process.switch()
             # Back to scheduling
 
+    def _take_loop(self):
+        """Make the calling greenlet the scheduler loop, parent of every pending process."""
+        self._loop = greenlet.getcurrent()
+        for process in self._processes():
+            if process is not self._loop and process.parent is not self._loop:
+                process.parent = self._loop
+
+    def _processes(self) -> list[greenlet]:
+        """Get the pending processes, blocked in a condition or waiting for a time."""
+        processes = [process for _, _, process, _ in self._conds]
+        processes += [entry[3] for entry in self._times if type(entry[3]) is greenlet]
+        return processes
+
+    def _advance(self, end: int | float | datetime, inclusive: bool = False):
+        """Run every event before `end`, or up to `end` included, without going past it.
+
+        Unlike `run`, the clock never moves beyond `end`. This is used to run the
+        simulation in windows, e.g. by `pydes.parallel`.
+        """
+        self._take_loop()
+        interrupts = self._interrupts
+        while True:
+            process = self._pop()
+            while process is None:
+                t = self._next_time()
+                if not self._times or t > end or (t == end and not inclusive):
+                    return
+                self._pop_time()
+                process = self._pop()
+            if interrupts and process in interrupts:
+                process.throw(interrupts.pop(process))
+            else:
+                process.switch()
+
+    def _next_time(self) -> int | float | datetime:
+        """Time of the next pending event, `inf` if there is none.
+
+        Cancelled event handlers and entries of interrupted processes at the top of the
+        event list are dropped, so that they do not move the clock.
+        """
+        times = self._times
+        stale = self._stale
+        while times:
+            _, _, seq, target = times[0]
+            if type(target) is EventHandle:
+                if not target._cancelled:
+                    break
+            elif not (stale and seq in stale):
+                break
+            else:
+                stale.remove(seq)
+            heappop(times)
+        return times[0][0] if times else inf
+
+    def _pop_time(self) -> bool:
+        """Move the clock to the time of the next event.
+
+        Returns:
+            False if there are no more events.
+        """
+        t = self._next_time()
+        if not self._times:
+            return False
+        self._now = t
+        return True
+
+    def _reached(self, until: int | float | datetime) -> bool:
+        """Check whether the simulation time reached `until`."""
+        if (
+            isinstance(self._now, (float, int))
+            and isinstance(until, (float, int))
+            and self._now >= until
+        ):
+            return True
+        elif (
+            isinstance(self._now, datetime)
+            and isinstance(until, datetime)
+            and self._now >= until
+        ):
+            return True
+        return False
+
+    def _run_instrumented(self, until: int | float | datetime, progress: Any = None):
+        """Same loop as `run`, with profiling, tracing, progress reporting and pacing."""
+        stats = self._stats
+        tracer = self._tracer
+        pacer = self._pacer
+        pop = self._pop if stats is None else self._pop_profiled
+        interrupts = self._interrupts
+        start = perf_counter()
+        try:
+            while True:
+                process = pop()
+                while process is None:
+                    if self._reached(until):
+                        return
+                    t = self._next_time()
+                    if not self._times:
+                        return
+                    if stats is not None:
+                        if len(self._times) > stats.max_times:
+                            stats.max_times = len(self._times)
+                        stats.events += 1
+                    if pacer is not None:
+                        pacer.wait(t, until)
+                    self._pop_time()
+                    process = pop()
+                if tracer is not None:
+                    tracer.resume(process)
+                t0 = perf_counter()
+                if interrupts and process in interrupts:
+                    process.throw(interrupts.pop(process))
+                else:
+                    process.switch()
+                elapsed = perf_counter() - t0
+                if stats is not None:
+                    name = getattr(process, "name", "main")
+                    stats.switches += 1
+                    stats.process_time[name] = stats.process_time.get(name, 0.0) + elapsed
+                    stats.process_switches[name] = stats.process_switches.get(name, 0) + 1
+                if tracer is not None:
+                    tracer.block(process, t0, elapsed)
+                if progress is not None:
+                    progress.tick()
+        finally:
+            if stats is not None:
+                stats.wall_time += perf_counter() - start
+
+    def _register(self, component: Any):
+        """Register a component so that `reset` brings it back to its initial state."""
+        self._components.add(component)
+
+    def _name(self, component: Any) -> str:
+        """Name a component after its class and its number among the ones of this simulator."""
+        cls = type(component)
+        number = self._counts.get(cls, 0)
+        self._counts[cls] = number + 1
+        self._numbers[component] = number
+        return f"{cls.__name__}.{number}"
+
     def reset(self):
-        self._conds: list[Tuple[greenlet, Callable[[], bool]]] = []
+        """Reset the simulator so that it can be run again from the initial time.
+
+        All the pending processes are killed, which releases their frames, and the event
+        list and the records are cleared. Components created with this simulator are brought
+        back to their initial state, so a model can be scheduled and run again on the same
+        objects, e.g. for in-process replications, and the numbering of new components
+        restarts after the ones that are kept.
+        Functions registered with `on_reset_statistics` are kept.
+        """
+        if greenlet.getcurrent() is not self._loop:
+            raise RuntimeError("a simulator cannot be reset from one of its processes")
+        processes = self._processes()
+        self._conds = []
         self._times = []
+        for process in processes:
+            if process is not self._loop and process:
+                # unwinds the process from its switch point and returns here
+                process.throw(GreenletExit)
+        self._conds = []
+        self._times = []
+        self._ctimes = count()
+        self._stale.clear()
+        self._interrupts.clear()
         self._monitor.reset()
         self._now = self._init_time
+        if self._stats is not None:
+            self._stats = SimulatorStats()
+
+        for component in list(self._components):
+            component.reset()
+        self._counts = {}
+        for component, number in list(self._numbers.items()):
+            cls = type(component)
+            self._counts[cls] = max(self._counts.get(cls, 0), number + 1)
 
     def _next(self):
         """Switch to the next awakeable process."""
@@ -0,0 +1,666 @@
+"""
+This is the pydes.experiment module.
+
+It runs independent replications of a simulation model, in parallel, and summarizes
+their outputs with confidence intervals. Replications can also be run for every scenario
+of an experimental design (`grid` or `latin_hypercube`) with `sweep`, which caches the
+outputs on disk. `replicate_until` and `batch_means` stop as soon as the outputs reach a
+target precision.
+
+A model is described by a *model factory*: a function that receives a fresh `Simulator`
+and the seed of the replication, builds the components, schedules the processes and returns
+a function that computes the outputs of the replication once the simulation is over.
+
+```python
+from pydes import Simulator, Resource
+from pydes.experiment import replicate
+from pydes.random import Streams
+
+def model(sim: Simulator, seed: int):
+    streams = Streams(seed)
+    server = Resource(sim)
+    served = []
+
+    def customer():
+        server.request(customer)
+        sim.sleep(streams["service"].expovariate(1.2))
+        server.release(customer)
+        served.append(sim.now())
+
+    def source():
+        while True:
+            sim.sleep(streams["arrivals"].expovariate(1.0))
+            sim.schedule(customer)
+
+    sim.schedule(source)
+    return lambda: {"served": len(served)}
+
+result = replicate(model, n=1000, seeds=42, workers=8, until=1000)
+result.summary()["served"].mean
+```
+
+Only the outputs returned by the model are sent back from the worker processes, so the
+model factory must be a module level function and its outputs must be picklable.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import product
+from math import atan, cos, exp, inf, lgamma, log, log1p, pi, sin, sqrt, tan
+from statistics import NormalDist, fmean, stdev
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+from pydes.core import Simulator
+
+ModelFactory = Callable[..., Callable[[], Mapping[str, float]]]
+
+
+@dataclass
+class Summary:
+    """Summary statistics of an output measure across replications.
+
+    Args:
+        n (int): number of replications.
+        mean (float): sample mean.
+        std (float): sample standard deviation.
+        half_width (float): half width of the confidence interval of the mean.
+        confidence (float): confidence level of the interval.
+    """
+
+    n: int
+    mean: float
+    std: float
+    half_width: float
+    confidence: float
+
+    @property
+    def low(self) -> float:
+        """Lower bound of the confidence interval."""
+        return self.mean - self.half_width
+
+    @property
+    def high(self) -> float:
+        """Upper bound of the confidence interval."""
+        return self.mean + self.half_width
+
+    @property
+    def relative_half_width(self) -> float:
+        """Half width of the confidence interval relative to the mean."""
+        if self.mean == 0:
+            return inf if self.half_width > 0 else 0.0
+        return self.half_width / abs(self.mean)
+
+
+@dataclass
+class Replications:
+    """Outputs of a set of independent replications.
+
+    Args:
+        seeds (list[int]): seed used by every replication.
+        outputs (list[dict[str, float]]): outputs returned by every replication.
+    """
+
+    seeds: list[int] = field(default_factory=list)
+    outputs: list[dict[str, float]] = field(default_factory=list)
+
+    def values(self, name: str) -> list[float]:
+        """Get the values of an output measure, one per replication."""
+        return [out[name] for out in self.outputs]
+
+    def summary(self, confidence: float = 0.95) -> dict[str, Summary]:
+        """Summarize every output measure with a confidence interval of its mean.
+
+        Args:
+            confidence: confidence level of the intervals, default is 0.95.
+
+        Returns:
+            dict mapping every output name to its `Summary`.
+        """
+        names = self.outputs[0].keys() if self.outputs else []
+        return {name: summarize(self.values(name), confidence) for name in names}
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """Cumulative distribution function of the Student's t distribution for integer `df`.
+
+    Uses the finite series of Abramowitz & Stegun 26.7.3 and 26.7.4.
+    """
+    theta = atan(t / sqrt(df))
+    c2 = cos(theta) ** 2
+    if df % 2 == 1:
+        term, total = cos(theta), 0.0
+        if df > 1:
+            total = term
+            for k in range(3, df - 1, 2):
+                term *= c2 * (k - 1) / k
+                total += term
+        a = 2 / pi * (theta + sin(theta) * total)
+    else:
+        term, total = 1.0, 1.0
+        for k in range(2, df - 1, 2):
+            term *= c2 * (k - 1) / k
+            total += term
+        a = sin(theta) * total
+    return 0.5 + a / 2
+
+
+def _t_pdf(t: float, df: int) -> float:
+    """Probability density function of the Student's t distribution."""
+    log_norm = lgamma((df + 1) / 2) - lgamma(df / 2) - 0.5 * log(df * pi)
+    return exp(log_norm - (df + 1) / 2 * log1p(t * t / df))
+
+
+def t_quantile(p: float, df: int) -> float:
+    """Quantile of the Student's t distribution.
+
+    Exact for 1 and 2 degrees of freedom. Otherwise the Cornish-Fisher expansion around the
+    normal quantile (Abramowitz & Stegun 26.7.5) is refined with Newton steps on the exact
+    distribution function, which is only needed for small samples.
+
+    Args:
+        p: probability.
+        df: degrees of freedom.
+
+    Returns:
+        the value `t` such that `P(T <= t) = p`.
+    """
+    if df < 1:
+        raise ValueError("degrees of freedom must be at least 1")
+    if df == 1:
+        return tan(pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    g1 = (z**3 + z) / 4
+    g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+    g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+    g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+    t = z + g1 / df + g2 / df**2 + g3 / df**3 + g4 / df**4
+    if df <= 100:
+        for _ in range(3):
+            t -= (_t_cdf(t, df) - p) / _t_pdf(t, df)
+    return t
+
+
+def summarize(values: Sequence[float], confidence: float = 0.95) -> Summary:
+    """Compute the mean of a sample and the confidence interval of the mean.
+
+    Args:
+        values: independent observations, e.g. one per replication.
+        confidence: confidence level of the interval, default is 0.95.
+
+    Returns:
+        the `Summary` of the sample.
+    """
+    n = len(values)
+    if n == 0:
+        raise ValueError("cannot summarize an empty sample")
+    mean = fmean(values)
+    if n == 1:
+        return Summary(n, mean, 0.0, inf, confidence)
+    std = stdev(values, mean)
+    half_width = t_quantile(0.5 + confidence / 2, n - 1) * std / sqrt(n)
+    return Summary(n, mean, std, half_width, confidence)
+
+
+def spawn_seeds(seed: int | None, n: int, start: int = 0) -> list[int]:
+    """Derive independent seeds for `n` replications from a root seed.
+
+    Every seed is obtained hashing the root seed with the replication index, so the seed of
+    a replication does not depend on how many replications are run.
+
+    Args:
+        seed: root seed. If None, a random root seed is drawn.
+        n: number of seeds.
+        start: index of the first replication, default is 0.
+
+    Returns:
+        list of 64 bits seeds.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    seeds = []
+    for i in range(start, start + n):
+        digest = hashlib.sha256(f"{seed}:{i}".encode()).digest()
+        seeds.append(int.from_bytes(digest[:8], "little"))
+    return seeds
+
+
+def run_replication(
+    model_factory: ModelFactory,
+    seed: int,
+    until: int | float | datetime = inf,
+    init: int | float | datetime = 0,
+    params: Mapping[str, Any] | None = None,
+) -> dict[str, float]:
+    """Run a single replication of a model.
+
+    The global `random` module is seeded too, so models written with `random.expovariate`
+    and friends are reproducible.
+
+    Args:
+        model_factory: function that builds the model on a simulator.
+        seed: seed of the replication.
+        until: simulation time to run the replication until.
+        init: initial simulation time.
+        params: parameters of the scenario, passed as keyword arguments to the model factory.
+
+    Returns:
+        the outputs of the replication.
+    """
+    random.seed(seed)
+    sim = Simulator(init=init, trace=False)
+    outputs = model_factory(sim, seed, **(params or {}))
+    sim.run(until)
+    return dict(outputs())
+
+
+def _run_many(args) -> list[dict[str, float]]:
+    """Run a chunk of replications inside a worker process."""
+    model_factory, jobs, until, init = args
+    return [
+        run_replication(model_factory, seed, until, init, params)
+        for seed, params in jobs
+    ]
+
+
+def _chunks(jobs: list, size: int) -> list[list]:
+    return [jobs[i : i + size] for i in range(0, len(jobs), size)]
+
+
+def _execute(
+    model_factory: ModelFactory,
+    jobs: list[tuple[int, Mapping[str, Any] | None]],
+    workers: int | None,
+    until: int | float | datetime,
+    init: int | float | datetime,
+    pool: ProcessPoolExecutor | None = None,
+) -> Iterator[tuple[list[tuple[int, Mapping[str, Any] | None]], list[dict[str, float]]]]:
+    """Run replications, in the current process or in a pool, yielding them by chunks."""
+    if workers == 1:
+        for chunk in _chunks(jobs, 1):
+            yield chunk, _run_many((model_factory, chunk, until, init))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    size = max(1, len(jobs) // (4 * workers))
+    chunks = _chunks(jobs, size)
+    tasks = [(model_factory, chunk, until, init) for chunk in chunks]
+    if pool is not None:
+        yield from zip(chunks, pool.map(_run_many, tasks))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from zip(chunks, pool.map(_run_many, tasks))
+
+
+def _seeds(seeds: int | Sequence[int] | None, n: int) -> list[int]:
+    if seeds is None or isinstance(seeds, int):
+        return spawn_seeds(seeds, n)
+    seeds = list(seeds)
+    if len(seeds) != n:
+        raise ValueError(f"expected {n} seeds but got {len(seeds)}")
+    return seeds
+
+
+def replicate(
+    model_factory: ModelFactory,
+    n: int,
+    seeds: int | Sequence[int] | None = None,
+    workers: int | None = None,
+    until: int | float | datetime = inf,
+    init: int | float | datetime = 0,
+) -> Replications:
+    """Run independent replications of a model in a pool of processes.
+
+    Args:
+        model_factory: module level function `(sim, seed) -> outputs` that builds the model
+            on the given simulator and returns a function computing the outputs of the run.
+        n: number of replications.
+        seeds: either a root seed from which `n` independent seeds are derived, or an
+            explicit sequence of `n` seeds. If None, a random root seed is used.
+        workers: number of worker processes. If None, as many as CPUs. With 1, the
+            replications run in the current process.
+        until: simulation time to run every replication until.
+        init: initial simulation time of every replication.
+
+    Returns:
+        a `Replications` object with the outputs of every replication.
+    """
+    seeds = _seeds(seeds, n)
+    jobs = [(seed, None) for seed in seeds]
+    outputs = [
+        out for _, chunk in _execute(model_factory, jobs, workers, until, init) for out in chunk
+    ]
+    return Replications(seeds, outputs)
+
+
+def _converged(
+    replications: Replications,
+    precision: float,
+    measures: Sequence[str] | None,
+    confidence: float,
+) -> bool:
+    summary = replications.summary(confidence)
+    names = summary.keys() if measures is None else measures
+    return all(summary[name].relative_half_width <= precision for name in names)
+
+
+def replicate_until(
+    model_factory: ModelFactory,
+    precision: float = 0.05,
+    measures: Sequence[str] | None = None,
+    confidence: float = 0.95,
+    min_replications: int = 10,
+    max_replications: int = 1000,
+    batch: int | None = None,
+    seed: int | None = None,
+    workers: int | None = None,
+    until: int | float | datetime = inf,
+    init: int | float | datetime = 0,
+) -> Replications:
+    """Run replications by batches until the outputs reach a target precision.
+
+    After every batch of replications, the confidence interval of the mean of every measure
+    is computed and no more replications are launched once the half width of all of them,
+    relative to the mean, is below `precision`.
+
+    ```python
+    result = replicate_until(model, precision=0.02, measures=["waiting"], seed=42, until=1000)
+    len(result.outputs)  # number of replications that were needed
+    ```
+
+    Args:
+        model_factory: module level function `(sim, seed) -> outputs`.
+        precision: target relative half width of the confidence intervals, default is 0.05.
+        measures: names of the outputs that must reach the precision, default is all of them.
+        confidence: confidence level of the intervals, default is 0.95.
+        min_replications: replications run before checking the precision, default is 10.
+        max_replications: maximum number of replications, default is 1000.
+        batch: replications launched at once, default is the number of workers.
+        seed: root seed of the replications. If None, a random root seed is used.
+        workers: number of worker processes. If None, as many as CPUs. With 1, the
+            replications run in the current process.
+        until: simulation time to run every replication until.
+        init: initial simulation time of every replication.
+
+    Returns:
+        a `Replications` object with the outputs of every replication that was run.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    n_workers = workers or os.cpu_count() or 1
+    batch = batch or n_workers
+    result = Replications()
+    pool = ProcessPoolExecutor(max_workers=n_workers) if workers != 1 else None
+    try:
+        while len(result.seeds) < max_replications:
+            n = max(batch, min_replications - len(result.seeds))
+            n = min(n, max_replications - len(result.seeds))
+            seeds = spawn_seeds(seed, n, start=len(result.seeds))
+            jobs = [(s, None) for s in seeds]
+            for _, chunk in _execute(model_factory, jobs, workers, until, init, pool):
+                result.outputs.extend(chunk)
+            result.seeds.extend(seeds)
+            if _converged(result, precision, measures, confidence):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return result
+
+
+def batch_means(
+    sim: Simulator,
+    observe: Callable[[Any, Any], float],
+    batch_length: int | float | timedelta,
+    precision: float = 0.05,
+    confidence: float = 0.95,
+    min_batches: int = 10,
+    max_batches: int = 1000,
+) -> Summary:
+    """Extend a single run by batches until a steady state measure reaches a target precision.
+
+    The simulation is run for `batch_length` at a time and `observe(start, end)` computes
+    the measure over every batch, typically from `sim.records(name, start, end)`. The batch
+    values are treated as independent observations, so batches must be long compared with
+    the correlation time of the model, and the warm-up period should be run before.
+
+    ```python
+    sim.run(until=500)  # warm-up
+    waiting = batch_means(sim, lambda start, end: mean_wait(sim.records("wait", start, end)),
+                          batch_length=1000, precision=0.02)
+    ```
+
+    Args:
+        sim: a simulator with the model already scheduled.
+        observe: function `(start, end) -> float` computing the measure of a batch.
+        batch_length: simulation time of every batch.
+        precision: target relative half width of the confidence interval, default is 0.05.
+        confidence: confidence level of the interval, default is 0.95.
+        min_batches: batches run before checking the precision, default is 10.
+        max_batches: maximum number of batches, default is 1000.
+
+    Returns:
+        the `Summary` of the batch values.
+    """
+    values = []
+    end = sim.now()
+    while len(values) < max_batches:
+        # batches are contiguous even if the clock went past the end of the previous one
+        start, end = end, sim._add_to_time(end, batch_length)
+        sim.run(until=end)
+        if sim.now() < end:
+            # the model has no more events, the last batch would be incomplete
+            break
+        values.append(observe(start, end))
+        if len(values) >= max(min_batches, 2):
+            summary = summarize(values, confidence)
+            if summary.relative_half_width <= precision:
+                return summary
+    if not values:
+        raise ValueError("the simulation ended before completing a batch")
+    return summarize(values, confidence)
+
+
+def grid(**params: Sequence[Any]) -> list[dict[str, Any]]:
+    """Build the full factorial design of a set of parameters.
+
+    ```python
+    grid(servers=[1, 2, 3], rate=[0.5, 1.0])  # 6 scenarios
+    ```
+
+    Args:
+        params: the values of every parameter.
+
+    Returns:
+        list with one dict of parameters per scenario.
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in product(*params.values())]
+
+
+def latin_hypercube(
+    n: int, bounds: Mapping[str, tuple[float, float]], seed: int | None = None
+) -> list[dict[str, float]]:
+    """Build a Latin hypercube design of continuous parameters.
+
+    The range of every parameter is split in `n` intervals of equal width and every interval
+    is sampled exactly once.
+
+    Args:
+        n: number of scenarios.
+        bounds: the `(low, high)` range of every parameter.
+        seed: seed of the design, default is None.
+
+    Returns:
+        list with one dict of parameters per scenario.
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name, (low, high) in bounds.items():
+        strata = list(range(n))
+        rng.shuffle(strata)
+        columns[name] = [low + (high - low) * (k + rng.random()) / n for k in strata]
+    return [{name: columns[name][i] for name in bounds} for i in range(n)]
+
+
+def model_version(model_factory: ModelFactory) -> str:
+    """Fingerprint of a model factory used to invalidate cached results.
+
+    It is the hash of the source code of the module that defines the model factory, so any
+    change to the model code produces a new version. When the source is not available, the
+    qualified name of the model factory is used.
+
+    Args:
+        model_factory: the model factory.
+
+    Returns:
+        an hexadecimal version string.
+    """
+    try:
+        source = inspect.getsource(inspect.getmodule(model_factory))
+    except (OSError, TypeError):
+        source = ""
+    name = f"{model_factory.__module__}.{model_factory.__qualname__}"
+    return hashlib.sha256(f"{name}\n{source}".encode()).hexdigest()[:16]
+
+
+class ResultCache:
+    """On disk cache of replication outputs.
+
+    Every replication is stored as a small JSON file named after the hash of its model
+    version, parameters, seed and run horizon, so re-running a sweep only computes the
+    replications whose key is not in the cache.
+
+    Args:
+        path: directory of the cache, it is created if it does not exist.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(version: str, params: Mapping[str, Any] | None, seed: int, until: Any, init: Any) -> str:
+        """Compute the cache key of a replication."""
+        payload = json.dumps(
+            {"version": version, "params": params, "seed": seed, "until": until, "init": init},
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, float] | None:
+        """Get the outputs stored under `key`, or None if they are not cached."""
+        try:
+            with open(self._path / f"{key}.json") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, key: str, outputs: Mapping[str, float]):
+        """Store the outputs of a replication under `key`."""
+        tmp = self._path / f"{key}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(outputs, f)
+        os.replace(tmp, self._path / f"{key}.json")
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._path.glob("*.json"))
+
+
+@dataclass
+class Scenario:
+    """Replications of a model for one set of parameters.
+
+    Args:
+        params (dict[str, Any]): parameters of the scenario.
+        replications (Replications): outputs of every replication.
+    """
+
+    params: dict[str, Any]
+    replications: Replications
+
+    def summary(self, confidence: float = 0.95) -> dict[str, Summary]:
+        """Summarize every output measure of the scenario."""
+        return self.replications.summary(confidence)
+
+
+def sweep(
+    model_factory: ModelFactory,
+    scenarios: Sequence[Mapping[str, Any]],
+    replications: int,
+    seeds: int | Sequence[int] | None = None,
+    workers: int | None = None,
+    until: int | float | datetime = inf,
+    init: int | float | datetime = 0,
+    cache: str | os.PathLike | ResultCache | None = None,
+    version: str | None = None,
+) -> list[Scenario]:
+    """Run replications of a model for every scenario of an experimental design.
+
+    All the scenarios × replications are spread across the worker processes. Every scenario
+    uses the same seeds, so scenarios are compared under common random numbers.
+
+    ```python
+    def model(sim: Simulator, seed: int, servers: int, rate: float):
+        ...
+
+    results = sweep(model, grid(servers=[1, 2, 3], rate=[0.5, 1.0]), replications=30,
+                    seeds=42, cache=".pydes-cache")
+    ```
+
+    Args:
+        model_factory: module level function `(sim, seed, **params) -> outputs`.
+        scenarios: parameters of every scenario, e.g. built with `grid` or `latin_hypercube`.
+        replications: number of replications per scenario.
+        seeds: root seed or explicit sequence of `replications` seeds.
+        workers: number of worker processes. If None, as many as CPUs. With 1, the
+            replications run in the current process.
+        until: simulation time to run every replication until.
+        init: initial simulation time of every replication.
+        cache: directory or `ResultCache` where outputs are stored, default is None (no cache).
+        version: version of the model used in the cache keys, default is `model_version(model_factory)`.
+
+    Returns:
+        list with one `Scenario` per scenario, in the same order.
+    """
+    seeds = _seeds(seeds, replications)
+    if cache is not None and not isinstance(cache, ResultCache):
+        cache = ResultCache(cache)
+    if cache is not None and version is None:
+        version = model_version(model_factory)
+
+    outputs: dict[tuple[int, int], dict[str, float]] = {}
+    pending = []
+    keys = {}
+    for i, params in enumerate(scenarios):
+        for j, seed in enumerate(seeds):
+            if cache is not None:
+                keys[i, j] = cache.key(version, dict(params), seed, until, init)
+                cached = cache.get(keys[i, j])
+                if cached is not None:
+                    outputs[i, j] = cached
+                    continue
+            pending.append((i, j))
+
+    jobs = [(seeds[j], dict(scenarios[i])) for i, j in pending]
+    done = iter(pending)
+    for _, chunk in _execute(model_factory, jobs, workers, until, init):
+        for out in chunk:
+            ij = next(done)
+            outputs[ij] = out
+            if cache is not None:
+                cache.set(keys[ij], out)
+
+    return [
+        Scenario(dict(params), Replications(seeds, [outputs[i, j] for j in range(len(seeds))]))
+        for i, params in enumerate(scenarios)
+    ]
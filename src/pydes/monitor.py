@@ -1,11 +1,14 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Hashable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pydes.core import Simulator
 
+_MISSING = object()
+
 
 @dataclass
 class Record:
@@ -54,6 +57,15 @@ class Monitor:
     To turn off the printing of the records during simulation, you can pass 'trace=False' to the `Simulator`
     constructor.
 
+    Records are appended in non-decreasing simulation time, so the `Monitor` keeps a time index
+    and a per-name index up to date on every `record` call. Queries by name and time window use
+    bisection over these indexes instead of scanning all the records.
+
+    ```python
+    sim.records(name="Process.0", start=10, end=20)
+    sim.value_at("Process.0", 15)
+    ```
+
     Args:
         sim: The simulator instance.
         trace: Indicates whether tracing is enabled or not.
@@ -63,9 +75,30 @@ class Monitor:
         self._sim = sim
         self._trace = trace
         self._values: list[Record] = []
+        self._times: list[float | int | datetime] = []
+        self._index: dict[Hashable, tuple[list[float | int | datetime], list[Record]]] = {}
 
     def reset(self):
         self._values = []
+        self._times = []
+        self._index = {}
+
+    def truncate(self, time: float | int | datetime):
+        """Drop the records made before a given time.
+
+        Args:
+            time: Records with time strictly less than `time` are dropped.
+        """
+        lo = bisect_left(self._times, time)
+        self._values = self._values[lo:]
+        self._times = self._times[lo:]
+        for name in list(self._index):
+            times, values = self._index[name]
+            lo = bisect_left(times, time)
+            if lo == len(times):
+                del self._index[name]
+            elif lo > 0:
+                self._index[name] = (times[lo:], values[lo:])
 
     def record(
         self,
@@ -90,14 +123,118 @@ class Monitor:
             self._display(rec)
 
         self._values.append(rec)
+        self._times.append(rec.time)
+        if name not in self._index:
+            self._index[name] = ([], [])
+        times, values = self._index[name]
+        times.append(rec.time)
+        values.append(rec)
 
-    def values(self) -> list[Record]:
+    def values(
+        self,
+        name: Hashable | None = None,
+        start: float | int | datetime | None = None,
+        end: float | int | datetime | None = None,
+    ) -> list[Record]:
         """Get recorded simulation events.
 
+        Without arguments all the records are returned. Records can be filtered by
+        name and by the time window `[start, end)`.
+
+        Args:
+            name: Only return records with this name, default is None.
+            start: Only return records with time greater or equal than `start`, default is None.
+            end: Only return records with time strictly less than `end`, default is None.
+
+        Returns:
+            a new list of `Record` objects, so the internal indexes cannot be altered through it.
+        """
+        if name is None:
+            times, values = self._times, self._values
+        elif name in self._index:
+            times, values = self._index[name]
+        else:
+            return []
+        if start is None and end is None:
+            return list(values)
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        return values[lo:hi]
+
+    def names(self) -> list[Hashable]:
+        """Get the names of the recorded events in order of first appearance.
+
+        Returns:
+            list of record names.
+        """
+        return list(self._index)
+
+    def groupby(self) -> dict[Hashable, list[Record]]:
+        """Get the recorded events grouped by name.
+
+        Returns:
+            dict mapping every name to its records, ordered by time.
+        """
+        return {name: list(values) for name, (_, values) in self._index.items()}
+
+    def value_at(
+        self, name: Hashable, time: float | int | datetime, default: Any = None
+    ) -> Any:
+        """Get the value of a recorded state at a given time.
+
+        The records of `name` are interpreted as a step function: the value at `time` is the
+        value of the last record made at or before `time`.
+
+        Args:
+            name: The name of the records.
+            time: Simulation time to evaluate.
+            default: Value returned if nothing was recorded at or before `time`, default is None.
+
+        Returns:
+            the recorded value, or `default` if nothing was recorded at or before `time`.
+        """
+        if name not in self._index:
+            return default
+        times, values = self._index[name]
+        i = bisect_right(times, time)
+        if i == 0:
+            return default
+        return values[i - 1].value
+
+    def steps(
+        self,
+        name: Hashable,
+        start: float | int | datetime | None = None,
+        end: float | int | datetime | None = None,
+    ) -> list[tuple[float | int | datetime, Any]]:
+        """Reconstruct the step function of a recorded state.
+
+        Consecutive records with the same value are merged. When `start` is given, the
+        value in effect at `start` is included as the first step.
+
+        Args:
+            name: The name of the records.
+            start: Beginning of the time window, default is None.
+            end: End of the time window (excluded), default is None.
+
         Returns:
-            list of `Record` objects.
+            list of `(time, value)` tuples where each value holds until the next time.
         """
-        return self._values
+        steps = []
+        if start is not None:
+            value = self.value_at(name, start, _MISSING)
+            if value is not _MISSING:
+                steps.append((start, value))
+        for rec in self.values(name, start, end):
+            if steps and steps[-1][1] == rec.value:
+                continue
+            if steps and steps[-1][0] == rec.time:
+                steps[-1] = (rec.time, rec.value)
+                if len(steps) > 1 and steps[-2][1] == rec.value:
+                    steps.pop()
+                continue
+            steps.append((rec.time, rec.value))
+        return steps
 
     def _display(self, rec):
         """Display a recorded event."""
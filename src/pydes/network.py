@@ -0,0 +1,290 @@
+"""
+This is the pydes.network module.
+
+It describes open queueing networks: Poisson sources feeding stations of identical
+servers with exponential service times, connected by routing probabilities. The same
+description can be built on a `Simulator` as greenlet processes and `Resource`s, or run
+for many replications at once by `pydes.batch`.
+
+```python
+from pydes import Simulator
+from pydes.network import Network, Source, Station
+
+network = Network(
+    sources=[Source("arrivals", rate=1.0, routing={"triage": 1.0})],
+    stations=[
+        Station("triage", service_rate=1.5, routing={"doctor": 0.6}),  # 40% leave
+        Station("doctor", service_rate=0.4, servers=2),
+    ],
+)
+sim = Simulator(trace=False)
+model = network.build(sim)
+sim.run(until=10_000)
+model.outputs()["doctor.wait"]
+```
+
+Every station reports the following outputs, named `"<station>.<measure>"`:
+
+- `L`: time average number of customers in the station.
+- `Lq`: time average number of customers waiting.
+- `utilization`: time average fraction of busy servers.
+- `throughput`: departures per time unit.
+- `wait`: average time in queue, `Lq / arrival rate`.
+- `sojourn`: average time in the station, `L / arrival rate`.
+
+Times are numeric and rates are expressed per time unit.
+"""
+
+import random
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any
+
+from pydes.components import Component, Resource
+from pydes.core import Simulator
+
+MEASURES = ("L", "Lq", "utilization", "throughput", "wait", "sojourn")
+
+
+@dataclass
+class Source:
+    """A Poisson source of customers.
+
+    Args:
+        name (str): name of the source.
+        rate (float): arrivals per time unit.
+        routing (dict[str, float]): probability that an arrival goes to every station. The
+            probabilities must add up to 1.
+    """
+
+    name: str
+    rate: float
+    routing: dict[str, float]
+
+
+@dataclass
+class Station:
+    """A station of identical servers with exponential service times and a shared queue.
+
+    Args:
+        name (str): name of the station.
+        service_rate (float): services per time unit of every server.
+        servers (int): number of servers, default is 1.
+        routing (dict[str, float]): probability that a customer goes to every station after
+            the service. The rest of the probability leaves the network, default is empty.
+    """
+
+    name: str
+    service_rate: float
+    servers: int = 1
+    routing: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Network:
+    """An open queueing network of sources and stations.
+
+    Args:
+        sources (list[Source]): the sources of customers.
+        stations (list[Station]): the stations.
+
+    The description is validated on creation.
+    """
+
+    sources: list[Source]
+    stations: list[Station]
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self):
+        """Check the description, raising `ValueError` if it is not valid."""
+        names = [s.name for s in self.stations]
+        if len(set(names)) != len(names):
+            raise ValueError("station names must be unique")
+        if len({s.name for s in self.sources}) != len(self.sources):
+            raise ValueError("source names must be unique")
+        if not self.sources:
+            raise ValueError("a network needs at least one source")
+        for source in self.sources:
+            if source.rate <= 0:
+                raise ValueError(f"rate of source {source.name!r} must be positive")
+            self._check_routing(source.name, source.routing, names)
+            if abs(sum(source.routing.values()) - 1) > 1e-9:
+                raise ValueError(f"routing of source {source.name!r} must add up to 1")
+        for station in self.stations:
+            if station.service_rate <= 0:
+                raise ValueError(f"service rate of station {station.name!r} must be positive")
+            if station.servers < 1:
+                raise ValueError(f"station {station.name!r} needs at least one server")
+            self._check_routing(station.name, station.routing, names)
+            if sum(station.routing.values()) > 1 + 1e-9:
+                raise ValueError(f"routing of station {station.name!r} adds up to more than 1")
+
+    @staticmethod
+    def _check_routing(name: str, routing: dict[str, float], stations: list[str]):
+        for target, p in routing.items():
+            if target not in stations:
+                raise ValueError(f"{name!r} routes to unknown station {target!r}")
+            if p < 0:
+                raise ValueError(f"routing probabilities of {name!r} cannot be negative")
+
+    def station(self, name: str) -> Station:
+        """Get a station by name."""
+        for station in self.stations:
+            if station.name == name:
+                return station
+        raise KeyError(name)
+
+    def build(self, sim: Simulator, streams: Any = None) -> "NetworkModel":
+        """Build the network on a simulator with greenlet processes and `Resource`s.
+
+        Args:
+            sim: The simulator instance.
+            streams: a `pydes.random.Streams` to draw the variates from, default is the
+                `random` module.
+
+        Returns:
+            the `NetworkModel`, whose `outputs` method computes the outputs of the run.
+        """
+        return NetworkModel(sim, self, streams)
+
+
+class _Router:
+    """Draws the next station from routing probabilities, None to leave."""
+
+    def __init__(self, routing: dict[str, float], stream: Any):
+        self._targets = [*routing, None]
+        self._cumulative = list(accumulate(routing.values()))
+        self._stream = stream
+
+    def __call__(self) -> str | None:
+        return self._targets[bisect_right(self._cumulative, self._stream.random())]
+
+
+class _Tally:
+    """Time averages and counters of a station."""
+
+    def __init__(self, sim: Simulator, servers: int):
+        self._sim = sim
+        self.servers = servers
+        self.n = 0
+        self.reset()
+
+    def reset(self):
+        """Restart the statistics, keeping the customers in the station."""
+        self.start = self.last = self._sim.now()
+        self.arrivals = 0
+        self.departures = 0
+        self.area = 0.0
+        self.busy = 0.0
+
+    def _accumulate(self):
+        now = self._sim.now()
+        dt = now - self.last
+        self.area += self.n * dt
+        self.busy += min(self.n, self.servers) * dt
+        self.last = now
+
+    def arrive(self):
+        self._accumulate()
+        self.n += 1
+        self.arrivals += 1
+
+    def depart(self):
+        self._accumulate()
+        self.n -= 1
+        self.departures += 1
+
+    def outputs(self) -> dict[str, float]:
+        self._accumulate()
+        horizon = self.last - self.start
+        if horizon <= 0:
+            return dict.fromkeys(MEASURES, 0.0)
+        L = self.area / horizon
+        busy = self.busy / horizon
+        rate = self.arrivals / horizon
+        return {
+            "L": L,
+            "Lq": L - busy,
+            "utilization": busy / self.servers,
+            "throughput": self.departures / horizon,
+            "wait": (L - busy) / rate if rate else 0.0,
+            "sojourn": L / rate if rate else 0.0,
+        }
+
+
+class NetworkModel(Component):
+    """A `Network` built on a simulator.
+
+    Every source is a process and every customer is a process that requests the `Resource`
+    of each station it visits. The statistics restart when `Simulator.reset_statistics` is
+    called, e.g. at the end of a warm-up period.
+
+    Args:
+        sim: The simulator instance.
+        network: The network description.
+        streams: a `pydes.random.Streams` to draw the variates from, default is the
+            `random` module.
+    """
+
+    def __init__(self, sim: Simulator, network: Network, streams: Any = None):
+        self._sim = sim
+        self.network = network
+
+        def stream(name: str):
+            return random if streams is None else streams[name]
+
+        self.resources = {s.name: Resource(sim, s.servers) for s in network.stations}
+        self._tallies = {s.name: _Tally(sim, s.servers) for s in network.stations}
+        self._service = {s.name: (stream(f"{s.name}.service"), s.service_rate) for s in network.stations}
+        self._routers = {
+            s.name: _Router(s.routing, stream(f"{s.name}.routing"))
+            for s in [*network.sources, *network.stations]
+        }
+        for source in network.sources:
+            sim.schedule(self._source(source, stream(f"{source.name}.arrivals")))
+        sim.on_reset_statistics(self.reset_statistics)
+
+    def reset_statistics(self):
+        for tally in self._tallies.values():
+            tally.reset()
+
+    def _source(self, source: Source, stream: Any):
+        def main():
+            while True:
+                self._sim.sleep(stream.expovariate(source.rate))
+                self._sim.schedule(self._customer(self._routers[source.name]()))
+
+        main.__qualname__ = source.name
+        return main
+
+    def _customer(self, station: str):
+        def main():
+            me = object()
+            current: str | None = station
+            while current is not None:
+                tally = self._tallies[current]
+                resource = self.resources[current]
+                stream, rate = self._service[current]
+                tally.arrive()
+                resource.request(me)
+                self._sim.sleep(stream.expovariate(rate))
+                resource.release(me)
+                tally.depart()
+                current = self._routers[current]()
+
+        return main
+
+    def outputs(self) -> dict[str, float]:
+        """Get the outputs of every station since the start or the last statistics reset.
+
+        Returns:
+            dict mapping `"<station>.<measure>"` to its value.
+        """
+        return {
+            f"{name}.{measure}": value
+            for name, tally in self._tallies.items()
+            for measure, value in tally.outputs().items()
+        }
@@ -0,0 +1,337 @@
+"""
+This is the pydes.parallel module.
+
+It runs a model partitioned into several simulators, one per OS process, that exchange
+timestamped messages through declared links. Every link has a lookahead: the minimum delay
+between sending a message and its arrival, e.g. the transport time between two areas of a
+plant. The partitions are synchronized with a conservative time window protocol, so every
+partition sees its events and messages in timestamp order, exactly like a sequential run.
+
+```python
+from pydes.parallel import ParallelSimulation, Ports
+
+def area_a(sim, ports: Ports):
+    def main():
+        for i in range(100):
+            sim.sleep(1)
+            ports.send("b", i)  # arrives at b after the lookahead of the link, 5
+
+    sim.schedule(main)
+
+def area_b(sim, ports: Ports):
+    received = []
+
+    def main():
+        while True:
+            received.append(ports.receive())
+
+    sim.schedule(main)
+    return lambda: {"received": len(received)}
+
+psim = ParallelSimulation({"a": area_a, "b": area_b}, links={("a", "b"): 5})
+results = psim.run(until=1000)  # {"a": None, "b": {"received": 100}}
+```
+
+A partition is built by a factory `factory(sim, ports)`. It may return a function that
+computes the outputs of the partition, which is called at the end of the run. Factories
+must be picklable, i.e. defined at module level, to run in separate processes.
+
+Synchronization works in rounds. In every round the coordinator computes, for every
+partition, the earliest time at which any message could still reach it: the earliest time
+of every sender, propagated through the links and their lookaheads. The partition then
+runs all its events before that time in parallel with the others, and the messages sent in
+the round are delivered at the beginning of the next one. Larger lookaheads mean fewer
+rounds and more parallelism. Only numeric simulation times are supported.
+"""
+
+import heapq
+import multiprocessing as mp
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from itertools import count
+from math import inf
+from typing import Any, Callable, Hashable
+
+from pydes.core import Simulator
+
+Factory = Callable[[Simulator, "Ports"], Callable[[], Any] | None]
+
+
+@dataclass(order=True)
+class Message:
+    """A message between partitions.
+
+    Args:
+        time (float): simulation time of arrival at the destination.
+        source (Hashable): name of the sending partition.
+        seq (int): sequence number of the message at the source.
+        target (Hashable): name of the destination partition.
+        payload (Any): content of the message.
+    """
+
+    time: float
+    source: Hashable
+    seq: int
+    target: Hashable
+    payload: Any
+
+
+class Ports:
+    """The links of a partition with the other partitions.
+
+    Args:
+        sim: The simulator of the partition.
+        name: Name of the partition.
+        lookaheads: Lookahead of every outgoing link, by destination.
+    """
+
+    def __init__(self, sim: Simulator, name: Hashable, lookaheads: dict[Hashable, float]):
+        self._sim = sim
+        self.name = name
+        self._lookaheads = lookaheads
+        self._seq = count()
+        self._outbox: list[Message] = []
+        self._inbox: deque[Message] = deque()
+
+    def send(self, to: Hashable, payload: Any, delay: float | None = None):
+        """Send a message to another partition.
+
+        Args:
+            to: Name of the destination partition.
+            payload: Content of the message, it must be picklable.
+            delay: Simulation time until the message arrives, default is the lookahead of
+                the link. It cannot be less than the lookahead.
+        """
+        if to not in self._lookaheads:
+            raise ValueError(f"there is no link from {self.name!r} to {to!r}")
+        lookahead = self._lookaheads[to]
+        if delay is None:
+            delay = lookahead
+        if delay < lookahead:
+            raise ValueError(
+                f"delay {delay} is less than the lookahead {lookahead} of the link to {to!r}"
+            )
+        self._outbox.append(Message(self._sim.now() + delay, self.name, next(self._seq), to, payload))
+
+    def receive(self) -> Any:
+        """Get the next message that arrived, waiting until there is one.
+
+        Returns:
+            the payload of the message.
+        """
+        return self.receive_message().payload
+
+    def receive_message(self) -> Message:
+        """Get the next `Message` that arrived, waiting until there is one."""
+        self._sim.wait_for(lambda: len(self._inbox) > 0)
+        return self._inbox.popleft()
+
+    def pending(self) -> int:
+        """Get the number of messages that arrived and were not received yet."""
+        return len(self._inbox)
+
+    def _deliver(self, message: Message):
+        def arrive():
+            self._inbox.append(message)
+
+        self._sim.schedule(arrive, at=message.time)
+
+
+class _Partition:
+    """A partition of the model, stepped by the coordinator."""
+
+    def __init__(
+        self, name: Hashable, factory: Factory, lookaheads: dict[Hashable, float], init: float
+    ):
+        self.sim = Simulator(init=init, trace=False)
+        self.ports = Ports(self.sim, name, lookaheads)
+        self.outputs = factory(self.sim, self.ports)
+
+    def step(
+        self, end: float, inclusive: bool, messages: list[Message]
+    ) -> tuple[float, list[Message]]:
+        for message in messages:
+            self.ports._deliver(message)
+        self.sim._advance(end, inclusive)
+        outbox, self.ports._outbox = self.ports._outbox, []
+        return self.sim._next_time(), outbox
+
+    def finish(self) -> Any:
+        return self.outputs() if callable(self.outputs) else None
+
+
+def _worker(conn, name, factory, lookaheads, init):
+    """Entry point of the OS process of a partition."""
+    try:
+        partition = _Partition(name, factory, lookaheads, init)
+        conn.send(("ok", None))
+        while True:
+            command, *args = conn.recv()
+            if command == "step":
+                conn.send(("ok", partition.step(*args)))
+            elif command == "finish":
+                conn.send(("ok", partition.finish()))
+                return
+    except BaseException as e:
+        conn.send(("error", e))
+    finally:
+        conn.close()
+
+
+class _Remote:
+    """Proxy of a partition running in another OS process."""
+
+    def __init__(self, context, name, factory, lookaheads, init):
+        self._conn, child = context.Pipe()
+        self._process = context.Process(
+            target=_worker, args=(child, name, factory, lookaheads, init), daemon=True
+        )
+        self._process.start()
+        child.close()
+
+    def _reply(self) -> Any:
+        status, value = self._conn.recv()
+        if status == "error":
+            raise value
+        return value
+
+    def send(self, *command):
+        self._conn.send(command)
+
+    def close(self):
+        self._conn.close()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+class ParallelSimulation:
+    """A model partitioned into simulators that run in parallel.
+
+    Args:
+        partitions: Factory of every partition, by name.
+        links: Lookahead of every directed link, by `(source, destination)` pair. Lookaheads
+            must be positive.
+        init: Initial simulation time of every partition, default is 0.
+        processes: Whether to run every partition in its own OS process, default is True.
+            With False the partitions run one after the other in this process, with the same
+            synchronization, which is useful to debug a partitioned model.
+        context: multiprocessing start method, default is the platform default.
+
+    Attributes:
+        rounds (int): number of synchronization rounds of the last run.
+        messages (int): number of messages exchanged in the last run.
+    """
+
+    def __init__(
+        self,
+        partitions: dict[Hashable, Factory],
+        links: dict[tuple[Hashable, Hashable], float],
+        init: float = 0,
+        processes: bool = True,
+        context: str | None = None,
+    ):
+        for (source, target), lookahead in links.items():
+            if source not in partitions or target not in partitions:
+                raise ValueError(f"link {source!r} -> {target!r} joins unknown partitions")
+            if lookahead <= 0:
+                raise ValueError(f"lookahead of link {source!r} -> {target!r} must be positive")
+        self._partitions = partitions
+        self._links = dict(links)
+        self._init = init
+        self._processes = processes
+        self._context = context
+        self.rounds = 0
+        self.messages = 0
+
+    def _lookaheads(self, name: Hashable) -> dict[Hashable, float]:
+        return {target: l for (source, target), l in self._links.items() if source == name}
+
+    def _earliest(self, times: dict[Hashable, float]) -> dict[Hashable, float]:
+        """Earliest time every partition can reach through its links, from its own `times`."""
+        earliest = dict(times)
+        heap = [(t, i, name) for i, (name, t) in enumerate(times.items())]
+        heapq.heapify(heap)
+        tie = count(len(heap))
+        while heap:
+            t, _, name = heapq.heappop(heap)
+            if t > earliest[name]:
+                continue
+            for (source, target), lookahead in self._links.items():
+                if source == name and t + lookahead < earliest[target]:
+                    earliest[target] = t + lookahead
+                    heapq.heappush(heap, (t + lookahead, next(tie), target))
+        return earliest
+
+    def _safe(self, earliest: dict[Hashable, float]) -> dict[Hashable, float]:
+        """Time before which no more messages can reach every partition."""
+        safe = {name: inf for name in self._partitions}
+        for (source, target), lookahead in self._links.items():
+            safe[target] = min(safe[target], earliest[source] + lookahead)
+        return safe
+
+    def run(self, until: float = inf) -> dict[Hashable, Any]:
+        """Run the partitions until the given simulation time.
+
+        Args:
+            until: Events up to this time, included, are executed, default is inf.
+
+        Returns:
+            the outputs of every partition, by name.
+        """
+        names = list(self._partitions)
+        remotes: dict[Hashable, _Remote] = {}
+        local: dict[Hashable, _Partition] = {}
+        try:
+            if self._processes:
+                context = mp.get_context(self._context)
+                for name in names:
+                    remotes[name] = _Remote(
+                        context, name, self._partitions[name], self._lookaheads(name), self._init
+                    )
+                for name in names:
+                    remotes[name]._reply()
+            else:
+                for name in names:
+                    local[name] = _Partition(
+                        name, self._partitions[name], self._lookaheads(name), self._init
+                    )
+
+            self.rounds = 0
+            self.messages = 0
+            next_times = {name: self._init for name in names}
+            pending: dict[Hashable, list[Message]] = defaultdict(list)
+            while True:
+                times = {
+                    name: min([next_times[name], *(m.time for m in pending[name])])
+                    for name in names
+                }
+                if min(times.values()) > until:
+                    break
+                safe = self._safe(self._earliest(times))
+                steps = {}
+                for name in names:
+                    end, inclusive = (until, True) if safe[name] > until else (safe[name], False)
+                    messages = sorted(pending.pop(name, []))
+                    steps[name] = (end, inclusive, messages)
+                if self._processes:
+                    for name in names:
+                        remotes[name].send("step", *steps[name])
+                    results = {name: remotes[name]._reply() for name in names}
+                else:
+                    results = {name: local[name].step(*steps[name]) for name in names}
+                self.rounds += 1
+                for name, (next_time, outbox) in results.items():
+                    next_times[name] = next_time
+                    self.messages += len(outbox)
+                    for message in outbox:
+                        pending[message.target].append(message)
+
+            if self._processes:
+                for name in names:
+                    remotes[name].send("finish")
+                return {name: remotes[name]._reply() for name in names}
+            return {name: local[name].finish() for name in names}
+        finally:
+            for remote in remotes.values():
+                remote.close()
@@ -0,0 +1,194 @@
+"""
+This is the pydes.progress module.
+
+Progress reporters are passed to `Simulator.run` and are called every given number of
+process switches and event handler calls, or of wall-clock seconds, with a snapshot of
+the state of the run.
+
+```python
+from pydes.progress import ConsoleReporter, FileReporter
+
+sim.run(until=1_000_000, progress=ConsoleReporter(every_seconds=5))
+sim.run(until=2_000_000, progress=FileReporter("progress.jsonl", every_events=100_000))
+```
+"""
+
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from math import inf
+from time import perf_counter
+from typing import Any, Callable, TextIO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydes.core import Simulator
+
+
+@dataclass
+class Progress:
+    """Snapshot of a running simulation.
+
+    Args:
+        now (float | datetime): current simulation time.
+        until (float | datetime): simulation time the run stops at.
+        wall_time (float): wall-clock seconds since the run started.
+        events (int): process switches and event handler calls since the run started.
+        events_per_second (float): events per wall-clock second.
+        sim_rate (float): simulation time advanced per wall-clock second, in seconds for
+            datetime simulations.
+        conds (int): number of processes blocked in `wait_for`.
+        times (int): number of pending entries in the event list.
+        eta (float | None): estimated wall-clock seconds to reach `until`, None if unknown.
+        done (bool): whether this is the final report of the run.
+    """
+
+    now: Any
+    until: Any
+    wall_time: float
+    events: int
+    events_per_second: float
+    sim_rate: float
+    conds: int
+    times: int
+    eta: float | None
+    done: bool = False
+
+
+class ProgressReporter:
+    """Base class of progress reporters.
+
+    Subclasses implement `report`. Alternatively, a plain function can be passed as
+    `callback`.
+
+    Args:
+        every_events: report every this number of process switches and event handler
+            calls, default is None.
+        every_seconds: report every this number of wall-clock seconds, default is 1.
+        callback: function called with every `Progress`, default is None.
+    """
+
+    def __init__(
+        self,
+        every_events: int | None = None,
+        every_seconds: float | None = 1.0,
+        callback: Callable[[Progress], None] | None = None,
+    ):
+        if every_events is None and every_seconds is None:
+            raise ValueError("either every_events or every_seconds must be given")
+        self._every_events = every_events
+        self._every_seconds = every_seconds
+        self._callback = callback
+
+    def report(self, progress: Progress):
+        """Handle a progress snapshot."""
+        if self._callback is not None:
+            self._callback(progress)
+
+    def start(self, sim: "Simulator", until: Any):
+        """Called by the simulator when a run starts."""
+        self._sim = sim
+        self._until = until
+        self._start = self._last = perf_counter()
+        self._sim_start = sim.now()
+        self._events = 0
+        self._next_events = self._every_events or inf
+
+    def tick(self):
+        """Called by the simulator after every process switch and event handler call."""
+        self._events += 1
+        if self._events >= self._next_events:
+            self._next_events += self._every_events
+            self._emit(perf_counter())
+        elif self._every_seconds is not None:
+            now = perf_counter()
+            if now - self._last >= self._every_seconds:
+                self._emit(now)
+
+    def finish(self):
+        """Called by the simulator when a run ends."""
+        self._emit(perf_counter(), done=True)
+
+    def _elapsed_sim(self, now: Any) -> float:
+        elapsed = now - self._sim_start
+        return elapsed.total_seconds() if isinstance(now, datetime) else elapsed
+
+    def _emit(self, wall: float, done: bool = False):
+        self._last = wall
+        sim = self._sim
+        wall_time = wall - self._start
+        now = sim.now()
+        sim_rate = self._elapsed_sim(now) / wall_time if wall_time > 0 else 0.0
+        eta = None
+        if sim_rate > 0 and self._until not in (inf, datetime.max):
+            remaining = self._elapsed_sim(self._until) - self._elapsed_sim(now)
+            eta = max(remaining, 0.0) / sim_rate
+        self.report(
+            Progress(
+                now=now,
+                until=self._until,
+                wall_time=wall_time,
+                events=self._events,
+                events_per_second=self._events / wall_time if wall_time > 0 else 0.0,
+                sim_rate=sim_rate,
+                conds=len(sim._conds),
+                times=len(sim._times),
+                eta=eta,
+                done=done,
+            )
+        )
+
+
+class ConsoleReporter(ProgressReporter):
+    """Prints one line per progress snapshot.
+
+    Args:
+        every_events: report every this number of process switches and event handler
+            calls, default is None.
+        every_seconds: report every this number of wall-clock seconds, default is 1.
+        stream: text stream to write to, default is `sys.stderr`.
+    """
+
+    def __init__(
+        self,
+        every_events: int | None = None,
+        every_seconds: float | None = 1.0,
+        stream: TextIO | None = None,
+    ):
+        super().__init__(every_events, every_seconds)
+        self._stream = stream
+
+    def report(self, progress: Progress):
+        eta = "-" if progress.eta is None else f"{progress.eta:.1f}s"
+        line = (
+            f"t={progress.now} events={progress.events} "
+            f"({progress.events_per_second:,.0f}/s) sim/wall={progress.sim_rate:,.3g} "
+            f"blocked={progress.conds} timers={progress.times} eta={eta}"
+            + (" done" if progress.done else "")
+        )
+        print(line, file=self._stream or sys.stderr, flush=True)
+
+
+class FileReporter(ProgressReporter):
+    """Appends one JSON line per progress snapshot to a file.
+
+    Args:
+        path: Path of the file.
+        every_events: report every this number of process switches and event handler
+            calls, default is None.
+        every_seconds: report every this number of wall-clock seconds, default is 1.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        every_events: int | None = None,
+        every_seconds: float | None = 1.0,
+    ):
+        super().__init__(every_events, every_seconds)
+        self._path = path
+
+    def report(self, progress: Progress):
+        with open(self._path, "a") as f:
+            f.write(json.dumps(asdict(progress), default=str) + "\n")
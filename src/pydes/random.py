@@ -0,0 +1,191 @@
+"""
+This is the pydes.random module.
+
+It provides named random number streams for simulation models. Every component draws its
+variates from its own stream, so changing how one component uses random numbers does not
+change the numbers seen by the others. This makes two variance reduction techniques easy:
+
+- **Common random numbers**: scenarios run with the same seed see the same variates in
+  every stream, so their differences are not blurred by sampling noise.
+- **Antithetic variates**: a replication run with `antithetic=True` uses `1 - u` for every
+  uniform `u` of the original replication, which is negatively correlated with it.
+
+```python
+from pydes.random import Streams
+
+streams = Streams(seed=42)
+arrivals = streams["arrivals"]
+service = streams[server]  # components are named by their id
+
+sim.sleep(arrivals.expovariate(1.0))
+```
+
+Variates are generated by blocks and served from a buffer. When NumPy is installed the
+blocks are generated with it, otherwise the standard library `random` module is used; the
+two produce different, but equally valid, streams.
+"""
+
+import hashlib
+import random as _random
+from math import log, sqrt
+from typing import Any, Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _derive(seed: int, name: Hashable, kind: str) -> int:
+    """Derive the seed of a stream of variates from the root seed."""
+    digest = hashlib.sha256(f"{seed}:{name}:{kind}".encode()).digest()
+    return int.from_bytes(digest[:16], "little")
+
+
+class Stream:
+    """A named stream of random variates.
+
+    It has the same methods as `random.Random` for the most common distributions. Uniform
+    based variates are computed by inversion, so they respect antithetic sampling.
+
+    Args:
+        seed: root seed of the streams.
+        name: name of the stream.
+        antithetic: whether to use antithetic variates, default is False.
+        block: number of variates generated at once, default is 4096.
+    """
+
+    def __init__(self, seed: int, name: Hashable, antithetic: bool = False, block: int = 4096):
+        self.name = name
+        self._seed = seed
+        self._antithetic = antithetic
+        self._block = block
+        self._generators = {}
+        self._uniforms: list[float] = []
+        self._exponentials: list[float] = []
+        self._normals: list[float] = []
+
+    def _generator(self, kind: str):
+        if kind not in self._generators:
+            seed = _derive(self._seed, self.name, kind)
+            if np is not None:
+                self._generators[kind] = np.random.default_rng(seed)
+            else:
+                self._generators[kind] = _random.Random(seed)
+        return self._generators[kind]
+
+    def _generate(self, kind: str) -> list[float]:
+        """Generate a block of variates of a kind, reversed so that `pop` serves them in order."""
+        gen = self._generator(kind)
+        n = self._block
+        if np is not None:
+            if kind == "normal":
+                z = gen.standard_normal(n)
+                block = -z if self._antithetic else z
+            else:
+                u = gen.random(n)
+                if self._antithetic:
+                    u = 1.0 - u
+                if kind == "exponential":
+                    block = -np.log1p(-np.minimum(u, 1.0 - 2**-53))
+                else:
+                    block = u
+            return block[::-1].tolist()
+        if kind == "normal":
+            block = [gen.gauss(0.0, 1.0) for _ in range(n)]
+            if self._antithetic:
+                block = [-z for z in block]
+        else:
+            block = [gen.random() for _ in range(n)]
+            if self._antithetic:
+                block = [1.0 - u for u in block]
+            if kind == "exponential":
+                block = [-log(1.0 - min(u, 1.0 - 2**-53)) for u in block]
+        block.reverse()
+        return block
+
+    def random(self) -> float:
+        """Get a uniform variate in `[0, 1)`."""
+        if not self._uniforms:
+            self._uniforms = self._generate("uniform")
+        return self._uniforms.pop()
+
+    def uniform(self, a: float, b: float) -> float:
+        """Get a uniform variate between `a` and `b`."""
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        """Get a random integer between `a` and `b`, both included."""
+        return a + min(int(self.random() * (b - a + 1)), b - a)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        """Get a random element of a non empty sequence."""
+        return seq[min(int(self.random() * len(seq)), len(seq) - 1)]
+
+    def expovariate(self, lambd: float = 1.0) -> float:
+        """Get an exponential variate with rate `lambd`."""
+        if not self._exponentials:
+            self._exponentials = self._generate("exponential")
+        return self._exponentials.pop() / lambd
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        """Get a normal variate with mean `mu` and standard deviation `sigma`."""
+        if not self._normals:
+            self._normals = self._generate("normal")
+        return mu + sigma * self._normals.pop()
+
+    normalvariate = gauss
+
+    def triangular(self, low: float = 0.0, high: float = 1.0, mode: float | None = None) -> float:
+        """Get a triangular variate between `low` and `high` with the given `mode`."""
+        u = self.random()
+        if high == low:
+            return low
+        c = 0.5 if mode is None else (mode - low) / (high - low)
+        if u > c:
+            u = 1.0 - u
+            c = 1.0 - c
+            low, high = high, low
+        return low + (high - low) * sqrt(u * c)
+
+
+class Streams:
+    """A family of named random number streams derived from a single seed.
+
+    Args:
+        seed: root seed. If None, a random root seed is drawn.
+        antithetic: whether every stream uses antithetic variates, default is False.
+        block: number of variates generated at once by every stream, default is 4096.
+
+    Streams are created on first use. The numbers of a stream only depend on the root seed
+    and on its name, not on the other streams or on the order in which they are created.
+    """
+
+    def __init__(self, seed: int | None = None, antithetic: bool = False, block: int = 4096):
+        if seed is None:
+            seed = _random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.antithetic = antithetic
+        self._block = block
+        self._streams: dict[Hashable, Stream] = {}
+
+    def stream(self, name: Hashable) -> Stream:
+        """Get the stream with the given name.
+
+        Args:
+            name: name of the stream. Components are named by their `id`.
+
+        Returns:
+            the `Stream` object.
+        """
+        name = getattr(name, "id", name)
+        if name not in self._streams:
+            self._streams[name] = Stream(self.seed, name, self.antithetic, self._block)
+        return self._streams[name]
+
+    def __getitem__(self, name: Hashable) -> Stream:
+        return self.stream(name)
+
+    def antithetic_pair(self) -> "Streams":
+        """Get a new family of streams with the same seed and the opposite antithetic flag."""
+        return Streams(self.seed, not self.antithetic, self._block)
@@ -0,0 +1,366 @@
+"""
+This is the pydes.spec module.
+
+It compiles a declarative description of a flow model, written in JSON or YAML, into a
+simulation model. The specification is validated up front, and the compiled model uses the
+fastest paths of Py-DES: every customer is a plain object moved by event handlers instead
+of a greenlet process, routing tables are precomputed and the variates are generated by
+blocks from `pydes.random` streams.
+
+```yaml
+warmup: 100
+sources:
+  - name: arrivals
+    interarrival: {dist: exponential, rate: 1.0}
+    routing: {triage: 1.0}
+stations:
+  - name: triage
+    service: {dist: triangular, low: 0.2, mode: 0.5, high: 1.0}
+    routing: {doctor: 0.6}  # the other 40% leave
+  - name: doctor
+    servers: 2
+    capacity: 10  # waiting places, arrivals are rejected when they are all taken
+    service: {dist: exponential, mean: 2.5}
+```
+
+```python
+from pydes.experiment import replicate
+from pydes.spec import load
+
+model = load("clinic.yaml")
+result = replicate(model, n=100, seeds=1, workers=4, until=10_000)
+result.summary()["doctor.wait"]
+```
+
+The compiled model is a model factory for `pydes.experiment`: it builds the model on a
+simulator and returns the function computing its outputs, which are the outputs of
+`pydes.network` plus `<station>.rejected`. When every delay is exponential and no
+capacity is set, `CompiledModel.network` returns the equivalent `pydes.network.Network`,
+which `pydes.batch` runs for many replications at once.
+
+Distributions are written as `{dist: name, ...parameters}`:
+
+| dist | parameters |
+| --- | --- |
+| `exponential` | `rate` or `mean` |
+| `constant` | `value` |
+| `uniform` | `low`, `high` |
+| `triangular` | `low`, `high`, `mode` (default the midpoint) |
+| `normal` | `mean`, `std`, negative values are truncated to 0 |
+
+YAML files require PyYAML.
+"""
+
+import json
+import os
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+from pydes.core import Simulator
+from pydes.network import Network, Source, Station, _Tally
+from pydes.random import Stream, Streams
+
+_DISTRIBUTIONS = {
+    "exponential": ({"rate", "mean"}, set()),
+    "constant": ({"value"}, {"value"}),
+    "uniform": ({"low", "high"}, {"low", "high"}),
+    "triangular": ({"low", "high", "mode"}, {"low", "high"}),
+    "normal": ({"mean", "std"}, {"mean", "std"}),
+}
+
+
+def _fail(path: str, message: str):
+    raise ValueError(f"{path}: {message}")
+
+
+def _check_number(path: str, value: Any, positive: bool = False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        _fail(path, f"expected a number, got {value!r}")
+    if positive and value <= 0:
+        _fail(path, "must be positive")
+    if value < 0:
+        _fail(path, "cannot be negative")
+
+
+def _check_distribution(path: str, spec: Any):
+    if not isinstance(spec, Mapping) or "dist" not in spec:
+        _fail(path, "expected a distribution like {dist: exponential, rate: 1.0}")
+    name = spec["dist"]
+    if name not in _DISTRIBUTIONS:
+        _fail(path, f"unknown distribution {name!r}, expected one of {', '.join(_DISTRIBUTIONS)}")
+    allowed, required = _DISTRIBUTIONS[name]
+    params = set(spec) - {"dist"}
+    if params - allowed:
+        _fail(path, f"unknown parameters {', '.join(sorted(params - allowed))} of {name}")
+    if required - params:
+        _fail(path, f"missing parameters {', '.join(sorted(required - params))} of {name}")
+    if name == "exponential" and len(params) != 1:
+        _fail(path, "exponential needs either rate or mean")
+    for key in params:
+        _check_number(f"{path}.{key}", spec[key], positive=name == "exponential")
+    if name in ("uniform", "triangular") and spec["high"] < spec["low"]:
+        _fail(path, "high cannot be less than low")
+    if name == "triangular" and not spec["low"] <= spec.get("mode", spec["low"]) <= spec["high"]:
+        _fail(path, "mode must be between low and high")
+
+
+def _check_routing(path: str, routing: Any, stations: set[str], total: bool):
+    if not isinstance(routing, Mapping):
+        _fail(path, "expected a mapping of station names to probabilities")
+    for target, p in routing.items():
+        if target not in stations:
+            _fail(path, f"unknown station {target!r}")
+        _check_number(f"{path}.{target}", p)
+    s = sum(routing.values())
+    if total and abs(s - 1) > 1e-9:
+        _fail(path, f"probabilities must add up to 1, not {s}")
+    if s > 1 + 1e-9:
+        _fail(path, f"probabilities add up to {s}, more than 1")
+
+
+def validate(spec: Mapping[str, Any]):
+    """Check a model specification, raising `ValueError` with the path of the first error.
+
+    Args:
+        spec: the specification, as loaded from JSON or YAML.
+    """
+    if not isinstance(spec, Mapping):
+        _fail("spec", "expected a mapping")
+    unknown = set(spec) - {"sources", "stations", "warmup"}
+    if unknown:
+        _fail("spec", f"unknown keys {', '.join(sorted(unknown))}")
+    if "warmup" in spec:
+        _check_number("warmup", spec["warmup"])
+    for key in ("sources", "stations"):
+        if not isinstance(spec.get(key), list) or not spec[key]:
+            _fail(key, "expected a non empty list")
+    names = set()
+    for i, station in enumerate(spec["stations"]):
+        path = f"stations[{i}]"
+        if not isinstance(station, Mapping) or not isinstance(station.get("name"), str):
+            _fail(path, "expected a mapping with a name")
+        if station["name"] in names:
+            _fail(f"{path}.name", f"duplicated station {station['name']!r}")
+        names.add(station["name"])
+    sources = set()
+    for i, source in enumerate(spec["sources"]):
+        path = f"sources[{i}]"
+        if not isinstance(source, Mapping) or not isinstance(source.get("name"), str):
+            _fail(path, "expected a mapping with a name")
+        if source["name"] in sources:
+            _fail(f"{path}.name", f"duplicated source {source['name']!r}")
+        sources.add(source["name"])
+        unknown = set(source) - {"name", "interarrival", "routing"}
+        if unknown:
+            _fail(path, f"unknown keys {', '.join(sorted(unknown))}")
+        _check_distribution(f"{path}.interarrival", source.get("interarrival"))
+        _check_routing(f"{path}.routing", source.get("routing"), names, total=True)
+    for i, station in enumerate(spec["stations"]):
+        path = f"stations[{i}]"
+        unknown = set(station) - {"name", "servers", "capacity", "service", "routing"}
+        if unknown:
+            _fail(path, f"unknown keys {', '.join(sorted(unknown))}")
+        servers = station.get("servers", 1)
+        if isinstance(servers, bool) or not isinstance(servers, int) or servers < 1:
+            _fail(f"{path}.servers", "expected a positive integer")
+        if "capacity" in station:
+            _check_number(f"{path}.capacity", station["capacity"])
+        _check_distribution(f"{path}.service", station.get("service"))
+        _check_routing(f"{path}.routing", station.get("routing", {}), names, total=False)
+
+
+def _sampler(spec: Mapping[str, Any], stream: Stream) -> Callable[[], float]:
+    """Function drawing variates of a distribution from a stream."""
+    name = spec["dist"]
+    if name == "exponential":
+        rate = spec["rate"] if "rate" in spec else 1 / spec["mean"]
+        return lambda: stream.expovariate(rate)
+    if name == "constant":
+        value = spec["value"]
+        return lambda: value
+    if name == "uniform":
+        low, high = spec["low"], spec["high"]
+        return lambda: stream.uniform(low, high)
+    if name == "triangular":
+        low, high = spec["low"], spec["high"]
+        mode = spec.get("mode", (low + high) / 2)
+        return lambda: stream.triangular(low, high, mode)
+    mean, std = spec["mean"], spec["std"]
+    return lambda: max(stream.gauss(mean, std), 0.0)
+
+
+def _router(routing: Mapping[str, float], stream: Stream) -> Callable[[], str | None]:
+    """Function drawing the next station from precomputed cumulative probabilities."""
+    targets = list(routing)
+    if len(targets) == 1 and routing[targets[0]] >= 1 - 1e-9:
+        target = targets[0]
+        return lambda: target
+    if not targets:
+        return lambda: None
+    cumulative = list(accumulate(routing.values()))
+    targets.append(None)
+    return lambda: targets[bisect_right(cumulative, stream.random())]
+
+
+class _CompiledStation:
+    """State and event handlers of a station."""
+
+    def __init__(self, sim: Simulator, spec: Mapping[str, Any], streams: Streams):
+        name = spec["name"]
+        self._sim = sim
+        self.servers = spec.get("servers", 1)
+        self.capacity = spec.get("capacity", float("inf"))
+        self.service = _sampler(spec["service"], streams[f"{name}.service"])
+        self.route = _router(spec.get("routing", {}), streams[f"{name}.routing"])
+        self.tally = _Tally(sim, self.servers)
+        self.busy = 0
+        self.queue: deque = deque()
+        self.rejected = 0
+        self.next: dict[str, "_CompiledStation"] = {}
+
+    def enter(self, customer: Any):
+        if self.busy < self.servers:
+            self.busy += 1
+            self.tally.arrive()
+            self._sim.call_later(self.service(), self.finish, customer)
+        elif len(self.queue) < self.capacity:
+            self.tally.arrive()
+            self.queue.append(customer)
+        else:
+            self.rejected += 1
+
+    def finish(self, customer: Any):
+        self.tally.depart()
+        if self.queue:
+            self._sim.call_later(self.service(), self.finish, self.queue.popleft())
+        else:
+            self.busy -= 1
+        target = self.route()
+        if target is not None:
+            self.next[target].enter(customer)
+
+
+def _arrivals(
+    sim: Simulator,
+    interarrival: Callable[[], float],
+    route: Callable[[], str | None],
+    stations: dict[str, _CompiledStation],
+) -> Callable[[int], None]:
+    """Event handler of the arrivals of a source, which schedules the next one."""
+
+    def arrival(customer: int):
+        sim.call_later(interarrival(), arrival, customer + 1)
+        stations[route()].enter(customer)
+
+    return arrival
+
+
+class CompiledModel:
+    """A validated model specification, ready to be built on simulators.
+
+    Calling it with a simulator and a seed builds the model, as a model factory of
+    `pydes.experiment`, and returns the function that computes its outputs.
+
+    Args:
+        spec: the specification, as loaded from JSON or YAML.
+    """
+
+    def __init__(self, spec: Mapping[str, Any]):
+        validate(spec)
+        self.spec = spec
+
+    def __call__(self, sim: Simulator, seed: int | None = None) -> Callable[[], dict[str, float]]:
+        streams = Streams(seed)
+        stations = {s["name"]: _CompiledStation(sim, s, streams) for s in self.spec["stations"]}
+        for station in stations.values():
+            station.next = stations
+
+        for source in self.spec["sources"]:
+            name = source["name"]
+            interarrival = _sampler(source["interarrival"], streams[f"{name}.arrivals"])
+            route = _router(source["routing"], streams[f"{name}.routing"])
+            sim.call_later(interarrival(), _arrivals(sim, interarrival, route, stations), 0)
+
+        def reset_statistics():
+            for station in stations.values():
+                station.tally.reset()
+                station.rejected = 0
+
+        sim.on_reset_statistics(reset_statistics)
+        if self.spec.get("warmup"):
+            sim.call_at(self.spec["warmup"], sim.reset_statistics)
+
+        def outputs() -> dict[str, float]:
+            result = {}
+            for name, station in stations.items():
+                for measure, value in station.tally.outputs().items():
+                    result[f"{name}.{measure}"] = value
+                result[f"{name}.rejected"] = station.rejected
+            return result
+
+        return outputs
+
+    def network(self) -> Network:
+        """Get the equivalent `pydes.network.Network`.
+
+        Raises:
+            ValueError: if a delay is not exponential or a station has a capacity.
+        """
+
+        def rate(path: str, dist: Mapping[str, Any]) -> float:
+            if dist["dist"] != "exponential":
+                _fail(path, "only exponential delays can be converted into a Network")
+            return dist["rate"] if "rate" in dist else 1 / dist["mean"]
+
+        sources = []
+        for s in self.spec["sources"]:
+            arrival_rate = rate(f"{s['name']}.interarrival", s["interarrival"])
+            sources.append(Source(s["name"], arrival_rate, dict(s["routing"])))
+        stations = []
+        for s in self.spec["stations"]:
+            if "capacity" in s:
+                _fail(s["name"], "stations with a capacity cannot be converted into a Network")
+            service_rate = rate(f"{s['name']}.service", s["service"])
+            stations.append(
+                Station(s["name"], service_rate, s.get("servers", 1), dict(s.get("routing", {})))
+            )
+        return Network(sources, stations)
+
+
+def compile_spec(spec: Mapping[str, Any]) -> CompiledModel:
+    """Validate and compile a model specification.
+
+    Args:
+        spec: the specification, as loaded from JSON or YAML.
+
+    Returns:
+        the `CompiledModel`.
+    """
+    return CompiledModel(spec)
+
+
+def load(path: str | os.PathLike) -> CompiledModel:
+    """Load, validate and compile a model specification from a JSON or YAML file.
+
+    Args:
+        path: Path of a `.json`, `.yaml` or `.yml` file.
+
+    Returns:
+        the `CompiledModel`.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "YAML specifications require PyYAML, install it with `pip install pyyaml`"
+            ) from e
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    return compile_spec(spec)
@@ -0,0 +1,166 @@
+"""
+This is the pydes.tracing module.
+
+It exports the activity of the processes of a `Simulator` as a trace in the Chrome Trace
+Event format, which can be opened with `chrome://tracing` or https://ui.perfetto.dev.
+
+```python
+from pydes.tracing import ChromeTracer
+
+with ChromeTracer(sim, "trace.json"):
+    sim.run(until=100)
+```
+
+The trace has two timelines, shown as two processes with one thread per pydes process:
+
+- **wall clock**: a slice for every activation of a process, with the real time it took to
+  run until it blocked again.
+- **simulation time**: a slice for every period a process spent blocked, named after the
+  reason (`sleep`, `wait_for`, or the component method such as `Resource.request`), and
+  instant events for the start and the end of every process.
+
+Events are streamed to the file while the simulation runs. Simulation times are written in
+seconds: one unit of numeric time is one second, datetime simulations use their real
+durations. Use `time_scale` to change it.
+"""
+
+import json
+import os
+from datetime import datetime
+from time import perf_counter
+from typing import Any, TextIO
+
+from greenlet import greenlet
+
+from pydes import core
+from pydes.core import Simulator
+
+_WALL = 1
+_SIM = 2
+_BLOCKING = ("sleep", "sleep_until", "wait_for")
+
+
+def _blocking_reason(process: greenlet) -> str:
+    """Find why a suspended process blocked by walking up its frames.
+
+    The outermost blocking call of the simulator (`sleep`, `wait_for`, ...) is the reason,
+    unless it was made by a pydes component, in which case the component method is used.
+    """
+    frame = process.gr_frame
+    reason = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == core.__file__:
+            if code.co_name in _BLOCKING:
+                reason = code.co_name
+            elif code.co_name == "main" and reason is None:
+                return "exit"
+        elif reason is not None:
+            if frame.f_globals.get("__name__", "").startswith("pydes."):
+                reason = getattr(code, "co_qualname", code.co_name)
+            break
+        frame = frame.f_back
+    return reason or "wait"
+
+
+class ChromeTracer:
+    """Streams trace events of a simulator to a file in Chrome Trace Event format.
+
+    Tracing starts when the tracer is created and stops on `close`, or at the end of a
+    `with` block. While a tracer is attached, the simulator runs its instrumented loop.
+
+    Args:
+        sim: The simulator instance.
+        path: Path of the JSON file to write.
+        time_scale: Seconds per unit of numeric simulation time, default is 1.
+    """
+
+    def __init__(self, sim: Simulator, path: str | os.PathLike, time_scale: float = 1.0):
+        if sim._tracer is not None:
+            raise RuntimeError("the simulator is already being traced")
+        self._sim = sim
+        self._time_scale = time_scale
+        self._file: TextIO = open(path, "w")
+        self._first = True
+        self._threads = 0
+        self._origin = perf_counter()
+        self._file.write("[\n")
+        self._metadata(_WALL, 0, "process_name", "wall clock")
+        self._metadata(_SIM, 0, "process_name", "simulation time")
+        sim._tracer = self
+
+    def __enter__(self) -> "ChromeTracer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop tracing and finish the file."""
+        if self._file.closed:
+            return
+        self._sim._tracer = None
+        self._file.write("\n]\n")
+        self._file.close()
+
+    def _write(self, event: dict[str, Any]):
+        if not self._first:
+            self._file.write(",\n")
+        self._first = False
+        self._file.write(json.dumps(event, default=str))
+
+    def _metadata(self, pid: int, tid: int, name: str, value: str):
+        self._write({"ph": "M", "pid": pid, "tid": tid, "name": name, "args": {"name": value}})
+
+    def _sim_ts(self) -> float:
+        """Current simulation time in microseconds since the initial time."""
+        elapsed = self._sim.now() - self._sim._init_time
+        if isinstance(self._sim.now(), datetime):
+            return elapsed.total_seconds() * 1e6
+        return elapsed * self._time_scale * 1e6
+
+    def _thread(self, process: greenlet) -> int:
+        """Thread id of a process, registering its name on first sight."""
+        tid = getattr(process, "trace_tid", None)
+        if tid is None:
+            self._threads += 1
+            tid = process.trace_tid = self._threads
+            name = getattr(process, "name", "main")
+            self._metadata(_WALL, tid, "thread_name", name)
+            self._metadata(_SIM, tid, "thread_name", name)
+        return tid
+
+    def resume(self, process: greenlet):
+        """Called by the simulator right before switching into a process."""
+        tid = self._thread(process)
+        ts = self._sim_ts()
+        blocked = getattr(process, "trace_blocked", None)
+        if blocked is None:
+            self._write({"ph": "i", "s": "t", "pid": _SIM, "tid": tid, "ts": ts, "name": "start"})
+        else:
+            since, reason = blocked
+            self._write(
+                {"ph": "X", "pid": _SIM, "tid": tid, "ts": since, "dur": ts - since, "name": reason}
+            )
+
+    def block(self, process: greenlet, start: float, elapsed: float):
+        """Called by the simulator when a process switches back to it."""
+        tid = self._thread(process)
+        reason = _blocking_reason(process)
+        ts = self._sim_ts()
+        self._write(
+            {
+                "ph": "X",
+                "pid": _WALL,
+                "tid": tid,
+                "ts": (start - self._origin) * 1e6,
+                "dur": elapsed * 1e6,
+                "name": getattr(process, "name", "main"),
+                "args": {"sim_time": self._sim.now(), "blocked_on": reason},
+            }
+        )
+        if reason == "exit":
+            self._write({"ph": "i", "s": "t", "pid": _SIM, "tid": tid, "ts": ts, "name": "end"})
+            process.trace_blocked = None
+        else:
+            process.trace_blocked = (ts, reason)
@@ -0,0 +1,380 @@
+"""
+This is the pydes.transport module.
+
+It has material handling components whose movements are computed analytically from
+lengths, speeds and spacings. A load on a conveyor or a vehicle does not move in small
+steps: the simulator only gets an event when a load reaches the end of a conveyor, when an
+entry becomes free and when a vehicle arrives at its destination.
+
+```python
+from pydes import Simulator
+from pydes.transport import Conveyor, Transporter
+
+sim = Simulator()
+belt = Conveyor(sim, length=20, speed=0.5, spacing=1.0)
+forklifts = Transporter(
+    sim,
+    distances={("dock", "rack"): 120, ("rack", "shipping"): 80, ("dock", "shipping"): 150},
+    speed=2.0,
+    vehicles=3,
+    home="dock",
+)
+
+def packer():
+    while True:
+        box = belt.get()  # waits until a box reaches the end of the belt
+        forklifts.transport("rack", "shipping")  # waits for a forklift and the trip
+```
+
+With datetime simulation times, speeds are expressed per second.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from math import inf
+from typing import Any, Hashable
+
+from pydes.components import Component
+from pydes.core import EventHandle, Simulator
+
+
+def _seconds(sim: Simulator, t: int | float | datetime) -> float:
+    """Numeric value of a simulation time, seconds since the initial time for datetimes."""
+    if isinstance(t, datetime):
+        return (t - sim._init_time).total_seconds()
+    return t
+
+
+def _time(sim: Simulator, seconds: float) -> int | float | datetime:
+    """Inverse of `_seconds`."""
+    if isinstance(sim._init_time, datetime):
+        return sim._init_time + timedelta(seconds=seconds)
+    return seconds
+
+
+class Conveyor(Component):
+    """A conveyor that carries items from its entry to its exit.
+
+    Items are put at the entry, keeping a minimum `spacing` with the previous item, and move
+    at `speed` until they reach the exit, where they wait until they are taken with `get`.
+
+    On an accumulating conveyor an item waiting at the exit only stops the items that reach
+    it: they queue behind it, `spacing` apart, while the ones further back keep moving. On a
+    non accumulating conveyor the whole belt stops until the item at the exit is taken. In
+    both cases the entry is blocked while the items there have not moved `spacing` away.
+
+    The position of every item follows from the entry and exit times, so the conveyor only
+    schedules the arrival of the first item at the exit, and `put` sleeps until the time
+    the entry becomes free.
+
+    Args:
+        sim: The simulator instance.
+        length: Distance between the entry and the exit.
+        speed: Distance per time unit.
+        spacing: Minimum distance between two items, it cannot exceed the length.
+        accumulating: Whether items queue at the exit while the belt keeps moving, default
+            is True.
+
+    Methods:
+        put: puts an item at the entry, waiting until there is room.
+        get: takes the item at the exit, waiting until one arrives.
+    """
+
+    def __init__(
+        self,
+        sim: Simulator,
+        length: float,
+        speed: float,
+        spacing: float,
+        accumulating: bool = True,
+    ):
+        if length <= 0 or speed <= 0:
+            raise ValueError("length and speed of a conveyor must be positive")
+        if not 0 < spacing <= length:
+            raise ValueError("spacing of a conveyor must be positive and at most its length")
+        self._sim = sim
+        self._length = length
+        self._speed = speed
+        self._spacing = spacing
+        self._accumulating = accumulating
+        sim._register(self)
+        self.reset()
+
+    def reset(self):
+        # (item, entry time) on accumulating conveyors, (item, belt distance at the entry)
+        # on non accumulating ones
+        self._items: deque[tuple[Any, float]] = deque()
+        self._ready = False
+        self._arrival: EventHandle | None = None
+        self._removed = -inf
+        self._removals = 0
+        self._distance = 0.0
+        self._since = _seconds(self._sim, self._sim.now())
+        self._running = True
+
+    def put(self, item: Any):
+        """Put an item at the entry of the conveyor.
+
+        Waits until the previous item moved `spacing` away from the entry.
+
+        Args:
+            item: The item to put on the conveyor.
+        """
+        while True:
+            now = _seconds(self._sim, self._sim.now())
+            at = self._entry_time(now)
+            if at <= now:
+                break
+            if at == inf:
+                removals = self._removals
+                self._sim.wait_for(lambda: self._removals != removals)
+            else:
+                self._sim.sleep_until(_time(self._sim, at))
+        if self._accumulating:
+            self._items.append((item, now))
+        else:
+            self._items.append((item, self._belt(now)))
+        if len(self._items) == 1:
+            self._schedule_arrival(now)
+
+    def get(self) -> Any:
+        """Take the item at the exit of the conveyor.
+
+        Waits until an item reaches the exit.
+
+        Returns:
+            the item.
+        """
+        self._sim.wait_for(lambda: self._ready)
+        now = _seconds(self._sim, self._sim.now())
+        item, _ = self._items.popleft()
+        self._ready = False
+        self._removed = now
+        self._removals += 1
+        if not self._accumulating:
+            self._since = now
+            self._running = True
+        if self._items:
+            self._schedule_arrival(now)
+        return item
+
+    def size(self) -> int:
+        """Get the number of items on the conveyor, including the one at the exit."""
+        return len(self._items)
+
+    def capacity(self) -> int:
+        """Get the maximum number of items on the conveyor."""
+        return int(self._length // self._spacing) + 1
+
+    def travel_time(self) -> float:
+        """Get the time an item needs to go from the entry to the exit without stopping."""
+        return self._length / self._speed
+
+    def _belt(self, now: float) -> float:
+        """Distance travelled by a non accumulating belt since the start."""
+        if not self._running:
+            return self._distance
+        return self._distance + self._speed * (now - self._since)
+
+    def _reach(self, index: int, x: float) -> float:
+        """Earliest time the item at `index` reaches the position `x` of an accumulating
+        conveyor, if the items ahead of it are not taken.
+
+        An item can be at `x` only when the item ahead of it is at `x + spacing` or it was
+        taken, and everything moves at the same speed. So it reaches `x` at its free travel
+        time or when the item ahead reaches `x + spacing`, whichever is later.
+        """
+        length, spacing, speed = self._length, self._spacing, self._speed
+        time = -inf
+        while x <= length - spacing:
+            time = max(time, self._items[index][1] + x / speed)
+            if index == 0:
+                return time
+            index, x = index - 1, x + spacing
+        if index > 0:
+            return inf
+        # the first item is free to move past length - spacing once the previous one is taken
+        start = max(self._items[0][1] + (length - spacing) / speed, self._removed)
+        return max(time, start + (x - length + spacing) / speed)
+
+    def _entry_time(self, now: float) -> float:
+        """Time at which the last item is `spacing` away from the entry."""
+        if not self._items:
+            return now
+        if self._accumulating:
+            return max(self._reach(len(self._items) - 1, self._spacing), now)
+        distance = self._items[-1][1] + self._spacing
+        belt = self._belt(now)
+        if belt >= distance:
+            return now
+        if not self._running or distance > self._items[0][1] + self._length:
+            return inf
+        return now + (distance - belt) / self._speed
+
+    def _schedule_arrival(self, now: float):
+        """Schedule the arrival of the first item at the exit."""
+        if self._accumulating:
+            at = self._reach(0, self._length)
+        else:
+            at = now + (self._items[0][1] + self._length - self._belt(now)) / self._speed
+        self._arrival = self._sim.call_at(_time(self._sim, max(at, now)), self._arrive)
+
+    def _arrive(self):
+        """Event handler of the arrival of the first item at the exit."""
+        self._arrival = None
+        self._ready = True
+        if not self._accumulating:
+            now = _seconds(self._sim, self._sim.now())
+            self._distance = self._items[0][1] + self._length
+            self._since = now
+            self._running = False
+
+
+@dataclass
+class Vehicle:
+    """A vehicle of a `Transporter`.
+
+    Args:
+        name (int): number of the vehicle.
+        location (Hashable): where the vehicle is, or its destination while it travels.
+        busy (bool): whether the vehicle is carrying out a transport.
+        trips (int): number of transports carried out.
+        distance (float): total distance travelled.
+    """
+
+    name: int
+    location: Hashable
+    busy: bool = False
+    trips: int = 0
+    distance: float = 0.0
+
+
+class Transporter(Component):
+    """A fleet of vehicles that carry loads between locations.
+
+    A transport takes the nearest idle vehicle, which travels empty to the origin, loads,
+    travels to the destination and unloads. The trip time is computed from the distances
+    and the speed, so the process requesting the transport sleeps once until the vehicle
+    reaches the destination. When every vehicle is busy, requests wait in order of arrival
+    and get the vehicles as they are released.
+
+    Args:
+        sim: The simulator instance.
+        distances: Distance between locations, by `(origin, destination)` pair. The
+            distance of a missing pair is the one of the reverse pair.
+        speed: Distance per time unit of the vehicles.
+        vehicles: Number of vehicles, default is 1.
+        home: Initial location of the vehicles.
+        handling_time: Time to load and to unload, default is 0.
+
+    Methods:
+        transport: carries a load between two locations, waiting for a vehicle.
+        travel_time: returns the time to travel between two locations.
+    """
+
+    def __init__(
+        self,
+        sim: Simulator,
+        distances: dict[tuple[Hashable, Hashable], float],
+        speed: float,
+        vehicles: int = 1,
+        home: Hashable = None,
+        handling_time: float = 0.0,
+    ):
+        if speed <= 0:
+            raise ValueError("speed of a transporter must be positive")
+        if vehicles < 1:
+            raise ValueError("a transporter needs at least one vehicle")
+        if any(d < 0 for d in distances.values()):
+            raise ValueError("distances cannot be negative")
+        self._sim = sim
+        self._distances = dict(distances)
+        self._speed = speed
+        self._count = vehicles
+        self._home = home
+        self._handling_time = handling_time
+        sim._register(self)
+        self.reset()
+
+    def reset(self):
+        self.vehicles = [Vehicle(i, self._home) for i in range(self._count)]
+        self._requests: deque[list] = deque()
+
+    def distance(self, origin: Hashable, destination: Hashable) -> float:
+        """Get the distance between two locations."""
+        if origin == destination:
+            return 0.0
+        if (origin, destination) in self._distances:
+            return self._distances[origin, destination]
+        if (destination, origin) in self._distances:
+            return self._distances[destination, origin]
+        raise KeyError(f"no distance between {origin!r} and {destination!r}")
+
+    def travel_time(self, origin: Hashable, destination: Hashable) -> float:
+        """Get the time a vehicle needs to travel between two locations."""
+        return self.distance(origin, destination) / self._speed
+
+    def idle(self) -> int:
+        """Get the number of idle vehicles."""
+        return sum(not v.busy for v in self.vehicles)
+
+    def transport(self, origin: Hashable, destination: Hashable) -> Vehicle:
+        """Carry a load from `origin` to `destination`.
+
+        Waits until a vehicle is assigned and it reaches the destination, where the vehicle
+        is released.
+
+        Args:
+            origin: Where the load is picked up.
+            destination: Where the load is dropped off.
+
+        Returns:
+            the `Vehicle` that carried the load.
+        """
+        self.distance(origin, destination)  # fail before waiting for an unknown pair
+        idle = [v for v in self.vehicles if not v.busy]
+        if idle and not self._requests:
+            vehicle = min(idle, key=lambda v: self.distance(v.location, origin))
+        else:
+            request = [origin, None]
+            self._requests.append(request)
+            try:
+                self._sim.wait_for(lambda: request[1] is not None)
+            except BaseException:
+                # interrupted while waiting, give back the vehicle or leave the line
+                if request[1] is not None:
+                    self._release(request[1])
+                else:
+                    self._requests.remove(request)
+                raise
+            vehicle = request[1]
+        vehicle.busy = True
+        empty = self.distance(vehicle.location, origin)
+        loaded = self.distance(origin, destination)
+        vehicle.location = destination
+        duration = (empty + loaded) / self._speed + 2 * self._handling_time
+        if isinstance(self._sim.now(), datetime):
+            duration = timedelta(seconds=duration)
+        arrival = self._sim._add_to_time(self._sim.now(), duration)
+        try:
+            self._sim.sleep(duration)
+        except BaseException:
+            # interrupted or cancelled, the vehicle completes the trip without the process
+            self._sim.call_at(arrival, self._arrive, vehicle, empty + loaded)
+            raise
+        self._arrive(vehicle, empty + loaded)
+        return vehicle
+
+    def _arrive(self, vehicle: Vehicle, distance: float):
+        vehicle.trips += 1
+        vehicle.distance += distance
+        self._release(vehicle)
+
+    def _release(self, vehicle: Vehicle):
+        """Give a vehicle to the first waiting request, or leave it idle."""
+        vehicle.busy = False
+        if self._requests:
+            request = self._requests.popleft()
+            vehicle.busy = True
+            request[1] = vehicle
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from pytest import fixture, raises
+
+from pydes import Simulator
+from pydes.aio import SimulatorEventLoop
+
+
+@fixture
+def sim():
+    return Simulator()
+
+
+def test_sleep(sim: Simulator):
+    loop = SimulatorEventLoop(sim)
+    times = []
+
+    async def client():
+        for _ in range(3):
+            await asyncio.sleep(1.5)
+            times.append(sim.now())
+        return "done"
+
+    task = loop.create_task(client())
+    sim.run(until=3600)
+    assert times == [1.5, 3.0, 4.5]
+    assert task.result() == "done"
+
+
+def test_processes_and_coroutines(sim: Simulator):
+    loop = SimulatorEventLoop(sim)
+    log = []
+
+    async def service(x):
+        await asyncio.sleep(3)
+        log.append(("service", sim.now()))
+        return x * 2
+
+    def process():
+        sim.sleep(2)
+        log.append(("process", sim.now()))
+        result = loop.wait(service(21))
+        log.append(("result", sim.now(), result))
+
+    async def ticker():
+        while True:
+            await asyncio.sleep(1)
+            log.append(("tick", sim.now()))
+
+    sim.schedule(process)
+    loop.create_task(ticker())
+    sim.run(until=6)
+    assert ("process", 2) in log
+    assert ("service", 5) in log
+    assert ("result", 5, 42) in log
+    assert [t for name, t, *_ in log if name == "tick"] == [1, 2, 3, 4, 5, 6]
+
+
+def test_timeouts_and_call_later(sim: Simulator):
+    loop = SimulatorEventLoop(sim)
+    calls = []
+
+    async def slow():
+        await asyncio.sleep(100)
+
+    async def main():
+        loop.call_later(5, lambda: calls.append(("later", sim.now())))
+        handle = loop.call_later(7, lambda: calls.append(("cancelled", sim.now())))
+        handle.cancel()
+        try:
+            await asyncio.wait_for(slow(), timeout=10)
+        except asyncio.TimeoutError:
+            calls.append(("timeout", sim.now()))
+
+    loop.create_task(main())
+    sim.run()
+    assert calls == [("later", 5), ("timeout", 10)]
+
+
+def test_wait_raises(sim: Simulator):
+    loop = SimulatorEventLoop(sim)
+    errors = []
+
+    async def fail():
+        await asyncio.sleep(1)
+        raise KeyError("x")
+
+    def process():
+        try:
+            loop.wait(fail())
+        except KeyError:
+            errors.append(sim.now())
+
+    sim.schedule(process)
+    sim.run()
+    assert errors == [1]
+
+
+def test_datetime():
+    start = datetime(2024, 1, 1)
+    sim = Simulator(init=start)
+    loop = SimulatorEventLoop(sim)
+    times = []
+
+    async def client():
+        await asyncio.sleep(0.25)
+        times.append(sim.now())
+        await asyncio.sleep(3600)
+        times.append(sim.now())
+
+    loop.create_task(client())
+    sim.run()
+    assert times == [start + timedelta(seconds=0.25), start + timedelta(seconds=3600.25)]
+
+
+def test_not_runnable_directly(sim: Simulator):
+    loop = SimulatorEventLoop(sim)
+    with raises(RuntimeError):
+        loop.run_forever()
+    loop.close()
+    assert loop.is_closed()
+    sim.run()
+
+
+def test_idle_loop_is_not_a_process():
+    sim = Simulator(trace=False, profile=True)
+    loop = SimulatorEventLoop(sim)
+    seen = []
+
+    async def client():
+        for _ in range(3):
+            await asyncio.sleep(10)
+
+    def process():
+        for _ in range(20):
+            sim.sleep(1)
+            seen.append(len(sim._processes()))
+
+    loop.create_task(client())
+    sim.schedule(process)
+    sim.run()
+    assert seen == [0] * 20  # no blocked process besides the running one
+    assert sim.now() == 30
+    assert sim.stats().condition_evaluations == 0
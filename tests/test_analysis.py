@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+from pytest import approx, fixture, importorskip
+
+np = importorskip("numpy")
+
+from pydes import Simulator, Component  # noqa: E402
+from pydes.analysis import StepFunction, mser, step_function, throughput, warmup_time  # noqa: E402
+
+
+@fixture
+def sim():
+    return Simulator(trace=False)
+
+
+def test_step_function(sim: Simulator):
+    for t, v in [(0, 0), (2, 3), (2, 1), (6, 2), (10, 0)]:
+        sim._now = t
+        sim.record("queue", v)
+
+    f = step_function(sim.records("queue"))
+    assert list(f.times) == [0, 2, 6, 10]
+    assert f(1) == 0
+    assert f(2) == 1
+    assert np.isnan(f(-1))
+    assert list(f(np.array([1, 5, 7, 12]))) == [0, 1, 2, 0]
+    assert f.integral(0, 10) == approx(4 * 1 + 4 * 2)
+    assert f.mean(0, 12) == approx(12 / 12)
+    assert f.durations(0, 12) == {0: 4.0, 1: 4.0, 2: 4.0}
+
+    grid, sampled = f.resample(-2, 12, 4)
+    assert list(grid) == [-2, 2, 6, 10]
+    assert np.isnan(sampled[0])
+    assert list(sampled[1:]) == [1, 2, 0]
+
+
+def test_step_function_objects():
+    f = StepFunction([0, 5, 8], ["idle", "busy", "idle"])
+    assert f(6) == "busy"
+    assert f.durations(0, 10) == {"idle": 7.0, "busy": 3.0}
+
+
+def test_step_function_datetime():
+    init = datetime(2024, 1, 1)
+    sim = Simulator(init=init, trace=False)
+
+    class A(Component):
+        def __init__(self, sim: Simulator):
+            self.sim = sim
+
+        def main(self):
+            for i in range(4):
+                self.sim.record("level", i)
+                self.sim.sleep(timedelta(minutes=1))
+
+    sim.schedule(A(sim).main)
+    sim.run()
+
+    f = step_function(sim.records("level"))
+    assert f.origin == init
+    assert f(init + timedelta(seconds=90)) == 1
+    assert f.mean(end=sim.now()) == approx(1.5)
+    grid, sampled = f.resample(init, sim.now(), timedelta(minutes=2))
+    assert grid[1] == np.datetime64(init + timedelta(minutes=2))
+    assert list(sampled) == [0, 2]
+
+
+def test_throughput(sim: Simulator):
+    for t in [0.5, 1, 1.5, 4, 9]:
+        sim._now = t
+        sim.record("departure", 1)
+
+    edges, rates = throughput(sim.records("departure"), width=5, start=0, end=10)
+    assert list(edges) == [0, 5, 10]
+    assert list(rates) == [4 / 5, 1 / 5]
+
+    edges, rates = throughput(sim.records("departure"), width=4, start=0, end=10)
+    assert list(edges) == [0, 4, 8, 10]
+    assert list(rates) == [3 / 4, 1 / 4, 1 / 2]
+
+    edges, rates = throughput(sim.records("departure"), width=4)
+    assert list(edges) == [0.5, 4.5, 8.5, 12.5]
+    assert list(rates) == [1.0, 0.0, 1 / 4]
+
+
+def test_throughput_half_open(sim: Simulator):
+    for t in [0, 5, 10]:
+        sim._now = t
+        sim.record("departure", 1)
+
+    edges, rates = throughput(sim.records("departure"), width=5, start=0, end=10)
+    assert list(rates) == [1 / 5, 1 / 5]
+
+
+def test_throughput_datetime():
+    init = datetime(2024, 1, 1)
+    sim = Simulator(init=init, trace=False)
+    for minutes in [0, 1, 2, 3]:
+        sim._now = init + timedelta(minutes=minutes)
+        sim.record("departure", 1)
+
+    end = init + timedelta(minutes=4)
+    edges, rates = throughput(sim.records("departure"), width=timedelta(minutes=2), end=end)
+    assert list(edges) == [np.datetime64(init + timedelta(minutes=m)) for m in [0, 2, 4]]
+    assert list(rates) == [2 / 120, 2 / 120]
+
+
+def test_empty_step_function():
+    f = step_function([])
+    assert len(f) == 0
+    assert np.isnan(f.mean())
+    assert f.integral() == 0.0
+    assert f.durations() == {}
+
+
+def test_mser():
+    rng = np.random.default_rng(1)
+    transient = np.linspace(50, 10, 200)
+    steady = 10 + rng.normal(0, 1, 2000)
+    d = mser(np.r_[transient, steady])
+    assert 150 <= d <= 260
+    assert d % 5 == 0
+    assert mser([1, 2, 3]) == 0
+
+
+def test_warmup_time(sim: Simulator):
+    for t, v in enumerate([100, 80, 60, 40, 20] * 2 + [10, 11, 9, 10, 10] * 40):
+        sim._now = t
+        sim.record("wait", v)
+    t = warmup_time(sim.records("wait"))
+    assert 5 <= t <= 15
+    assert warmup_time([]) is None
@@ -0,0 +1,47 @@
+from pytest import approx, importorskip, raises
+
+from pydes import Simulator
+from pydes.experiment import replicate
+from pydes.network import Network, Source, Station
+from pydes.random import Streams
+
+importorskip("numpy")
+
+from pydes.batch import simulate  # noqa: E402
+
+NETWORK = Network(
+    sources=[Source("arrivals", rate=1.0, routing={"a": 1.0})],
+    stations=[
+        Station("a", service_rate=2.0, routing={"b": 0.5, "a": 0.2}),
+        Station("b", service_rate=1.0, servers=2),
+    ],
+)
+
+
+def network_model(sim: Simulator, seed: int):
+    model = NETWORK.build(sim, Streams(seed))
+    sim.schedule(sim.reset_statistics, at=50)
+    return model.outputs
+
+
+def test_simulate():
+    result = simulate(NETWORK, replications=500, until=500, warmup=50, seed=1)
+    summary = result.summary()
+    assert result.values("a.wait").shape == (500,)
+    # with feedback, a receives 1 / 0.8 = 1.25 customers per time unit: M/M/1, rho = 0.625
+    assert summary["a.utilization"].mean == approx(0.625, rel=0.02)
+    assert summary["a.wait"].mean == approx(0.625 / (2.0 - 1.25), rel=0.05)
+    assert summary["a.throughput"].mean == approx(1.25, rel=0.02)
+    assert summary["b.utilization"].mean == approx(0.625 / 2, rel=0.02)
+
+
+def test_simulate_matches_greenlet_model():
+    batch = simulate(NETWORK, replications=200, until=500, warmup=50, seed=2).summary()
+    greenlet = replicate(network_model, n=20, seeds=2, workers=1, until=500).summary()
+    for name in ("a.L", "a.utilization", "b.L", "b.throughput"):
+        assert abs(batch[name].mean - greenlet[name].mean) < batch[name].half_width + greenlet[name].half_width
+
+
+def test_simulate_checks_warmup():
+    with raises(ValueError):
+        simulate(NETWORK, replications=2, until=10, warmup=10)
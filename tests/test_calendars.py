@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+from pytest import approx, raises
+
+from pydes import Resource, Simulator
+from pydes.calendars import Calendar, CapacitySchedule, PoissonArrivals
+
+
+def test_calendar():
+    c = Calendar([(0, 1), (8, 3), (20, 2)], period=24)
+    assert c.value_at(0) == 1
+    assert c.value_at(10) == 3
+    assert c.value_at(23.5) == 2
+    assert c.value_at(24 + 9) == 3
+    assert c.next_change(0) == 8
+    assert c.next_change(8) == 20
+    assert c.next_change(21) == 24
+    assert Calendar([(0, 1), (5, 2)]).next_change(6) is None
+    with raises(ValueError):
+        Calendar([(1, 1)])
+    with raises(ValueError):
+        Calendar([(0, 1), (5, 2)], period=5)
+
+
+def test_calendar_datetime():
+    start = datetime(2024, 1, 1)
+    c = Calendar([(timedelta(0), "night"), (timedelta(hours=8), "day")], period=timedelta(days=1), origin=start)
+    assert c.value_at(start + timedelta(days=2, hours=9)) == "day"
+    assert c.next_change(start + timedelta(hours=9)) == start + timedelta(days=1)
+
+
+def test_capacity_schedule():
+    sim = Simulator(trace=False)
+    resource = Resource(sim)
+    CapacitySchedule(sim, resource, Calendar([(0, 1), (8, 3), (20, 2)], period=24))
+    seen = []
+
+    def observer():
+        for t in [1, 9, 21, 25]:
+            sim.sleep_until(t)
+            seen.append(resource.capacity())
+
+    sim.schedule(observer)
+    sim.run(until=48)
+    assert seen == [1, 3, 2, 1]
+
+
+def test_poisson_arrivals():
+    for method in ["inversion", "thinning"]:
+        sim = Simulator(trace=False)
+        arrivals = []
+        rates = Calendar([(0, 0.0), (10, 50.0), (20, 0.0)], period=30)
+        PoissonArrivals(sim, rates, lambda: arrivals.append(sim.now()), random.Random(1), method)
+        sim.run(until=300)
+        assert all(10 <= t % 30 < 20 for t in arrivals)
+        assert len(arrivals) == approx(10 * 10 * 50, rel=0.1)
+
+
+def test_poisson_arrivals_datetime():
+    start = datetime(2024, 1, 1)
+    sim = Simulator(init=start, trace=False)
+    arrivals = []
+    PoissonArrivals(sim, 60.0, lambda: arrivals.append(sim.now()), random.Random(1),
+                    until=start + timedelta(hours=10))
+    sim.run()
+    assert len(arrivals) == approx(600, rel=0.15)
+    assert arrivals[-1] <= start + timedelta(hours=10)
+
+
+def test_calendar_fractional_offsets():
+    c = Calendar([(0, 1), (8.1, 2), (20.3, 3)], period=24)
+    assert c.next_change(44.3) == 48
+    assert c.value_at(44.3) == 3
+    t, values = 0, []
+    for _ in range(3 * 1000):
+        change = c.next_change(t)
+        assert change > t
+        t = change
+        values.append(c.value_at(t))
+    assert values == [2, 3, 1] * 1000
+
+
+def test_calendar_datetime_offsets():
+    start = datetime(2024, 1, 1)
+    shifts = [(timedelta(0), 1), (timedelta(hours=8, minutes=20), 3), (timedelta(hours=17, minutes=10), 2)]
+    c = Calendar(shifts, period=timedelta(days=1), origin=start)
+    assert c.next_change(datetime(2024, 1, 2, 17, 10)) == datetime(2024, 1, 3)
+    sim = Simulator(init=start, trace=False)
+    resource = Resource(sim)
+    CapacitySchedule(sim, resource, c)
+    seen = []
+
+    def observer():
+        for day in range(365):
+            sim.sleep_until(start + timedelta(days=day, hours=17, minutes=11))
+            seen.append(resource.capacity())
+
+    sim.schedule(observer)
+    sim.run(until=start + timedelta(days=365))
+    assert seen == [2] * 365
+
+
+def test_poisson_arrivals_fractional_offsets():
+    sim = Simulator(trace=False)
+    arrivals = []
+    rates = Calendar([(0, 0.0), (8.1, 1.0), (20.3, 0.0)], period=24)
+    PoissonArrivals(sim, rates, lambda: arrivals.append(sim.now()), random.Random(1))
+    sim.run(until=24 * 200)
+    assert all(8.1 <= t % 24 < 20.3 + 1e-9 for t in arrivals)
+    assert len(arrivals) == approx(200 * 12.2, rel=0.1)
@@ -1,6 +1,11 @@
-from pytest import fixture
+import random
+from datetime import datetime, timedelta
+
+from pytest import approx, fixture, raises
+from greenlet import greenlet
 from pydes import Simulator, State, Event, Store, Container, Queue, Resource
-from pydes.components import Component
+from pydes import Interrupt, PreemptiveResource
+from pydes.components import Component, Preempted
 
 
 @fixture
@@ -123,6 +128,88 @@ def test_container(sim: Simulator):
     assert c.level() == 5
 
 
+def test_container_flows(sim: Simulator):
+    tank = Container(sim, capacity=100)
+    log = []
+
+    def pumps():
+        tank.set_inflow(2.5)
+        tank.wait_full()
+        log.append(("full", sim.now(), tank.level()))
+        tank.set_outflow(4.0)
+        tank.wait_empty()
+        log.append(("empty", sim.now(), tank.level()))
+
+    def consumer():
+        tank.get(30)
+        log.append(("got", sim.now(), tank.level()))
+
+    tank.on_level(50, lambda: log.append(("half", sim.now(), tank.level())))
+    sim.schedule(pumps)
+    sim.schedule(consumer)
+    sim.run()
+    assert log == [
+        ("got", 12, 0),
+        ("half", 32, 50),
+        ("full", 52, 100),
+        ("empty", approx(52 + 100 / 1.5), 0),
+    ]
+
+
+def test_container_flow_limits(sim: Simulator):
+    tank = Container(sim, capacity=10)
+
+    def main():
+        tank.set_inflow(1)
+        sim.sleep(20)
+        assert tank.level() == 10
+        tank.set_outflow(3)
+        sim.sleep(1)
+        assert tank.level() == 8
+        tank.set_inflow(0)
+        tank.put(2)  # discrete amounts are added to the flows
+        tank.wait_level(1)
+        assert sim.now() == 24
+
+    sim.schedule(main)
+    sim.run()
+    assert sim.now() == 24
+    with raises(ValueError):
+        tank.set_inflow(-1)
+
+
+def test_container_late_watcher(sim: Simulator):
+    tank = Container(sim, capacity=100)
+    log = []
+
+    def main():
+        tank.set_inflow(1)
+        sim.sleep(10)
+        tank.wait_level(50)  # the flow has been running for 10 time units
+        log.append((sim.now(), tank.level()))
+        tank.wait_full()
+        log.append((sim.now(), tank.level()))
+
+    sim.schedule(main)
+    sim.run()
+    assert log == [(50, 50), (100, 100)]
+
+
+def test_container_datetime():
+    start = datetime(2024, 1, 1)
+    sim = Simulator(init=start, trace=False, profile=True)
+    tank = Container(sim, capacity=3600)
+
+    def main():
+        tank.set_inflow(0.5)  # per second
+        tank.wait_full()
+
+    sim.schedule(main)
+    sim.run()
+    assert sim.now() == start + timedelta(hours=2)
+    assert sim.stats().events == 1
+
+
 def test_queue(sim: Simulator):
     class A:
         def __init__(self, sim: Simulator, queue: Queue):
@@ -154,6 +241,51 @@ def test_queue(sim: Simulator):
     assert a.stored == "something"
 
 
+@fixture(params=Queue.DISCIPLINES)
+def discipline(request):
+    return request.param
+
+
+def test_queue_disciplines(sim: Simulator, discipline: str):
+    queue = Queue(sim, discipline=discipline, stream=random.Random(1))
+    priorities = [3, 1, 2, 1, 0]
+    for i, priority in enumerate(priorities):
+        queue.put(i, priority=priority)
+    order = [queue.get() for _ in priorities]
+    expected = {
+        "fifo": [0, 1, 2, 3, 4],
+        "lifo": [4, 3, 2, 1, 0],
+        "priority": [4, 1, 3, 2, 0],
+        "random": [1, 0, 4, 3, 2],
+    }
+    assert order == expected[discipline]
+    assert queue.size() == 0
+    with raises(ValueError):
+        Queue(sim, discipline="sjf")
+
+
+def test_queue_getters_priority(sim: Simulator):
+    queue = Queue(sim)
+    served = []
+
+    def getter(name, priority):
+        def main():
+            served.append((name, queue.get(priority=priority), sim.now()))
+
+        return main
+
+    def producer():
+        for i in range(3):
+            sim.sleep(1)
+            queue.put(i)
+
+    for name, priority in [("a", 2), ("b", 1), ("c", 2)]:
+        sim.schedule(getter(name, priority))
+    sim.schedule(producer)
+    sim.run()
+    assert served == [("b", 0, 1), ("a", 1, 2), ("c", 2, 3)]
+
+
 def test_resource(sim: Simulator):
     class A(Component):
         def __init__(self, sim: Simulator, resource: Resource):
@@ -182,3 +314,154 @@ def test_resource(sim: Simulator):
     sim.run()
     assert sim.now() == 10
     assert c.usage() == 1
+
+
+def test_resource_order(sim: Simulator):
+    resource = Resource(sim)
+    order = []
+    processes = {}
+
+    def user(name, arrival):
+        def main():
+            processes[name] = greenlet.getcurrent()
+            sim.sleep(arrival)
+            try:
+                resource.request(main)
+            except Interrupt:
+                order.append(f"{name} gave up")
+                return
+            order.append(name)
+            sim.sleep(10)
+            resource.release(main)
+
+        return main
+
+    for name, arrival in [("a", 0), ("b", 2), ("c", 1), ("d", 3)]:
+        sim.schedule(user(name, arrival))
+    sim.call_at(5, lambda: sim.interrupt(processes["b"]))
+    sim.run()
+    assert order == ["a", "b gave up", "c", "d"]
+    assert sim.now() == 30
+
+
+def test_preemptive_resource(sim: Simulator):
+    machine = PreemptiveResource(sim)
+    log = []
+
+    def job(name, arrival, duration, priority):
+        def main():
+            nonlocal duration
+            sim.sleep(arrival)
+            while duration > 0:
+                machine.request(main, priority=priority)
+                try:
+                    sim.sleep(duration)
+                    duration = 0
+                    machine.release(main)
+                    log.append((name, "done", sim.now()))
+                except Interrupt as interrupt:
+                    duration = interrupt.remaining
+                    assert isinstance(interrupt.cause, Preempted)
+                    log.append((name, "preempted", sim.now(), duration, interrupt.cause.usage_since))
+
+        return main
+
+    sim.schedule(job("low", 0, 10, priority=2))
+    sim.schedule(job("urgent", 4, 3, priority=0))
+    sim.schedule(job("normal", 5, 2, priority=1))
+    sim.schedule(job("later", 5, 1, priority=2))
+    sim.run()
+    assert log == [
+        ("low", "preempted", 4, 6, 0),
+        ("urgent", "done", 7),
+        ("normal", "done", 9),
+        ("low", "done", 15),
+        ("later", "done", 16),
+    ]
+    assert machine.usage() == 0
+
+
+def test_preemptive_resource_without_preemption(sim: Simulator):
+    machine = PreemptiveResource(sim, capacity=1)
+    order = []
+
+    def job(name, priority):
+        def main():
+            machine.request(main, priority=priority, preempt=False)
+            order.append((name, sim.now()))
+            sim.sleep(1)
+            machine.release(main)
+
+        return main
+
+    for name, priority in [("a", 3), ("b", 2), ("c", 1), ("d", 2)]:
+        sim.schedule(job(name, priority))
+    sim.run()
+    assert order == [("a", 0), ("c", 1), ("b", 2), ("d", 3)]
+    with raises(ValueError):
+        machine.release(object())
+
+
+def test_preemptive_resource_free_slot(sim: Simulator):
+    machine = PreemptiveResource(sim, capacity=2)
+    log = []
+
+    def job(name, duration, priority, preempt=True):
+        def main():
+            try:
+                machine.request(main, priority=priority, preempt=preempt)
+                log.append((name, sim.now()))
+                sim.sleep(duration)
+                machine.release(main)
+            except Interrupt:
+                log.append((name, "preempted", sim.now()))
+
+        return main
+
+    sim.schedule(job("x", 100, priority=5))
+    sim.schedule(job("a", 10, priority=5))
+    sim.schedule(job("b", 5, priority=1, preempt=False), at=1)
+    # arrives when "a" released its slot, before "b" resumes to take it
+    sim.schedule(job("d", 5, priority=3), at=10, priority=1)
+    sim.run()
+    assert log == [("x", 0), ("a", 0), ("b", 10), ("d", 15)]
+
+
+def test_preemptive_resource_handler_user(sim: Simulator):
+    machine = PreemptiveResource(sim)
+    log = []
+
+    def urgent():
+        machine.request(urgent, priority=0)
+        log.append(sim.now())
+        machine.release(urgent)
+
+    # a user without a process cannot be interrupted, the request waits instead
+    sim.call_at(0, machine.request, "handler", 5)
+    sim.call_at(10, machine.release, "handler")
+    sim.schedule(urgent, at=1)
+    sim.run()
+    assert log == [10]
+
+
+def test_queue_interrupted_getter(sim: Simulator):
+    queue = Queue(sim)
+    got = []
+
+    def getter(name):
+        def main():
+            try:
+                got.append((name, queue.get()))
+            except Interrupt:
+                got.append((name, "interrupted"))
+
+        return main
+
+    sim.schedule(getter("a"))
+    sim.schedule(getter("b"))
+    sim.run()
+    first = next(p for p in sim._processes())
+    sim.interrupt(first)
+    queue.put(1)
+    sim.run()
+    assert got == [("a", "interrupted"), ("b", 1)]
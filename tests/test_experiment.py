@@ -0,0 +1,186 @@
+import random
+from pytest import approx, raises
+
+from pydes import Simulator, Resource
+from pydes.experiment import (
+    ResultCache,
+    batch_means,
+    replicate_until,
+    grid,
+    latin_hypercube,
+    replicate,
+    spawn_seeds,
+    summarize,
+    sweep,
+    t_quantile,
+)
+
+
+def mm1(sim: Simulator, seed: int):
+    rng = random.Random(seed)
+    server = Resource(sim)
+    served = []
+
+    def customer():
+        server.request(served)
+        sim.sleep(rng.expovariate(1.5))
+        server.release(served)
+        served.append(sim.now())
+
+    def source():
+        while True:
+            sim.sleep(rng.expovariate(1.0))
+            sim.schedule(customer)
+
+    sim.schedule(source)
+    return lambda: {"served": len(served), "seed": seed}
+
+
+def test_t_quantile():
+    assert t_quantile(0.975, 1) == approx(12.7062, rel=1e-4)
+    assert t_quantile(0.975, 2) == approx(4.30265, rel=1e-4)
+    assert t_quantile(0.975, 5) == approx(2.57058, rel=1e-4)
+    assert t_quantile(0.95, 30) == approx(1.69726, rel=1e-4)
+
+
+def test_summarize():
+    s = summarize([1.0, 2.0, 3.0, 4.0])
+    assert s.mean == 2.5
+    assert s.half_width == approx(3.18245 * s.std / 2, rel=1e-4)
+    assert s.low < s.mean < s.high
+    with raises(ValueError):
+        summarize([])
+
+
+def test_spawn_seeds():
+    seeds = spawn_seeds(1, 10)
+    assert len(set(seeds)) == 10
+    assert spawn_seeds(1, 5, start=5) == seeds[5:]
+
+
+def test_replicate():
+    serial = replicate(mm1, n=8, seeds=3, workers=1, until=50)
+    parallel = replicate(mm1, n=8, seeds=3, workers=2, until=50)
+    assert serial.outputs == parallel.outputs
+    assert serial.values("seed") == spawn_seeds(3, 8)
+    summary = parallel.summary()
+    assert summary["served"].n == 8
+    assert summary["served"].mean > 0
+
+
+def test_replicate_explicit_seeds():
+    result = replicate(mm1, n=2, seeds=[1, 2], workers=1, until=10)
+    assert result.values("seed") == [1, 2]
+    with raises(ValueError):
+        replicate(mm1, n=3, seeds=[1, 2], workers=1)
+
+
+calls = []
+
+
+def delay(sim: Simulator, seed: int, base: float, extra: float = 0.0):
+    calls.append((base, seed))
+    rng = random.Random(seed)
+    finish = []
+
+    def main():
+        sim.sleep(base + extra * rng.random())
+        finish.append(sim.now())
+
+    sim.schedule(main)
+    return lambda: {"finish": finish[0]}
+
+
+def test_grid():
+    assert grid(a=[1, 2], b=["x", "y"]) == [
+        {"a": 1, "b": "x"},
+        {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"},
+        {"a": 2, "b": "y"},
+    ]
+
+
+def test_latin_hypercube():
+    design = latin_hypercube(10, {"a": (0, 1), "b": (10, 20)}, seed=1)
+    assert len(design) == 10
+    assert sorted(int(d["a"] * 10) for d in design) == list(range(10))
+    assert sorted(int(d["b"] - 10) for d in design) == list(range(10))
+    assert design == latin_hypercube(10, {"a": (0, 1), "b": (10, 20)}, seed=1)
+
+
+def test_sweep():
+    results = sweep(delay, grid(base=[1, 2], extra=[0, 1]), replications=3, seeds=1, workers=2)
+    assert [r.params for r in results] == grid(base=[1, 2], extra=[0, 1])
+    assert results[0].summary()["finish"].mean == 1
+    assert results[2].replications.values("finish") == [2, 2, 2]
+    assert results[1].replications.seeds == spawn_seeds(1, 3)
+
+
+def test_sweep_cache(tmp_path):
+    calls.clear()
+    first = sweep(delay, grid(base=[1, 2]), replications=2, seeds=1, workers=1, cache=tmp_path)
+    assert len(calls) == 4
+    assert len(ResultCache(tmp_path)) == 4
+
+    calls.clear()
+    second = sweep(delay, grid(base=[1, 2, 3]), replications=2, seeds=1, workers=1, cache=tmp_path)
+    assert calls == [(3, seed) for seed in spawn_seeds(1, 2)]
+    assert [r.replications.outputs for r in second[:2]] == [r.replications.outputs for r in first]
+
+    calls.clear()
+    sweep(delay, grid(base=[1]), replications=2, seeds=1, workers=1, cache=tmp_path, version="v2")
+    assert len(calls) == 2
+
+
+def noisy(sim: Simulator, seed: int):
+    rng = random.Random(seed)
+    return lambda: {"x": 10 + rng.gauss(0, 1), "constant": 1.0}
+
+
+def test_replicate_until():
+    result = replicate_until(noisy, precision=0.2, min_replications=5, batch=3, seed=1, workers=1)
+    assert len(result.outputs) == 5
+    assert result.seeds == spawn_seeds(1, 5)
+
+    result = replicate_until(noisy, precision=0.001, seed=1, workers=2, batch=4, max_replications=30)
+    assert len(result.outputs) == 30
+    assert result.summary()["x"].relative_half_width > 0.001
+
+    result = replicate_until(
+        noisy, precision=0.001, measures=["constant"], min_replications=2, seed=1, workers=1
+    )
+    assert len(result.outputs) == 2
+
+
+def test_batch_means():
+    sim = Simulator(trace=False)
+    rng = random.Random(1)
+
+    def main():
+        while True:
+            sim.record("x", 5 + rng.random())
+            sim.sleep(1)
+
+    sim.schedule(main)
+
+    def observe(start, end):
+        values = [r.value for r in sim.records("x", start, end)]
+        return sum(values) / len(values)
+
+    summary = batch_means(sim, observe, batch_length=50, precision=0.01)
+    assert summary.n == 10
+    assert summary.mean == approx(5.5, abs=0.05)
+    assert summary.relative_half_width <= 0.01
+
+
+def test_batch_means_finite_model():
+    sim = Simulator(trace=False)
+
+    def main():
+        for _ in range(35):
+            sim.record("x", 1)
+            sim.sleep(1)
+
+    sim.schedule(main)
+    summary = batch_means(sim, lambda start, end: 1.0, batch_length=10, precision=0.01)
+    assert summary.n == 3
@@ -33,3 +33,59 @@ def test_monitor_trace(capsys):
     assert rows[2] == fmt.format(*sep)
     assert rows[3] == fmt.format(*empty)
     assert rows[4] == fmt.format(*row)
+
+
+def test_monitor_query():
+    sim = Simulator(trace=False)
+
+    class A(Component):
+        def __init__(self, sim: Simulator):
+            self.sim = sim
+
+        def main(self):
+            for i in range(5):
+                self.sim.record(self.id, i)
+                self.sim.sleep(10)
+
+    a = A(sim)
+    b = A(sim)
+    sim.schedule(a.main)
+    sim.schedule(b.main, after=5)
+    sim.run()
+
+    assert len(sim.records()) == 10
+    assert [r.value for r in sim.records(a.id)] == [0, 1, 2, 3, 4]
+    assert [r.time for r in sim.records(start=10, end=25)] == [10, 15, 20]
+    assert [r.time for r in sim.records(b.id, start=10, end=25)] == [15]
+    assert sim.records("missing") == []
+    assert sim.names() == [a.id, b.id]
+    assert [r.time for r in sim.groupby()[b.id]] == [5, 15, 25, 35, 45]
+
+    sim.records(a.id).clear()
+    sim.groupby()[a.id].clear()
+    assert len(sim.records(a.id)) == 5
+
+
+def test_monitor_steps():
+    sim = Simulator(trace=False)
+    for t, v in [(0, "idle"), (2, "busy"), (2, "idle"), (5, "busy"), (7, "busy"), (9, "idle")]:
+        sim._now = t
+        sim.record("s", v)
+
+    assert sim.value_at("s", -1) is None
+    assert sim.value_at("s", -1, default="unknown") == "unknown"
+    assert sim.value_at("s", 2) == "idle"
+    assert sim.value_at("s", 6) == "busy"
+    assert sim.value_at("s", 100) == "idle"
+    assert sim.steps("s") == [(0, "idle"), (5, "busy"), (9, "idle")]
+    assert sim.steps("s", start=6, end=9) == [(6, "busy")]
+
+
+def test_monitor_steps_none_value():
+    sim = Simulator(trace=False)
+    for t, v in [(0, None), (4, 1)]:
+        sim._now = t
+        sim.record("s", v)
+
+    assert sim.value_at("s", 2, default="unknown") is None
+    assert sim.steps("s", start=2) == [(2, None), (4, 1)]
@@ -0,0 +1,44 @@
+from pytest import approx, raises
+
+from pydes import Simulator
+from pydes.network import Network, Source, Station
+from pydes.random import Streams
+
+
+def tandem() -> Network:
+    return Network(
+        sources=[Source("arrivals", rate=1.0, routing={"a": 1.0})],
+        stations=[
+            Station("a", service_rate=2.0, routing={"b": 0.5}),
+            Station("b", service_rate=1.0, servers=2),
+        ],
+    )
+
+
+def test_validate():
+    with raises(ValueError, match="unknown station"):
+        Network([Source("s", 1.0, {"x": 1.0})], [Station("a", 1.0)])
+    with raises(ValueError, match="add up to 1"):
+        Network([Source("s", 1.0, {"a": 0.5})], [Station("a", 1.0)])
+    with raises(ValueError, match="more than 1"):
+        Network([Source("s", 1.0, {"a": 1.0})], [Station("a", 1.0, routing={"a": 1.5})])
+    with raises(ValueError, match="unique"):
+        Network([Source("s", 1.0, {"a": 1.0})], [Station("a", 1.0), Station("a", 2.0)])
+    with raises(ValueError, match="server"):
+        Network([Source("s", 1.0, {"a": 1.0})], [Station("a", 1.0, servers=0)])
+    assert tandem().station("b").servers == 2
+
+
+def test_build():
+    sim = Simulator(trace=False)
+    model = tandem().build(sim, Streams(1))
+    sim.schedule(sim.reset_statistics, at=500)
+    sim.run(until=20_000)
+    outputs = model.outputs()
+    # station a is M/M/1 with rho = 0.5
+    assert outputs["a.utilization"] == approx(0.5, rel=0.05)
+    assert outputs["a.wait"] == approx(0.5, rel=0.1)
+    assert outputs["a.throughput"] == approx(1.0, rel=0.05)
+    # station b is M/M/2 with arrival rate 0.5
+    assert outputs["b.utilization"] == approx(0.25, rel=0.05)
+    assert outputs["b.L"] == approx(0.5 / 0.9375, rel=0.1)
@@ -0,0 +1,96 @@
+from pytest import fixture, raises
+
+from pydes import Resource, Simulator
+from pydes.parallel import ParallelSimulation, Ports
+
+
+def source(sim: Simulator, ports: Ports):
+    acks = []
+
+    def main():
+        for i in range(20):
+            sim.sleep(1)
+            ports.send("server", (i, sim.now()), delay=5 if i % 2 else 7)
+
+    def collect():
+        while True:
+            message = ports.receive_message()
+            acks.append((message.payload, message.time, sim.now()))
+
+    sim.schedule(main)
+    sim.schedule(collect)
+    return lambda: acks
+
+
+def server(sim: Simulator, ports: Ports):
+    machine = Resource(sim)
+    log = []
+
+    def job(i, sent):
+        def main():
+            arrival = sim.now()
+            machine.request(main)
+            sim.sleep(1.5)
+            machine.release(main)
+            log.append((i, sent, arrival, sim.now()))
+            ports.send("source", i)
+
+        return main
+
+    def main():
+        while True:
+            i, sent = ports.receive()
+            sim.schedule(job(i, sent))
+
+    sim.schedule(main)
+    return lambda: log
+
+
+def idle(sim: Simulator, ports: Ports):
+    sim.schedule(lambda: sim.sleep(3))
+
+
+MODEL = {"source": source, "server": server, "idle": idle}
+LINKS = {("source", "server"): 5, ("server", "source"): 2}
+
+
+@fixture(params=[False, True], ids=["local", "processes"])
+def processes(request):
+    return request.param
+
+
+def test_parallel(processes):
+    psim = ParallelSimulation(MODEL, LINKS, processes=processes)
+    results = psim.run(until=100)
+    log = results["server"]
+    assert [i for i, *_ in log] == [j for k in range(0, 20, 2) for j in (k + 1, k)]
+    for i, sent, arrival, _ in log:
+        assert arrival == sent + (5 if i % 2 else 7)
+    finish = {i: end for i, _, _, end in log}
+    acks = results["source"]
+    assert len(acks) == 20
+    for i, time, now in acks:
+        assert time == now == finish[i] + 2
+    assert results["idle"] is None
+    assert psim.messages == 40
+    assert psim.rounds > 1
+
+
+def test_parallel_until():
+    psim = ParallelSimulation(MODEL, LINKS, processes=False)
+    results = psim.run(until=10)
+    assert all(end <= 10 for *_, end in results["server"])
+    assert all(now <= 10 for *_, now in results["source"])
+
+
+def test_links_are_checked():
+    with raises(ValueError):
+        ParallelSimulation(MODEL, {("source", "nowhere"): 1})
+    with raises(ValueError):
+        ParallelSimulation(MODEL, {("source", "server"): 0})
+
+    def eager(sim: Simulator, ports: Ports):
+        sim.schedule(lambda: ports.send("server", None, delay=1))
+
+    with raises(ValueError, match="lookahead"):
+        ParallelSimulation({**MODEL, "source": eager}, LINKS, processes=False).run()
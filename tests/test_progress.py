@@ -0,0 +1,81 @@
+import io
+import json
+
+from pytest import approx, raises
+
+from pydes import Simulator
+from pydes.progress import ConsoleReporter, FileReporter, ProgressReporter
+
+
+def clock(sim: Simulator):
+    def main():
+        while True:
+            sim.sleep(1)
+
+    return main
+
+
+def test_progress_every_events():
+    sim = Simulator(trace=False)
+    sim.schedule(clock(sim))
+    reports = []
+    sim.run(until=100, progress=ProgressReporter(every_events=10, every_seconds=None, callback=reports.append))
+    assert [p.events for p in reports[:-1]] == list(range(10, 101, 10))
+    assert [p.now for p in reports[:3]] == [9, 19, 29]
+    last = reports[-1]
+    assert last.done
+    assert last.now == 100
+    assert last.conds == 0
+    assert last.times == 1
+    assert last.eta == approx(0.0)
+    assert last.events_per_second > 0
+    assert last.sim_rate > 0
+
+
+def test_progress_unbounded():
+    sim = Simulator(trace=False)
+    sim.schedule(lambda: sim.sleep(5))
+    reports = []
+    sim.run(progress=ProgressReporter(every_events=1, every_seconds=None, callback=reports.append))
+    assert all(p.eta is None for p in reports)
+    assert reports[-1].now == 5
+
+
+def test_progress_requires_interval():
+    with raises(ValueError):
+        ProgressReporter(every_events=None, every_seconds=None)
+
+
+def test_console_reporter():
+    sim = Simulator(trace=False)
+    sim.schedule(clock(sim))
+    out = io.StringIO()
+    sim.run(until=20, progress=ConsoleReporter(every_events=10, stream=out))
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith("t=9 events=10")
+    assert lines[-1].endswith("done")
+
+
+def test_file_reporter(tmp_path):
+    sim = Simulator(trace=False)
+    sim.schedule(clock(sim))
+    path = tmp_path / "progress.jsonl"
+    sim.run(until=50, progress=FileReporter(path, every_events=25))
+    reports = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["events"] for r in reports] == [25, 50, 51]
+    assert reports[-1]["done"]
+
+
+def test_progress_handlers():
+    sim = Simulator(trace=False)
+
+    def tick():
+        sim.call_later(1, tick)
+
+    sim.call_at(0, tick)
+    reports = []
+    sim.run(until=50, progress=ProgressReporter(every_events=10, every_seconds=None, callback=reports.append))
+    assert [p.events for p in reports[:-1]] == [10, 20, 30, 40, 50]
+    assert [p.now for p in reports[:2]] == [9, 19]
+    assert reports[-1].done
@@ -0,0 +1,44 @@
+from statistics import fmean
+from pytest import approx
+
+from pydes import Component
+from pydes.random import Stream, Streams
+
+
+def test_streams_are_reproducible():
+    a = Streams(seed=1)
+    b = Streams(seed=1)
+    xs = [a["arrivals"].expovariate(2.0) for _ in range(10)]
+    # creating and using other streams does not change the numbers of a stream
+    b["service"].random()
+    assert [b["arrivals"].expovariate(2.0) for _ in range(10)] == xs
+    assert Streams(seed=2)["arrivals"].expovariate(2.0) != xs[0]
+
+
+def test_streams_by_component():
+    streams = Streams(seed=1)
+    c = Component()
+    assert streams[c] is streams.stream(c.id)
+
+
+def test_antithetic():
+    streams = Streams(seed=1, block=16)
+    pair = streams.antithetic_pair()
+    assert pair.antithetic is True
+    us = [streams["x"].random() for _ in range(40)]
+    vs = [pair["x"].random() for _ in range(40)]
+    assert [u + v for u, v in zip(us, vs)] == approx([1.0] * 40)
+    zs = [streams["x"].gauss() for _ in range(5)]
+    ws = [pair["x"].gauss() for _ in range(5)]
+    assert [z + w for z, w in zip(zs, ws)] == approx([0.0] * 5)
+
+
+def test_distributions():
+    s = Stream(seed=3, name="x", block=1000)
+    assert fmean(s.expovariate(0.5) for _ in range(20000)) == approx(2.0, rel=0.05)
+    assert fmean(s.gauss(10, 2) for _ in range(20000)) == approx(10.0, rel=0.01)
+    assert fmean(s.uniform(2, 4) for _ in range(20000)) == approx(3.0, rel=0.01)
+    ints = {s.randint(5, 10) for _ in range(1000)}
+    assert ints == set(range(5, 11))
+    assert {s.choice("abc") for _ in range(100)} == set("abc")
+    assert all(1 <= s.triangular(1, 3, 2) <= 3 for _ in range(100))
@@ -1,6 +1,8 @@
-from pydes import Simulator
+import time
+
+from pydes import Interrupt, Simulator
 from datetime import datetime
-from pytest import fixture
+from pytest import fixture, raises, warns
 from greenlet import greenlet
 
 from pydes.components import Component
@@ -41,9 +43,10 @@ def test__schedule_with_gl_and_cond(sim: Simulator):
         return True
 
     sim._schedule(gl=gl, cond=cond)
-    gl_, cond_ = sim._conds.pop()
+    priority, seq, gl_, cond_ = sim._conds.pop()
     assert gl == gl_
     assert cond == cond_
+    assert (priority, seq) == (0, 0)
 
 
 def test__schedule_without_gl_but_with_cond(sim: Simulator):
@@ -55,7 +58,7 @@ def test__schedule_without_gl_but_with_cond(sim: Simulator):
     # if no gl is provided then we assign the current one
     # in this case, the current one is going to be main
     sim._schedule(cond=cond)
-    gl_, cond_ = sim._conds.pop()
+    *_, gl_, cond_ = sim._conds.pop()
     assert gl_ == gl
     assert cond == cond_
 
@@ -67,12 +70,60 @@ def test__schedule_with_gl_cond_and_time(sim: Simulator):
         return True
 
     sim._schedule(gl=gl, cond=cond, time=10)
-    gl_, cond_ = sim._conds.pop()
-    time_, ctime_ = sim._times.pop()
+    *_, gl_, cond_ = sim._conds.pop()
+    # the time only wakes the clock up, the condition resumes the process
+    assert sim._times.pop() == (10, 0, 0, None)
     assert gl == gl_
     assert cond == cond_
-    assert time_ == 10
-    assert ctime_ == 0
+
+
+def test__schedule_with_gl_and_time(sim: Simulator):
+    gl = greenlet(run=lambda: True)
+    sim._schedule(gl=gl, time=10, priority=-1)
+    assert sim._conds == []
+    assert sim._times.pop() == (10, -1, 0, gl)
+
+
+def test_priorities(sim: Simulator):
+    order = []
+
+    def process(name, priority):
+        def main():
+            sim.sleep(1, priority=priority)
+            order.append(name)
+
+        return main
+
+    def waiter():
+        sim.wait_for(lambda: "c" in order)
+        order.append("waiter")
+
+    sim.schedule(waiter)
+    for name, priority in [("a", 1), ("b", 0), ("c", 1)]:
+        sim.schedule(process(name, priority))
+    sim.call_at(1, order.append, "handler", priority=-1)
+    sim.schedule(lambda: order.append("first"), at=1, priority=-2)
+    sim.run()
+    # same time events in (priority, order) order, then the blocked processes
+    assert order == ["first", "handler", "b", "a", "c", "waiter"]
+
+
+def test_wait_for_priorities(sim: Simulator):
+    order = []
+    flag = []
+
+    def waiter(name, priority):
+        def main():
+            sim.wait_for(lambda: flag, priority=priority)
+            order.append(name)
+
+        return main
+
+    for name, priority in [("a", 0), ("b", 2), ("c", -1), ("d", 0)]:
+        sim.schedule(waiter(name, priority))
+    sim.schedule(lambda: flag.append(True), after=1)
+    sim.run()
+    assert order == ["c", "a", "d", "b"]
 
 
 def test_schedule_after(sim: Simulator):
@@ -186,3 +237,341 @@ def test_wait_for_until(sim: Simulator):
     assert b.flag.value is True
     assert a.time == 5
     assert b.time == 10
+
+
+def test_schedule_from_process(sim: Simulator):
+    log = []
+
+    def child():
+        sim.sleep(5)
+        log.append(("child", sim.now()))
+
+    def parent():
+        sim.schedule(child)
+        sim.sleep(1)
+        log.append(("parent", sim.now()))
+
+    sim.schedule(parent)
+    sim.run()
+    assert log == [("parent", 1), ("child", 5)]
+
+
+def test_warmup():
+    sim = Simulator(trace=False)
+    counter = {"n": 0}
+    sim.on_reset_statistics(lambda: counter.update(n=0))
+
+    def main():
+        while True:
+            sim.record("tick", sim.now())
+            counter["n"] += 1
+            sim.sleep(1)
+
+    sim.schedule(main)
+    sim.run(until=9, warmup=5)
+    assert [r.value for r in sim.records()] == [5, 6, 7, 8, 9]
+    assert counter["n"] == 5
+    assert sim.steps("tick")[0] == (5, 5)
+
+    sim.run(until=12)
+    sim.reset_statistics()
+    assert [r.value for r in sim.records("tick")] == [12]
+
+
+def test_interrupt(sim: Simulator):
+    log = []
+
+    def sleeper():
+        try:
+            sim.sleep(8)
+        except Interrupt as interrupt:
+            log.append(("sleeper", sim.now(), interrupt.cause, interrupt.remaining))
+        sim.sleep(1)
+        log.append(("sleeper", sim.now()))
+
+    def waiter():
+        try:
+            sim.wait_for(lambda: False)
+        except Interrupt as interrupt:
+            log.append(("waiter", sim.now(), interrupt.cause, interrupt.remaining))
+
+    sim.schedule(sleeper)
+    sim.schedule(waiter)
+    sim.run(until=0)
+    processes = {p.name: p for p in sim._processes()}
+    sim.call_at(5, sim.interrupt, processes["test_interrupt.<locals>.sleeper"], "breakdown")
+    sim.call_at(6, sim.interrupt, processes["test_interrupt.<locals>.waiter"])
+    sim.run()
+    assert log == [
+        ("sleeper", 5, "breakdown", 3),
+        ("sleeper", 6),
+        ("waiter", 6, None, None),
+    ]
+    # the interrupted sleep does not wake the process up again nor move the clock
+    assert sim.now() == 6
+    assert sim._conds == [] and sim._times == []
+
+
+def test_interrupt_errors(sim: Simulator):
+    def main():
+        with raises(RuntimeError):
+            sim.interrupt(greenlet.getcurrent())
+
+    sim.schedule(main)
+    sim.run()
+    with raises(RuntimeError):
+        sim.interrupt(greenlet(lambda: None))
+
+
+def test_process_handles(sim: Simulator):
+    from pydes import Resource
+
+    machine = Resource(sim)
+    cleaned = []
+
+    def job(i):
+        def main():
+            try:
+                machine.request(main)
+                sim.sleep(10)
+                machine.release(main)
+                return i
+            finally:
+                cleaned.append(i)
+
+        return main
+
+    jobs = [sim.schedule(job(i)) for i in range(100)]
+    late = sim.schedule(job(100), at=50)
+    joined = []
+
+    def supervisor():
+        sim.sleep(5)
+        assert sim.active_process() is supervisor_process
+        for j in jobs[1:]:
+            j.cancel()
+        late.cancel()
+        joined.append((jobs[0].join(), sim.now(), jobs[0].result()))
+        joined.append(jobs[1].join())
+
+    supervisor_process = sim.schedule(supervisor)
+    sim.run()
+    assert joined == [(True, 10, 0), True]
+    assert sim.now() == 10
+    assert sorted(cleaned) == list(range(100))
+    assert all(j.cancelled() and j.done() for j in jobs[1:] + [late])
+    assert not jobs[0].cancelled()
+    assert machine.usage() == 0 and not machine._requests
+    assert sim._conds == [] and sim._times == []
+    with raises(RuntimeError):
+        jobs[1].result()
+    with raises(RuntimeError):
+        jobs[0].interrupt()
+    assert sim.active_process() is None
+
+
+def test_process_interrupt_and_join_timeout(sim: Simulator):
+    log = []
+
+    def sleeper():
+        try:
+            sim.sleep(10)
+        except Interrupt as interrupt:
+            log.append((sim.now(), interrupt.cause, interrupt.remaining))
+
+    process = sim.schedule(sleeper)
+
+    def other():
+        log.append(process.join(timeout=2))
+        process.interrupt("wake up")
+        log.append(process.join())
+
+    sim.schedule(other)
+    sim.run()
+    assert log == [False, (2, "wake up", 8), True]
+
+
+def test_reset():
+    import gc
+    from pydes import Queue, Resource
+
+    sim = Simulator(trace=False)
+    resource = Resource(sim)
+    queue = Queue(sim)
+    cleaned = []
+
+    class A(Component):
+        def __init__(self):
+            self._sim = sim
+
+        def main(self):
+            try:
+                resource.request(self)
+                queue.put(1)
+                while True:
+                    sim.sleep(1)
+            finally:
+                cleaned.append(self.id)
+
+    def replication():
+        for _ in range(3):
+            sim.schedule(A().main)
+        sim.run(until=10)
+
+    replication()
+    assert resource.usage() == 1
+    assert len(sim._processes()) == 3
+    sim.reset()
+    gc.collect()
+    assert sorted(cleaned) == ["A.0", "A.1", "A.2"]
+    assert sim.now() == 0
+    assert sim._conds == [] and sim._times == []
+    assert resource.usage() == 0 and queue.size() == 0
+    assert next(sim._ctimes) == 0
+
+    cleaned.clear()
+    replication()
+    assert resource.usage() == 1 and queue.size() == 1
+    sim.reset()
+    assert sorted(cleaned) == ["A.0", "A.1", "A.2"]
+
+
+def test_component_names():
+    from pydes import Resource
+
+    first, second = Simulator(trace=False), Simulator(trace=False)
+    kept = Resource(first)
+    assert kept.id == "Resource.0" and Resource(second).id == "Resource.0"
+    second.reset()
+    other = Resource(first)
+    assert other.id == "Resource.1"
+    first.reset()
+    # the components kept by the model keep their numbers
+    assert kept.id == "Resource.0" and Resource(first).id == "Resource.2"
+
+
+def test_stats():
+    sim = Simulator(trace=False, profile=True)
+
+    class A(Component):
+        def __init__(self, sim: Simulator):
+            self.sim = sim
+
+        def main(self):
+            for _ in range(5):
+                self.sim.sleep(1)
+
+    a = A(sim)
+    sim.schedule(a.main)
+    sim.schedule(lambda: sim.wait_for(lambda: sim.now() >= 3))
+    sim.run()
+    stats = sim.stats()
+    assert stats.events == 5
+    assert stats.switches == 6 + 2
+    assert stats.process_switches[a.id] == 6
+    # only the process blocked in wait_for evaluates its condition, the sleeps are events
+    assert 0 < stats.condition_evaluations < stats.switches
+    assert stats.max_conds == 1
+    assert stats.wall_time >= sum(stats.process_time.values()) > 0
+
+    sim.reset()
+    assert sim.stats().switches == 0
+
+    with raises(RuntimeError):
+        Simulator().stats()
+
+
+def test_realtime(sim: Simulator):
+    times = []
+
+    def main():
+        for _ in range(5):
+            sim.sleep(1)
+            times.append((sim.now(), time.monotonic()))
+
+    sim.schedule(main)
+    start = time.monotonic()
+    sim.run(realtime_factor=50)
+    assert [t for t, _ in times] == [1, 2, 3, 4, 5]
+    for t, wall in times:
+        assert wall - start >= t / 50
+    assert time.monotonic() - start < 0.3
+    assert sim.lag() < 0.1
+
+
+def test_realtime_until(sim: Simulator):
+    sim.schedule(lambda: sim.sleep(1000))
+    start = time.monotonic()
+    sim.run(until=1, realtime_factor=100)
+    assert 0.01 <= time.monotonic() - start < 1
+
+
+def test_realtime_lag(sim: Simulator):
+    def main():
+        for _ in range(3):
+            time.sleep(0.05)
+            sim.sleep(1)
+
+    sim.schedule(main)
+    with warns(RuntimeWarning, match="behind the wall clock"):
+        sim.run(realtime_factor=1000, realtime_tolerance=0.01)
+    assert sim.lag() >= 0.04
+    sim.run()
+    assert sim.lag() == 0.0
+    with raises(ValueError):
+        sim.run(realtime_factor=0)
+
+
+def test_call_at(sim: Simulator):
+    log = []
+
+    def handler(name):
+        log.append((name, sim.now()))
+
+    def process():
+        sim.sleep(2)
+        log.append(("process", sim.now()))
+        sim.call_soon(handler, "soon")
+        sim.call_later(1, handler, "later")
+        sim.sleep(5)
+        log.append(("process", sim.now()))
+
+    sim.schedule(process)
+    sim.call_at(2, handler, "at")
+    sim.call_at(4, handler, "cancelled").cancel()
+    sim.run()
+    assert log == [("at", 2), ("process", 2), ("soon", 2), ("later", 3), ("process", 7)]
+    with raises(ValueError):
+        sim.call_at(1, handler, "past")
+    with raises(TypeError):
+        sim.call_at(datetime(2024, 1, 1), handler, "datetime")
+
+
+def test_event_scheduling_model():
+    sim = Simulator(trace=False, profile=True)
+    queue = []
+    served = []
+
+    def arrival(customer):
+        queue.append(customer)
+        if len(queue) == 1:
+            sim.call_later(2, departure)
+        if customer < 9:
+            sim.call_later(1, arrival, customer + 1)
+
+    def departure():
+        served.append((queue.pop(0), sim.now()))
+        if queue:
+            sim.call_later(2, departure)
+
+    sim.call_soon(arrival, 0)
+    sim.run()
+    assert served == [(i, 2 * (i + 1)) for i in range(10)]
+    assert sim.stats().callbacks == 20
+    assert sim.stats().switches == 0
+
+
+def test_handlers_cannot_block(sim: Simulator):
+    sim.call_at(1, lambda: sim.sleep(1))
+    with raises(RuntimeError, match="cannot block"):
+        sim.run()
@@ -0,0 +1,94 @@
+import json
+
+from pytest import approx, importorskip, raises
+
+from pydes import Simulator
+from pydes.experiment import replicate
+from pydes.spec import compile_spec, load, validate
+
+SPEC = {
+    "warmup": 100,
+    "sources": [
+        {"name": "arrivals", "interarrival": {"dist": "exponential", "rate": 1.0}, "routing": {"a": 1.0}}
+    ],
+    "stations": [
+        {"name": "a", "service": {"dist": "exponential", "mean": 0.5}, "routing": {"b": 0.5}},
+        {"name": "b", "servers": 2, "service": {"dist": "constant", "value": 1.0}},
+    ],
+}
+
+
+def test_validate():
+    validate(SPEC)
+    cases = [
+        ({**SPEC, "seed": 1}, "spec: unknown keys seed"),
+        ({**SPEC, "sources": []}, "sources: expected a non empty list"),
+        (
+            {**SPEC, "stations": [SPEC["stations"][0], {**SPEC["stations"][1], "service": {"dist": "gamma"}}]},
+            "stations\\[1\\].service: unknown distribution 'gamma'",
+        ),
+        (
+            {**SPEC, "stations": [SPEC["stations"][0], {**SPEC["stations"][1], "servers": 0}]},
+            "stations\\[1\\].servers",
+        ),
+        (
+            {**SPEC, "sources": [{**SPEC["sources"][0], "routing": {"c": 1.0}}]},
+            "sources\\[0\\].routing: unknown station 'c'",
+        ),
+        (
+            {**SPEC, "sources": [{**SPEC["sources"][0], "interarrival": {"dist": "uniform", "low": 1}}]},
+            "missing parameters high",
+        ),
+        (
+            {**SPEC, "sources": [{**SPEC["sources"][0], "interarrival": {"dist": "exponential", "rate": -1}}]},
+            "rate: must be positive",
+        ),
+    ]
+    for spec, message in cases:
+        with raises(ValueError, match=message):
+            validate(spec)
+
+
+def test_compiled_model():
+    model = compile_spec(SPEC)
+    sim = Simulator(trace=False, profile=True)
+    outputs = model(sim, seed=1)
+    sim.run(until=20_000)
+    result = outputs()
+    # a is M/M/1 with rho = 0.5, b is M/D/2 with arrival rate 0.5
+    assert result["a.utilization"] == approx(0.5, rel=0.05)
+    assert result["a.wait"] == approx(0.5, rel=0.1)
+    assert result["b.utilization"] == approx(0.25, rel=0.05)
+    assert result["b.sojourn"] == approx(1.0, rel=0.05)
+    assert result["a.rejected"] == 0
+    assert sim.stats().switches == 0
+
+
+def test_capacity():
+    spec = {
+        "sources": [{"name": "s", "interarrival": {"dist": "exponential", "rate": 1.0}, "routing": {"a": 1.0}}],
+        "stations": [{"name": "a", "capacity": 1, "service": {"dist": "exponential", "rate": 1.0}}],
+    }
+    result = replicate(compile_spec(spec), n=4, seeds=1, workers=1, until=5_000).summary()
+    # M/M/1/2 with rho = 1: every state has probability 1/3
+    assert result["a.L"].mean == approx(1.0, rel=0.05)
+    assert result["a.rejected"].mean / 5_000 == approx(1 / 3, rel=0.05)
+
+
+def test_network():
+    with raises(ValueError, match="exponential"):
+        compile_spec(SPEC).network()
+    spec = {**SPEC, "stations": [SPEC["stations"][0], {**SPEC["stations"][1], "service": {"dist": "exponential", "rate": 1.0}}]}
+    network = compile_spec(spec).network()
+    assert network.station("a").service_rate == 2.0
+    assert network.station("b").servers == 2
+
+
+def test_load(tmp_path):
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps(SPEC))
+    assert load(path).spec == SPEC
+    yaml = importorskip("yaml")
+    path = tmp_path / "model.yaml"
+    path.write_text(yaml.safe_dump(SPEC))
+    assert load(path).spec == SPEC
@@ -0,0 +1,41 @@
+import json
+
+from pydes import Component, Resource, Simulator
+from pydes.tracing import ChromeTracer
+
+
+def test_chrome_tracer(tmp_path):
+    sim = Simulator(trace=False)
+    resource = Resource(sim)
+
+    class A(Component):
+        def __init__(self, sim: Simulator):
+            self.sim = sim
+
+        def main(self):
+            resource.request(self)
+            self.sim.sleep(10)
+            resource.release(self)
+
+    a = A(sim)
+    b = A(sim)
+    sim.schedule(a.main)
+    sim.schedule(b.main)
+    path = tmp_path / "trace.json"
+    with ChromeTracer(sim, path):
+        sim.run()
+    assert sim._tracer is None
+
+    events = json.loads(path.read_text())
+    threads = {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert sorted(threads.values()) == [a.id, b.id]
+    tid = {name: tid for tid, name in threads.items()}
+
+    blocked = [(e["tid"], e["name"], e["ts"], e["dur"]) for e in events if e["ph"] == "X" and e["pid"] == 2]
+    assert (tid[a.id], "sleep", 0, 10e6) in blocked
+    assert (tid[b.id], "Resource.request", 0, 10e6) in blocked
+    assert (tid[b.id], "sleep", 10e6, 10e6) in blocked
+
+    running = [e for e in events if e["ph"] == "X" and e["pid"] == 1]
+    assert {e["args"]["blocked_on"] for e in running} == {"sleep", "Resource.request", "exit"}
+    assert [e["name"] for e in events if e["ph"] == "i"].count("end") == 2
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+from greenlet import greenlet
+from pytest import fixture, raises
+
+from pydes import Interrupt, Simulator
+from pydes.transport import Conveyor, Transporter
+
+
+@fixture
+def sim():
+    return Simulator(trace=False, profile=True)
+
+
+def run_conveyor(sim: Simulator, conveyor: Conveyor, items: int, every: float, first_get: float):
+    entries, exits = [], []
+
+    def producer():
+        for i in range(items):
+            conveyor.put(i)
+            entries.append(sim.now())
+            sim.sleep(every)
+
+    def consumer():
+        sim.sleep(first_get)
+        while True:
+            exits.append((conveyor.get(), sim.now()))
+
+    sim.schedule(producer)
+    sim.schedule(consumer)
+    sim.run()
+    return entries, exits
+
+
+@fixture(params=[True, False], ids=["accumulating", "non-accumulating"])
+def accumulating(request):
+    return request.param
+
+
+def test_conveyor_blocked(sim: Simulator, accumulating: bool):
+    conveyor = Conveyor(sim, length=10, speed=1, spacing=2, accumulating=accumulating)
+    entries, exits = run_conveyor(sim, conveyor, items=8, every=0, first_get=30)
+    # the belt is full at time 10, the entry is free again when the items move forward
+    assert entries == [0, 2, 4, 6, 8, 10, 32, 34]
+    assert exits == [(0, 30), (1, 32), (2, 34), (3, 36), (4, 38), (5, 40), (6, 42), (7, 44)]
+    assert conveyor.capacity() == 6
+    assert conveyor.size() == 0
+
+
+def test_conveyor_accumulation(sim: Simulator, accumulating: bool):
+    conveyor = Conveyor(sim, length=10, speed=1, spacing=2, accumulating=accumulating)
+    _, exits = run_conveyor(sim, conveyor, items=2, every=5, first_get=20)
+    # the second item keeps moving behind the first one only on an accumulating conveyor
+    assert exits == [(0, 20), (1, 22 if accumulating else 25)]
+    # the conveyor schedules one event per arrival at the exit
+    assert sim.stats().callbacks == 2
+
+
+def test_conveyor_datetime():
+    start = datetime(2024, 1, 1)
+    sim = Simulator(init=start, trace=False)
+    conveyor = Conveyor(sim, length=60, speed=0.5, spacing=1)
+    exits = []
+
+    def main():
+        conveyor.put("box")
+        exits.append(conveyor.get())
+
+    sim.schedule(main)
+    sim.run()
+    assert exits == ["box"]
+    assert sim.now() == start + timedelta(minutes=2)
+    with raises(ValueError):
+        Conveyor(sim, length=1, speed=1, spacing=2)
+
+
+def test_transporter(sim: Simulator):
+    forklifts = Transporter(
+        sim,
+        distances={("dock", "rack"): 10, ("rack", "ship"): 20, ("dock", "ship"): 25},
+        speed=1,
+        vehicles=2,
+        home="dock",
+    )
+    log = []
+
+    def job(name):
+        def main():
+            vehicle = forklifts.transport("rack", "ship")
+            log.append((name, vehicle.name, sim.now()))
+
+        return main
+
+    for name in "abc":
+        sim.schedule(job(name))
+    sim.run()
+    assert log == [("a", 0, 30), ("b", 1, 30), ("c", 0, 70)]
+    assert [v.trips for v in forklifts.vehicles] == [2, 1]
+    assert [v.distance for v in forklifts.vehicles] == [70, 30]
+    assert forklifts.idle() == 2
+    assert forklifts.travel_time("ship", "dock") == 25
+    with raises(KeyError):
+        forklifts.distance("dock", "office")
+
+
+def test_transporter_interrupted(sim: Simulator):
+    forklift = Transporter(sim, distances={("a", "b"): 10}, speed=1, home="a")
+    log = []
+    processes = {}
+
+    def job(name):
+        def main():
+            processes[name] = greenlet.getcurrent()
+            try:
+                forklift.transport("a", "b")
+                log.append((name, sim.now()))
+            except Interrupt:
+                log.append((name, "interrupted", sim.now()))
+
+        return main
+
+    sim.schedule(job("first"))
+    sim.schedule(job("second"))
+    sim.call_at(4, lambda: sim.interrupt(processes["first"]))
+    sim.run()
+    # the forklift completes the trip of the interrupted job before the next one
+    assert log == [("first", "interrupted", 4), ("second", 30)]
+    assert forklift.vehicles[0].trips == 2
+
+
+def test_transporter_cancelled(sim: Simulator):
+    forklift = Transporter(sim, distances={("a", "b"): 10}, speed=1, home="a")
+    log = []
+
+    def job(name):
+        def main():
+            forklift.transport("a", "b")
+            log.append((name, sim.now()))
+
+        return main
+
+    first = sim.schedule(job("first"))
+    sim.schedule(job("second"))
+    sim.call_at(4, first.cancel)
+    sim.run(until=5)
+    assert forklift.idle() == 0  # still carrying the load of the cancelled job
+    sim.run()
+    assert first.cancelled()
+    assert log == [("second", 30)]
+    assert forklift.idle() == 1
+    assert forklift.vehicles[0].trips == 2